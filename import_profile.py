@@ -0,0 +1,73 @@
+import re
+import subprocess
+import sys
+
+# 창을 띄우는 데 필요한 모듈과 변환 실행 시 필요한 모듈
+STARTUP_MODULES = ['PySide6.QtWidgets', 'resources', 'main_ui', 'QCustomModals', 'shp_encoding']
+DEFERRED_MODULES = ['shp_convert', 'shp_preflight']
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+def measure_imports(modules: list, python: str = sys.executable) -> list:
+    """
+    새 인터프리터에서 `-X importtime`으로 모듈을 import하고 모듈별 소요 시간을 수집합니다.
+    이미 import된 모듈의 캐시 영향을 받지 않도록 별도 프로세스에서 측정합니다.
+
+    :param modules: (list), import할 모듈 이름 목록 (순서대로 import)
+    :param python: (str), 사용할 파이썬 실행 파일 (기본값: 현재 인터프리터)
+    :return: (list), module, self, cumulative(초), depth 항목을 가진 dict 목록 (import 완료 순)
+    """
+    code = "; ".join(f"import {name}" for name in modules)
+    completed = subprocess.run([python, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "import failed")
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        entries.append({"module": name, "self": int(self_us) / 1e6, "cumulative": int(cumulative_us) / 1e6, "depth": (len(indent) - 1) // 2})
+    return entries
+
+def top_level_times(modules: list, entries: list) -> dict:
+    """
+    요청한 모듈 각각의 누적 import 시간을 돌려줍니다. 앞선 모듈이 이미 불러온 하위 모듈 시간은 포함되지 않습니다.
+
+    :param modules: (list), measure_imports에 넘긴 모듈 이름 목록
+    :param entries: (list), measure_imports 결과
+    :return: (dict), 모듈 이름: 누적 시간(초)
+    """
+    wanted = set(modules)
+    return {entry["module"]: entry["cumulative"] for entry in entries if entry["module"] in wanted and entry["depth"] == 0}
+
+def import_report(budget: float = None, top: int = 15, python: str = sys.executable) -> tuple:
+    """
+    시작 단계와 지연 로딩 단계의 import 시간을 보고서 문자열로 만듭니다.
+
+    :param budget: (float), 시작 단계 import 시간 상한(초), None이면 검사하지 않음 (기본값: None)
+    :param top: (int), 보고서에 표시할 가장 느린 모듈 수 (기본값: 15)
+    :param python: (str), 사용할 파이썬 실행 파일 (기본값: 현재 인터프리터)
+    :return: (tuple), (보고서 문자열, 상한 이내 여부)
+    """
+    entries = measure_imports(STARTUP_MODULES + DEFERRED_MODULES, python)
+    totals = top_level_times(STARTUP_MODULES + DEFERRED_MODULES, entries)
+    startup = sum(totals.get(name, 0.0) for name in STARTUP_MODULES)
+    deferred = sum(totals.get(name, 0.0) for name in DEFERRED_MODULES)
+
+    lines = ["startup imports (before first paint):"]
+    lines += [f"  {totals.get(name, 0.0):8.3f}s  {name}" for name in STARTUP_MODULES]
+    lines.append(f"  {startup:8.3f}s  total" + (f" (budget {budget:.3f}s)" if budget is not None else ""))
+    lines.append("deferred imports (loaded in the background / on first run):")
+    lines += [f"  {totals.get(name, 0.0):8.3f}s  {name}" for name in DEFERRED_MODULES]
+    lines.append(f"  {deferred:8.3f}s  total")
+    lines.append(f"slowest modules by self time:")
+    for entry in sorted(entries, key=lambda e: e["self"], reverse=True)[:top]:
+        lines.append(f"  {entry['self']:8.3f}s  {entry['module']}")
+
+    within_budget = budget is None or startup <= budget
+    if not within_budget:
+        lines.append(f"startup imports exceed the budget by {startup - budget:.3f}s")
+
+    return "\n".join(lines), within_budget
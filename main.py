@@ -1,14 +1,74 @@
 from PySide6.QtWidgets import QApplication, QFileDialog, QWidget, QPushButton, QLineEdit
-from PySide6.QtCore import Qt, QSize, QRegularExpression, QFile, QTextStream
+from PySide6.QtCore import Qt, QSize, QRegularExpression, QFile, QTextStream, QThread, QTimer, Signal
 from PySide6.QtGui import QIcon, QPixmap, QRegularExpressionValidator, QCursor
 import sys
-from shp_convert import calculate_dxdy, calculate_length_and_bearing, adjust_shapefile_features
 from main_ui import Ui_Form
 import resources
 from QCustomModals import QCustomModals
 import os
 import tempfile
 import json
+import argparse
+import importlib
+import threading
+import multiprocessing
+from shp_encoding import detect_encoding_with_source
+
+# shp_convert(geopandas, pandas, pyogrio, shapely)는 무거우므로 창을 띄운 뒤 백그라운드에서 불러오거나
+# 첫 변환 실행 시 불러옴
+def warm_up_imports():
+    """ 창 표시 후 백그라운드 스레드에서 변환 모듈을 미리 import """
+    threading.Thread(target=importlib.import_module, args=("shp_convert",), daemon=True).start()
+
+# GUI에서 한 번에 읽고 변환할 피처 수 (진행률 갱신 및 취소 단위)
+# 사전 점검(shp_preflight)에서 메모리에 맞춰 청크 크기를 정하면 그 값을 사용
+CHUNK_SIZE = 20000
+# cp949는 EUC-KR의 상위 집합이므로 EUC-KR로 감지된 파일은 cp949 버튼으로 표시
+CP949_COMPATIBLE = ('cp949', 'euc_kr')
+
+class ConvertWorker(QThread):
+    """ GUI 스레드를 막지 않도록 좌표변환을 별도 스레드에서 실행 """
+    progress = Signal(int, int)   # 처리된 피처 수, 전체 피처 수
+    succeeded = Signal(str, str)  # 출력 파일 경로, 단계별 소요 시간 요약
+    failed = Signal(str)          # 오류 메시지
+    cancelled = Signal()
+
+    def __init__(self, input_shapefile, output_shapefile, matrix, encoding, chunk_size=CHUNK_SIZE, workers=None, parent=None):
+        super().__init__(parent)
+        self.input_shapefile = input_shapefile
+        self.output_shapefile = output_shapefile
+        self.matrix = matrix
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self._cancel_requested = False
+
+    def cancel(self):
+        """ 현재 청크가 끝나면 작업을 중단하도록 요청 """
+        self._cancel_requested = True
+
+    def on_progress(self, done, total):
+        from shp_convert import ConversionCancelled
+
+        self.progress.emit(done, total)
+        if self._cancel_requested:
+            raise ConversionCancelled()
+
+    def run(self):
+        from shp_convert import adjust_shapefile_features, remove_shapefile, ConversionCancelled
+
+        try:
+            # 느린 변환의 원인(읽기, 변환, 반올림, 쓰기)을 확인할 수 있도록 단계별 통계를 출력 옆에 저장
+            stats = adjust_shapefile_features(self.input_shapefile, self.output_shapefile, encoding=self.encoding, chunk_size=self.chunk_size,
+                                              progress_callback=self.on_progress, matrix=self.matrix, workers=self.workers, stats_log=True)
+        except ConversionCancelled:
+            # 중단된 작업의 불완전한 출력 삭제
+            remove_shapefile(self.output_shapefile)
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(f"{e}")
+        else:
+            self.succeeded.emit(self.output_shapefile, stats["summary"])
 
 class ShpConverter(QWidget, Ui_Form):
     def __init__(self):
@@ -22,7 +82,9 @@ class ShpConverter(QWidget, Ui_Form):
         self.saveas = None  
         self.conv_file = None   
         self.conv_reverse  = False  # 역변환 여부
+        self.conv_matrix = None  # 입력란으로 나타낼 수 없는 좌표변환 파일(행렬, 기준점 3개 이상)의 정변환 행렬
         self.encoding = 'cp949' 
+        self.worker = None  # 실행 중인 변환 작업
         
         self.input_path1.setPlaceholderText("Shp 파일 입력")
         self.input_button1.icon_normal = QIcon(':/images/shapefile_dark.svg')
@@ -60,10 +122,13 @@ class ShpConverter(QWidget, Ui_Form):
         validator = QRegularExpressionValidator(regExp)
         for lineedit in [self.px1, self.px2, self.py1, self.py2, self.qx1, self.qx2, self.qy1, self.qy2]:
             lineedit.setValidator(validator)
+            # 사용자가 직접 고친 경우에만 호출됨 (setText로 채울 때는 호출되지 않음)
+            lineedit.textEdited.connect(self.on_point_edited)
 
         # 파일 입력 및 실행버튼 클릭 시
         self.input_button1.clicked.connect(self.get_shp)
         self.btn_run.clicked.connect(self.run)
+        self.btn_cancel.clicked.connect(self.cancel_run)
         self.titlebar.help_btn.clicked.connect(self.open_pdf)
 
         self.btn_conv_init.clicked.connect(self.init_convert)  # shp 파일입력을 제외한 모든 라인에디트 내용 초기화
@@ -95,7 +160,27 @@ class ShpConverter(QWidget, Ui_Form):
         if shp:
             self.input_path1.setText(shp)
             self.shp = shp
-            self.saveas = shp.replace(".shp", "_converted.shp")
+            self.saveas = os.path.splitext(shp)[0] + "_converted.shp"
+
+            # .cpg, DBF 헤더, 속성 표본으로 인코딩을 감지하여 선택 (사용자가 다시 바꿀 수 있음)
+            try:
+                encoding, source = detect_encoding_with_source(shp)
+            except OSError:
+                return
+            if encoding == 'utf-8':
+                self.encoding_utf8.setChecked(True)
+            elif encoding in CP949_COMPATIBLE:
+                self.encoding_cp949.setChecked(True)
+                encoding = 'cp949'
+            else:
+                # 버튼이 없는 인코딩(예: cp932)은 두 버튼을 모두 해제하고 감지된 인코딩을 알림
+                for button in (self.encoding_cp949, self.encoding_utf8):
+                    button.setAutoExclusive(False)
+                    button.setChecked(False)
+                    button.setAutoExclusive(True)
+                self.show_modal("info", parent=self.main_frame, title="Encoding Detected", duration=5000,
+                                description=f"Using {encoding} (from {source}). Select cp949 or utf-8 to override.")
+            self.encoding = encoding
         else:
             self.shp = None
             self.input_path1.setText('')
@@ -107,10 +192,15 @@ class ShpConverter(QWidget, Ui_Form):
         else:
             self.encoding = 'utf-8'
 
+    def on_point_edited(self):
+        """ 기준점을 고치면 파일에서 읽은 행렬 대신 입력란 값으로 변환 """
+        self.conv_matrix = None
+
     def init_convert(self):
         """ 좌표변환값 초기화 """   
         self.conv_file = None
         self.conv_reverse = False
+        self.conv_matrix = None
         for line_edit in self.findChildren(QLineEdit):
             if line_edit.objectName() != "input_path1":
                 line_edit.clear()
@@ -118,21 +208,43 @@ class ShpConverter(QWidget, Ui_Form):
     def open_convert(self):
         """ 좌표변환 파일 읽고 변환값 입력 """
         conv_file, _ = QFileDialog.getOpenFileName(self, caption="Select Conversion File", directory='', filter='*.json')
-        if conv_file:
-            self.conv_file = conv_file
-            self.conv_reverse = False
+        if not conv_file:
+            return
+
+        from shp_convert import conversion_to_matrix
+
+        # 두 기준선(px1 ~ qy2), 기준점("control_points"), 행렬("matrix") 형식 모두 conversion_to_matrix로 먼저 검증
+        try:
             with open(conv_file, "r") as f:
                 dict_convert = json.load(f)
-                self.lineedit_saup_name.setText(dict_convert["saup_name"])
-                self.lineedit_detail.setText(dict_convert["detail"])
-                self.px1.setText(dict_convert["px1"])
-                self.py1.setText(dict_convert["py1"])
-                self.qx1.setText(dict_convert["qx1"])
-                self.qy1.setText(dict_convert["qy1"])
-                self.px2.setText(dict_convert["px2"])
-                self.py2.setText(dict_convert["py2"])
-                self.qx2.setText(dict_convert["qx2"])                
-                self.qy2.setText(dict_convert["qy2"])   
+            conversion_to_matrix(dict_convert)
+        except (OSError, ValueError, KeyError, TypeError, IndexError) as e:
+            self.show_modal("error", parent=self.main_frame, title="Invalid Conversion File", description=f"{os.path.basename(conv_file)}: {e}")
+            return
+
+        point_names = ("px1", "py1", "qx1", "qy1", "px2", "py2", "qx2", "qy2")
+        pairs = dict_convert.get("control_points")
+        if all(name in dict_convert for name in point_names):
+            values = [dict_convert[name] for name in point_names]
+        elif pairs is not None and len(pairs) == 2 and dict_convert.get("method", "helmert") == "helmert":
+            # 기준점 두 쌍의 Helmert 변환은 두 기준선 방식과 같으므로 입력란으로 나타냄 ([px, py, qx, qy] 순서)
+            values = [pairs[0][0], pairs[0][1], pairs[0][2], pairs[0][3], pairs[1][0], pairs[1][1], pairs[1][2], pairs[1][3]]
+        else:
+            values = None
+
+        self.init_convert()
+        self.conv_file = conv_file
+        self.lineedit_saup_name.setText(str(dict_convert.get("saup_name", "")))
+        self.lineedit_detail.setText(str(dict_convert.get("detail", "")))
+        if values is not None:
+            for name, value in zip(point_names, values):
+                getattr(self, name).setText(str(value))
+        else:
+            # 입력란으로 나타낼 수 없는 형식은 파일의 행렬을 그대로 실행에 사용
+            self.conv_matrix = conversion_to_matrix(dict_convert)
+            kind = f"{len(pairs)} control points" if pairs is not None else "an affine matrix"
+            self.show_modal("warning", parent=self.main_frame, title="Conversion Not Editable", duration=5000,
+                            description=f"This file defines {kind}, which the form cannot display. It will be applied as saved.")
 
     def save_convert(self):
         """ 좌표변환 파일 저장 """
@@ -235,36 +347,104 @@ class ShpConverter(QWidget, Ui_Form):
             os.system(f"xdg-open {temp_pdf_path}")
 
     def run(self):
+        # 이미 실행 중이면 무시
+        if self.worker is not None and self.worker.isRunning():
+            return
+
         # shp파일 입력했는지 확인
         if self.shp is None:
             self.show_modal("error", parent=self.main_frame, title="Input SHP File Required", description="Please enter a valid shp filename to proceed.")
             return            
 
-        # 모든 좌표를 기입했는지 확인 및 변환
-        try:
-            l1_s = (float(self.py1.text()), float(self.px1.text()))
-            l1_e = (float(self.py2.text()), float(self.px2.text()))
-            l2_s = (float(self.qy1.text()), float(self.qx1.text()))
-            l2_e = (float(self.qy2.text()), float(self.qx2.text()))
-        except Exception as e:
-            self.show_modal("error", parent=self.main_frame, title="Missing Input Fields", description="Please ensure that all fields are filled out before proceeding.")
-            return
+        # 변환 모듈 불러오기 (백그라운드 import가 끝나지 않았으면 완료될 때까지 대기)
+        from shp_convert import conversion_to_matrix, invert_affine_matrix
+
+        # 모든 좌표를 기입했는지 확인 및 변환량 계산
+        dict_convert = {name: getattr(self, name).text() for name in ("px1", "py1", "qx1", "qy1", "px2", "py2", "qx2", "qy2")}
+        if self.conv_reverse:
+            # 역변환 상태에서는 화면의 P/Q가 맞바뀌어 있으므로 원래 방향으로 되돌려 정변환 행렬을 만든 뒤 역행렬 적용
+            dict_convert = {("q" if name[0] == "p" else "p") + name[1:]: value for name, value in dict_convert.items()}
+        if self.conv_matrix is not None:
+            matrix = self.conv_matrix
+        else:
+            try:
+                matrix = conversion_to_matrix(dict_convert)
+            except ValueError:
+                self.show_modal("error", parent=self.main_frame, title="Missing Input Fields", description="Please ensure that all fields are filled out before proceeding.")
+                return
 
-        # 변환량 계산
-        r1, v1 = calculate_length_and_bearing(l1_s, l1_e) # 기준선의 거리 방위각
-        r2, v2 = calculate_length_and_bearing(l2_s, l2_e) # 이동선의 거리 방위각
+        if self.conv_reverse:
+            matrix = invert_affine_matrix(matrix)
 
-        translation = calculate_dxdy(l1_s, l2_s)  # x, y 이동량
-        rotation_angle = v2 - v1 # 회전량
-        scaling_factor = r2 / r1 # 축척계수
-        rotation_origin = (l2_s[0], l2_s[1])  # 회전 기준점
+        # 헤더만 읽어 예상 시간과 메모리를 알리고 청크 크기, 프로세스 수를 정함
+        from shp_preflight import preflight, estimate_run, format_estimate
 
-        # 변환 실행
         try:
-            adjust_shapefile_features(self.shp, self.saveas, translation, rotation_angle, scaling_factor, rotation_origin=rotation_origin, encoding=self.encoding)
-            self.show_modal('success', parent=self.main_frame, title="Transform Success", description=f"Export: {self.saveas}")
-        except Exception as e:
-            self.show_modal("error", parent=self.main_frame, title="Transform Failed", description=f"{e}")
+            plan = preflight(self.shp)
+        except (OSError, ValueError):
+            plan = None
+        # 진행률 표시와 취소를 위해 한 번에 처리하는 계획도 CHUNK_SIZE로 나누므로, 실제로 쓰는 청크 크기로 다시 추정
+        chunk_size = (plan["chunk_size"] or CHUNK_SIZE) if plan is not None else CHUNK_SIZE
+        workers = plan["workers"] if plan is not None else None
+        if plan is not None and plan["chunk_size"] != chunk_size:
+            estimate = estimate_run(plan, chunk_size, workers)
+            plan = dict(plan, chunk_size=chunk_size, estimate=estimate, fits=estimate["peak_memory_mb"] <= plan["budget_mb"])
+        if plan is not None:
+            if plan["fits"]:
+                self.show_modal("info", parent=self.main_frame, title="Preflight", description=format_estimate(plan))
+            else:
+                self.show_modal("warning", parent=self.main_frame, title="Preflight", duration=5000,
+                                description=format_estimate(plan) + "\nThe projected peak memory exceeds the available memory.")
+
+        # 변환 실행 (작업 스레드)
+        self.worker = ConvertWorker(self.shp, self.saveas, matrix, self.encoding, chunk_size, workers, parent=self)
+        self.worker.progress.connect(self.on_run_progress)
+        self.worker.succeeded.connect(self.on_run_succeeded)
+        self.worker.failed.connect(self.on_run_failed)
+        self.worker.cancelled.connect(self.on_run_cancelled)
+        self.worker.finished.connect(self.on_run_finished)
+        self.set_running(True)
+        self.worker.start()
+
+    def cancel_run(self):
+        """ 실행 중인 변환 중단 요청 """
+        if self.worker is not None and self.worker.isRunning():
+            self.btn_cancel.setEnabled(False)
+            self.worker.cancel()
+
+    def set_running(self, running):
+        """ 변환 실행 여부에 따라 진행률 표시 및 버튼 상태 변경 """
+        self.btn_run.setEnabled(not running)
+        self.btn_cancel.setEnabled(running)
+        self.btn_cancel.setVisible(running)
+        self.progress_bar.setVisible(running)
+        if running:
+            self.progress_bar.setRange(0, 0)  # 전체 피처 수를 알기 전까지는 진행 중 표시만
+
+    def on_run_progress(self, done, total):
+        self.progress_bar.setRange(0, max(total, 1))
+        self.progress_bar.setValue(done)
+
+    def on_run_succeeded(self, saveas, summary):
+        self.show_modal('success', parent=self.main_frame, title="Transform Success", description=f"Export: {saveas}\n{summary}")
+
+    def on_run_failed(self, message):
+        self.show_modal("error", parent=self.main_frame, title="Transform Failed", description=message)
+
+    def on_run_cancelled(self):
+        self.show_modal("warning", parent=self.main_frame, title="Transform Cancelled", description="The conversion was stopped and the partial output was removed.")
+
+    def on_run_finished(self):
+        self.set_running(False)
+        self.worker.deleteLater()
+        self.worker = None
+
+    def closeEvent(self, event):
+        # 실행 중인 작업을 중단하고 스레드 종료를 기다린 뒤 창 닫기
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
 
     # ==== 위젯 이동 관련 ===============
     def mousePressEvent(self, event):
@@ -286,8 +466,23 @@ class ShpConverter(QWidget, Ui_Form):
 
     
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # 변환 프로세스 풀(workers)이 패키징된 실행 파일에서도 동작하도록
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--import-report", action="store_true", help="print module import times and exit")
+    parser.add_argument("--import-budget", type=float, default=None, help="fail the import report if startup imports exceed this many seconds")
+    args, qt_args = parser.parse_known_args()
+
+    if args.import_report:
+        from import_profile import import_report
+
+        report, within_budget = import_report(budget=args.import_budget)
+        print(report)
+        sys.exit(0 if within_budget else 1)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     myWindow = ShpConverter()
     myWindow.show()
+    QTimer.singleShot(0, warm_up_imports)
 
     sys.exit(app.exec_())
\ No newline at end of file
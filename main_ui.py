@@ -236,12 +236,22 @@ class Ui_Form(object):
         self.execute_frame_layout = QtWidgets.QHBoxLayout(self.execute_frame)
         self.execute_frame_layout.setObjectName("execute_frame_layout")
 
-        # H스페이스바 및 실행버튼
+        # 진행률 표시, H스페이스바, 취소 및 실행버튼
+        self.progress_bar = QtWidgets.QProgressBar(self.execute_frame)
+        self.progress_bar.setObjectName("progress_bar")
+        self.progress_bar.setMaximumWidth(300)
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setVisible(False)
         spacerItem1 = QtWidgets.QSpacerItem(514, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.btn_cancel = QtWidgets.QPushButton(self.execute_frame)
+        self.btn_cancel.setObjectName("btn_cancel")
+        self.btn_cancel.setVisible(False)
         self.btn_run = QtWidgets.QPushButton(self.execute_frame)
         self.btn_run.setObjectName("btn_run")
 
+        self.execute_frame_layout.addWidget(self.progress_bar)
         self.execute_frame_layout.addItem(spacerItem1)
+        self.execute_frame_layout.addWidget(self.btn_cancel)
         self.execute_frame_layout.addWidget(self.btn_run)
 
         spacerItem3 = QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
@@ -282,6 +292,7 @@ class Ui_Form(object):
         self.label_y2.setText(_translate("Form", "Y"))
         self.label_x2.setText(_translate("Form", "X"))        
         self.btn_run.setText(_translate("Form", "변환 실행"))
+        self.btn_cancel.setText(_translate("Form", "취소"))
         self.label_encoding.setText(_translate("Form", "인코딩: "))
         self.encoding_cp949.setText(_translate("Form", "cp949"))
         self.encoding_utf8.setText(_translate("Form", "utf-8")) 
@@ -0,0 +1,376 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pyogrio
+
+from shp_convert import shapefile_round_trip_error
+from shp_encoding import detect_encoding
+from shp_engine import convert, convert_by_key, convert_many, verify_backends
+from shp_stats import write_stats_log
+from transform_registry import get_transform
+
+def collect_shapefiles(inputs: list, suffix: str = "_converted") -> list:
+    """
+    파일, 디렉터리, glob 패턴으로 주어진 입력에서 변환할 Shapefile 목록을 만듭니다.
+    디렉터리는 하위 디렉터리까지 모두 검색하며, 이전 변환 결과(suffix로 끝나는 파일)는 제외합니다.
+
+    :param inputs: (list), Shapefile 경로, 디렉터리 또는 glob 패턴 목록
+    :param suffix: (str), 변환 결과 파일명에 붙는 접미사 (기본값: '_converted')
+    :return: (list), (입력 기준 디렉터리, Shapefile 경로) 튜플 목록 (중복 제거, 입력 순서 유지)
+    """
+    found = {}
+    for item in inputs:
+        if os.path.isdir(item):
+            root = item
+            paths = sorted(glob.glob(os.path.join(glob.escape(item), "**", "*.shp"), recursive=True))
+        else:
+            root = None
+            paths = sorted(glob.glob(item, recursive=True)) if glob.has_magic(item) else [item]
+
+        for path in paths:
+            if not path.lower().endswith(".shp"):
+                continue
+            if os.path.splitext(os.path.basename(path))[0].endswith(suffix):
+                continue
+            found.setdefault(os.path.abspath(path), root if root is not None else os.path.dirname(path))
+
+    return [(root, path) for path, root in found.items()]
+
+def output_path(input_shapefile: str, root: str, output_dir: str = None, suffix: str = "_converted", ext: str = ".shp") -> str:
+    """
+    입력 Shapefile에 대응하는 출력 경로를 만듭니다.
+    output_dir이 없으면 GUI와 같이 입력 파일 옆에 저장하고, 있으면 입력 디렉터리 구조를 그대로 유지합니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param root: (str), 입력 기준 디렉터리
+    :param output_dir: (str), 출력 디렉터리 (기본값: None)
+    :param suffix: (str), 출력 파일명 접미사 (기본값: '_converted')
+    :param ext: (str), 출력 확장자 (.shp, .fgb, .parquet) (기본값: '.shp')
+    :return: (str), 출력 파일 경로
+    """
+    stem = os.path.splitext(os.path.basename(input_shapefile))[0]
+    if output_dir is None:
+        return os.path.join(os.path.dirname(input_shapefile), stem + suffix + ext)
+
+    relative_dir = os.path.relpath(os.path.dirname(input_shapefile), os.path.abspath(root))
+    return os.path.normpath(os.path.join(output_dir, relative_dir, stem + suffix + ext))
+
+# backend별로 받을 수 있는 선택 사항 (native는 항상 속성 파일을 바이트 단위로 복사하므로 geometry_only와 같음)
+BACKEND_OPTIONS = {
+    'vectorized': ('geometry_only', 'engine', 'spatial_index', 'incremental', 'where', 'bbox'),
+    'native': ('geometry_only', 'spatial_index'),
+    'reference': (),
+}
+
+def backend_options(backend: str, geometry_only: bool = False, engine: str = 'geopandas', spatial_index: bool = False, incremental: bool = False,
+                    where: str = None, bbox: tuple = None) -> dict:
+    """
+    backend가 지원하는 선택 사항만 convert에 넘길 인자로 만듭니다. 지원하지 않는 선택 사항이 지정되어 있으면 조용히 버리지 않고 ValueError
+
+    :param backend: (str), 'reference', 'vectorized', 'native' 중 하나
+    :return: (dict), convert에 넘길 선택 사항
+    """
+    if backend not in BACKEND_OPTIONS:
+        raise ValueError(f"unknown backend: {backend}")
+    requested = {"geometry_only": geometry_only, "engine": engine != 'geopandas', "spatial_index": spatial_index, "incremental": incremental,
+                 "where": where is not None, "bbox": bbox is not None}
+    unsupported = [name for name, value in requested.items() if value and name not in BACKEND_OPTIONS[backend]]
+    if unsupported:
+        raise ValueError(f"{', '.join(unsupported)} not supported by the {backend} backend")
+
+    if backend == 'vectorized':
+        return dict(geometry_only=geometry_only, engine=engine, spatial_index=spatial_index, incremental=incremental, where=where, bbox=bbox)
+    if backend == 'native':
+        return dict(spatial_index=spatial_index)
+    return {}
+
+def convert_file(input_shapefile: str, output_shapefile: str, matrix, encoding: str = None, chunk_size: int = None, round_trip: bool = False, geometry_only: bool = False,
+                 engine: str = 'geopandas', spatial_index: bool = False, incremental: bool = False, stats_log: bool = False,
+                 backend: str = 'vectorized', verify: int = 0, where: str = None, bbox: tuple = None) -> dict:
+    """
+    Shapefile 하나를 변환하고 소요 시간과 피처 수를 돌려줍니다. 프로세스 풀의 작업 단위입니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param output_shapefile: (str), 출력 Shapefile 경로
+    :param matrix: (np.ndarray), 2x3 아핀 행렬
+    :param encoding: (str), 속성 인코딩, None이면 파일별로 감지 (기본값: None)
+    :param chunk_size: (int), 청크당 피처 수 (기본값: None)
+    :param round_trip: (bool), 정변환 → 역변환 왕복 오차도 계산할지 여부 (기본값: False)
+    :param geometry_only: (bool), .shp/.shx만 다시 쓰고 속성 파일은 복사 (기본값: False)
+    :param engine: (str), 'geopandas' 또는 'arrow' (기본값: 'geopandas')
+    :param spatial_index: (bool), .shp 출력에 .qix 공간 인덱스를 만듦 (기본값: False)
+    :param incremental: (bool), 이전 실행 이후 바뀐 피처만 변환 (기본값: False)
+    :param stats_log: (bool), 단계별 통계를 출력 옆 JSON으로 저장 (기본값: False)
+    :param backend: (str), 'reference', 'vectorized', 'native' 중 하나 (기본값: 'vectorized')
+    :param verify: (int), 0보다 크면 이 수만큼의 표본으로 backend를 reference와 먼저 비교하고, 다르면 변환하지 않음 (기본값: 0)
+    :param where: (str), OGR SQL WHERE 조건, 맞는 피처만 변환 (vectorized backend) (기본값: None)
+    :param bbox: (tuple), (xmin, ymin, xmax, ymax) 영역과 겹치는 피처만 변환 (vectorized backend) (기본값: None)
+    :return: (dict), input, output, encoding, features, seconds, stages(단계별 통계), error 항목을 가진 결과
+             (round_trip이면 round_trip, incremental이면 incremental, verify면 verify 항목 추가)
+    """
+    result = {"input": input_shapefile, "output": output_shapefile, "encoding": encoding, "features": None, "seconds": 0.0, "error": None}
+
+    start = time.perf_counter()
+    try:
+        options = backend_options(backend, geometry_only, engine, spatial_index, incremental, where, bbox)
+        os.makedirs(os.path.dirname(output_shapefile) or ".", exist_ok=True)
+        if encoding is None:
+            encoding = result["encoding"] = detect_encoding(input_shapefile)
+        result["features"] = pyogrio.read_info(input_shapefile, encoding=encoding)["features"]
+        if verify:
+            result["verify"] = verify_backends(input_shapefile, matrix, ('reference', backend), sample=verify)
+            if not result["verify"]["ok"]:
+                raise ValueError(f"{backend} backend differs from reference by {result['verify']['max_difference'][backend]:g}")
+
+        stats = convert(input_shapefile, output_shapefile, matrix, backend, encoding=encoding, chunk_size=chunk_size, stats_log=stats_log, **options)
+        result["stages"] = stats["stages"]
+        if incremental:
+            result["incremental"] = stats["incremental"]
+        if where is not None or bbox is not None:
+            result["selected"] = stats["stages"].get("transform", {}).get("features", 0)
+        if round_trip:
+            result["round_trip"] = shapefile_round_trip_error(input_shapefile, matrix, encoding=encoding, chunk_size=chunk_size or 100000)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+
+    return result
+
+def convert_file_many(input_shapefile: str, output_paths: list, matrices, encoding: str = None, chunk_size: int = None,
+                      spatial_index: bool = False, stats_log: bool = False) -> dict:
+    """
+    Shapefile 하나를 한 번 읽어 좌표변환 K개의 출력을 씁니다. 프로세스 풀의 작업 단위입니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param output_paths: (list), 변환 순서에 대응하는 출력 경로 K개
+    :param matrices: (np.ndarray), (K x 2 x 3) 아핀 행렬 배열
+    :param encoding: (str), 속성 인코딩, None이면 감지 (기본값: None)
+    :param chunk_size: (int), 청크당 피처 수 (기본값: None)
+    :param spatial_index: (bool), .shp 출력에 .qix 공간 인덱스를 만듦 (기본값: False)
+    :param stats_log: (bool), 단계별 통계를 첫 번째 출력 옆 JSON으로 저장 (기본값: False)
+    :return: (dict), convert_file과 같은 형식의 결과 (output은 출력 경로 목록)
+    """
+    result = {"input": input_shapefile, "output": list(output_paths), "encoding": encoding, "features": None, "seconds": 0.0, "error": None}
+
+    start = time.perf_counter()
+    try:
+        for path in output_paths:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if encoding is None:
+            encoding = result["encoding"] = detect_encoding(input_shapefile)
+        result["features"] = pyogrio.read_info(input_shapefile, encoding=encoding)["features"]
+        stats = convert_many(input_shapefile, output_paths, matrices, encoding=encoding, chunk_size=chunk_size, spatial_index=spatial_index)
+        result["stages"] = stats["stages"]
+        if stats_log:
+            write_stats_log(output_paths[0], {key: stats[key] for key in ("total_seconds", "peak_rss_mb", "stages")},
+                            input=input_shapefile, outputs=list(output_paths), chunk_size=chunk_size, encoding=encoding)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+
+    return result
+
+def load_key_conversions(mapping_file: str, reverse: bool = False) -> tuple:
+    """
+    키 값 → 좌표변환 파일 매핑 JSON을 읽습니다. (예: {"11": "seoul.json", "26": "busan.json", "*": "default.json"})
+    상대 경로는 매핑 파일 위치 기준이며, "*"는 목록에 없는 키에 적용할 기본 변환입니다.
+
+    :param mapping_file: (str), 매핑 JSON 경로
+    :param reverse: (bool), 역변환 여부 (기본값: False)
+    :return: (tuple), ({키 값: 2x3 행렬}, 기본 행렬 또는 None)
+    """
+    with open(mapping_file, "r", encoding="utf-8") as f:
+        mapping = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(mapping_file))
+    matrices = {str(key): get_transform(os.path.join(base_dir, path), reverse=reverse).matrix for key, path in mapping.items()}
+    return matrices, matrices.pop("*", None)
+
+def convert_file_by_key(input_shapefile: str, output_shapefile: str, key_column: str, conversions: dict, default=None, encoding: str = None,
+                        chunk_size: int = None, spatial_index: bool = False, stats_log: bool = False) -> dict:
+    """
+    속성 컬럼 값별로 다른 좌표변환을 적용하여 Shapefile 하나를 변환합니다. 프로세스 풀의 작업 단위입니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param output_shapefile: (str), 출력 경로
+    :param key_column: (str), 변환을 고르는 속성 컬럼 이름
+    :param conversions: (dict), {키 값: 2x3 아핀 행렬}
+    :param default: (np.ndarray), 키가 없는 피처에 적용할 행렬 (기본값: None)
+    :param encoding: (str), 속성 인코딩, None이면 감지 (기본값: None)
+    :param chunk_size: (int), 청크당 피처 수 (기본값: None)
+    :param spatial_index: (bool), .shp 출력에 .qix 공간 인덱스를 만듦 (기본값: False)
+    :param stats_log: (bool), 단계별 통계를 출력 옆 JSON으로 저장 (기본값: False)
+    :return: (dict), convert_file과 같은 형식의 결과와 groups(키 값별 피처 수) 항목
+    """
+    result = {"input": input_shapefile, "output": output_shapefile, "encoding": encoding, "features": None, "seconds": 0.0, "error": None}
+
+    start = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(output_shapefile) or ".", exist_ok=True)
+        if encoding is None:
+            encoding = result["encoding"] = detect_encoding(input_shapefile)
+        result["features"] = pyogrio.read_info(input_shapefile, encoding=encoding)["features"]
+        stats = convert_by_key(input_shapefile, output_shapefile, key_column, conversions, default, encoding=encoding, chunk_size=chunk_size,
+                               spatial_index=spatial_index)
+        result["stages"] = stats["stages"]
+        result["groups"] = stats["groups"]
+        if stats_log:
+            write_stats_log(output_shapefile, {key: stats[key] for key in ("total_seconds", "peak_rss_mb", "stages")},
+                            input=input_shapefile, key_column=key_column, groups=stats["groups"], chunk_size=chunk_size, encoding=encoding)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+
+    return result
+
+def run_batch(conversion_file: str, inputs: list, output_dir: str = None, suffix: str = "_converted", encoding: str = None,
+              workers: int = None, chunk_size: int = None, reverse: bool = False, round_trip: bool = False, geometry_only: bool = False,
+              output_format: str = ".shp", engine: str = "geopandas", spatial_index: bool = False, incremental: bool = False,
+              stats_log: bool = False, backend: str = "vectorized", verify: int = 0, extra_conversions: list = None,
+              key_column: str = None, where: str = None, bbox: tuple = None, report=print) -> list:
+    """
+    좌표변환 파일 하나로 여러 Shapefile을 프로세스 풀에서 병렬 변환합니다.
+
+    :param conversion_file: (str), ShpConverter.save_convert 형식의 좌표변환 파일
+    :param inputs: (list), Shapefile 경로, 디렉터리 또는 glob 패턴 목록
+    :param output_dir: (str), 출력 디렉터리, None이면 입력 파일 옆에 저장 (기본값: None)
+    :param suffix: (str), 출력 파일명 접미사 (기본값: '_converted')
+    :param encoding: (str), 속성 인코딩, None이면 파일별로 감지 (기본값: None)
+    :param workers: (int), 프로세스 수, None이면 CPU 수 (기본값: None)
+    :param chunk_size: (int), 청크당 피처 수 (기본값: None)
+    :param reverse: (bool), 역변환 여부 (기본값: False)
+    :param round_trip: (bool), 파일별 왕복 오차 보고 여부 (기본값: False)
+    :param geometry_only: (bool), .shp/.shx만 다시 쓰고 속성 파일은 복사 (기본값: False)
+    :param output_format: (str), 출력 확장자 (.shp, .fgb, .parquet) (기본값: '.shp')
+    :param engine: (str), 'geopandas' 또는 'arrow' (기본값: 'geopandas')
+    :param spatial_index: (bool), .shp 출력에 .qix 공간 인덱스를 만듦 (기본값: False)
+    :param incremental: (bool), 파일별로 이전 실행 이후 바뀐 피처만 변환 (기본값: False)
+    :param stats_log: (bool), 파일별 단계 통계를 출력 옆 JSON으로 저장 (기본값: False)
+    :param backend: (str), 'reference', 'vectorized', 'native' 중 하나 (기본값: 'vectorized')
+    :param verify: (int), 파일별로 reference와 비교할 표본 피처 수, 0이면 비교하지 않음 (기본값: 0)
+    :param extra_conversions: (list), 같은 입력에 함께 적용할 좌표변환 파일 목록. 지정하면 입력을 한 번만 읽어
+                              변환마다 '<이름>_<변환 파일 이름><접미사>' 출력을 씀 (기본값: None)
+    :param key_column: (str), 지정하면 conversion_file을 키 값 → 좌표변환 파일 매핑 JSON으로 보고
+                       피처마다 이 컬럼 값에 맞는 변환을 적용 (load_key_conversions 참고) (기본값: None)
+    :param where: (str), OGR SQL WHERE 조건, 맞는 피처만 변환 (기본값: None)
+    :param bbox: (tuple), (xmin, ymin, xmax, ymax) 영역과 겹치는 피처만 변환 (기본값: None)
+    :param report: (callable), 파일별 결과 한 줄을 받아 출력하는 함수 (기본값: print)
+    :return: (list), 파일별 convert_file 결과 목록 (입력 순서)
+    """
+    # 지원하지 않는 조합은 파일마다 실패시키지 않고 시작 전에 거부
+    backend_options(backend, geometry_only, engine, spatial_index, incremental, where, bbox)
+    simple = not (geometry_only or incremental or round_trip or verify or backend != "vectorized" or engine != "geopandas"
+                  or where is not None or bbox is not None)
+    if key_column is not None:
+        if extra_conversions or not simple:
+            raise ValueError("per-feature conversions only support the default vectorized geopandas pipeline")
+        conversions, default = load_key_conversions(conversion_file, reverse=reverse)
+        jobs = [(path, output_path(path, root, output_dir, suffix, output_format)) for root, path in collect_shapefiles(inputs, suffix)]
+    elif extra_conversions:
+        if not simple:
+            raise ValueError("multiple conversions only support the default vectorized geopandas pipeline")
+        conversions = [conversion_file] + list(extra_conversions)
+        matrices = np.stack([get_transform(path, reverse=reverse).matrix for path in conversions])
+        names = [os.path.splitext(os.path.basename(path))[0] for path in conversions]
+        jobs = [(path, [output_path(path, root, output_dir, f"_{name}{suffix}", output_format) for name in names])
+                for root, path in collect_shapefiles(inputs, suffix)]
+    else:
+        matrix = get_transform(conversion_file, reverse=reverse).matrix
+        jobs = [(path, output_path(path, root, output_dir, suffix, output_format)) for root, path in collect_shapefiles(inputs, suffix)]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if key_column is not None:
+            futures = {executor.submit(convert_file_by_key, src, dst, key_column, conversions, default, encoding, chunk_size, spatial_index,
+                                       stats_log): src for src, dst in jobs}
+        elif extra_conversions:
+            futures = {executor.submit(convert_file_many, src, dst, matrices, encoding, chunk_size, spatial_index, stats_log): src for src, dst in jobs}
+        else:
+            futures = {executor.submit(convert_file, src, dst, matrix, encoding, chunk_size, round_trip, geometry_only, engine,
+                                       spatial_index, incremental, stats_log, backend, verify, where, bbox): src for src, dst in jobs}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if report is not None:
+                report(format_result(result))
+
+    return [results[src] for src, _ in jobs]
+
+def format_result(result: dict) -> str:
+    """ 파일별 결과를 보고서 한 줄로 만듭니다. """
+    if result["error"] is not None:
+        return f"{result['seconds']:9.2f}s  {'FAILED':>12}  {result['input']}  ({result['error']})"
+    outputs = result['output'] if isinstance(result['output'], str) else ", ".join(result['output'])
+    line = f"{result['seconds']:9.2f}s  {result['features']:>12,}  {result['input']} -> {outputs}  [{result['encoding']}]"
+    if "incremental" in result:
+        stats = result["incremental"]
+        if stats["skipped"]:
+            line += "  (unchanged)"
+        else:
+            line += "  (full rebuild)" if stats["full_rebuild"] else f"  ({stats['transformed']:,} changed, {stats['reused']:,} reused)"
+    if "selected" in result:
+        line += f"  ({result['selected']:,} selected)"
+    if "groups" in result:
+        line += f"  ({sum(1 for count in result['groups'].values() if count)} conversions used)"
+    if "verify" in result:
+        difference = max(result["verify"]["max_difference"].values())
+        line += f"  (verified {result['verify']['sample']:,} features, max diff {difference:g})"
+    if "round_trip" in result:
+        line += f"  (round-trip max {result['round_trip']['max']:.4f}, rmse {result['round_trip']['rmse']:.4f})"
+    return line
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a saved SHP Coordinate Converter conversion to many shapefiles.")
+    parser.add_argument("conversion", help="conversion JSON saved by the converter window")
+    parser.add_argument("--also", action="append", default=None, metavar="CONVERSION",
+                        help="apply this conversion too, reading each input only once (repeatable; outputs are named <input>_<conversion><suffix>)")
+    parser.add_argument("--key-column", default=None, metavar="COLUMN",
+                        help="pick the conversion per feature from this attribute; CONVERSION is then a JSON object mapping its values "
+                             "(\"*\" for any other value or a null) to conversion files. Values are compared as text, and whole numbers "
+                             "are written without a decimal point (11110.0 matches \"11110\")")
+    parser.add_argument("inputs", nargs="+", help="shapefiles, directories (searched recursively) or glob patterns")
+    parser.add_argument("-o", "--output-dir", default=None, help="write outputs here, mirroring the input tree (default: next to each input)")
+    parser.add_argument("--suffix", default="_converted", help="output file name suffix (default: _converted)")
+    parser.add_argument("--encoding", default=None, help="attribute encoding (default: detected per file from .cpg, DBF header or attribute bytes)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="stream each file in chunks of this many features")
+    parser.add_argument("--reverse", action="store_true", help="apply the inverse of the conversion")
+    parser.add_argument("--format", default="shp", choices=["shp", "fgb", "parquet"], help="output format: Shapefile, FlatGeobuf or GeoParquet (default: shp)")
+    parser.add_argument("--engine", default="geopandas", choices=["geopandas", "arrow"], help="read/write through GeoDataFrames or Arrow batches (default: geopandas)")
+    parser.add_argument("--backend", default="vectorized", choices=["reference", "vectorized", "native"],
+                        help="transform backend: per-feature shapely, vectorized NumPy or in-place .shp rewrite (default: vectorized)")
+    parser.add_argument("--verify", type=int, default=0, metavar="N",
+                        help="before converting, compare the backend with the reference on N sampled features and skip files that differ")
+    parser.add_argument("--where", default=None, help="only convert features matching this OGR SQL condition, e.g. \"SGG_CD = '11110'\"")
+    parser.add_argument("--bbox", type=float, nargs=4, default=None, metavar=("XMIN", "YMIN", "XMAX", "YMAX"),
+                        help="only convert features intersecting this box (input coordinates; uses a .qix/.sbn index when present)")
+    parser.add_argument("--spatial-index", action="store_true", help="build a fresh .qix spatial index for shapefile outputs")
+    parser.add_argument("--incremental", action="store_true", help="only transform features that changed since the previous run of the same conversion "
+                             "(each input is still read and written in full; cannot be combined with --chunk-size or --engine arrow)")
+    parser.add_argument("--stats-log", action="store_true", help="write per-stage timings, counts and peak memory next to each output (<output>.stats.json)")
+    parser.add_argument("--geometry-only", action="store_true", help="rewrite only .shp/.shx and copy .dbf/.prj/.cpg byte for byte")
+    parser.add_argument("--round-trip", action="store_true", help="also report the forward-then-inverse round-trip error of each layer")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_batch(args.conversion, args.inputs, output_dir=args.output_dir, suffix=args.suffix, encoding=args.encoding,
+                        workers=args.workers, chunk_size=args.chunk_size, reverse=args.reverse, round_trip=args.round_trip,
+                        geometry_only=args.geometry_only, output_format="." + args.format, engine=args.engine,
+                        spatial_index=args.spatial_index, incremental=args.incremental, stats_log=args.stats_log,
+                        backend=args.backend, verify=args.verify, extra_conversions=args.also,
+                        key_column=args.key_column, where=args.where, bbox=tuple(args.bbox) if args.bbox else None)
+    elapsed = time.perf_counter() - start
+
+    failed = [result for result in results if result["error"] is not None]
+    features = sum(result["features"] or 0 for result in results if result["error"] is None)
+    print(f"{len(results) - len(failed)} converted, {len(failed)} failed, {features:,} features in {elapsed:.2f}s")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from shp_convert import adjust_shapefile_features, build_affine_matrix, apply_affine_matrix, round_geometries, transform_geometry, write_layer
+from shp_stats import peak_rss_mb
+
+# 합성 레이어 중심 좌표 (중부원점 TM 부근)
+ORIGIN = (200000.0, 500000.0)
+
+# 벤치마크에 사용하는 변환 (이동, 회전, 축척)
+TRANSFORM = dict(translation=(12.345, -6.789), rotation_angle=0.0123, scaling_factor=1.0000321, rotation_origin=ORIGIN)
+
+def make_synthetic_layer(kind: str, n_features: int, vertices: int = 8, seed: int = 0) -> gpd.GeoDataFrame:
+    """
+    벤치마크용 합성 레이어를 만듭니다.
+
+    :param kind: (str), 'point', 'line', 'polygon' 중 하나
+    :param n_features: (int), 피처 수
+    :param vertices: (int), 선/면 피처당 정점 수 (기본값: 8)
+    :param seed: (int), 난수 시드 (기본값: 0)
+    :return: (GeoDataFrame), id, name 속성을 가진 합성 레이어
+    """
+    if (kind == 'line' and vertices < 2) or (kind == 'polygon' and vertices < 3):
+        raise ValueError(f"too few vertices for {kind}: {vertices}")
+
+    rng = np.random.default_rng(seed)
+    extent = 50000.0
+    centers = np.asarray(ORIGIN) + rng.uniform(-extent, extent, size=(n_features, 2))
+
+    if kind == 'point':
+        geometry = shapely.points(centers)
+    elif kind == 'line':
+        steps = rng.normal(0.0, 5.0, size=(n_features, vertices, 2))
+        coords = centers[:, None, :] + np.cumsum(steps, axis=1)
+        geometry = shapely.linestrings(coords.reshape(-1, 2), indices=np.repeat(np.arange(n_features), vertices))
+    elif kind == 'polygon':
+        # 정점 수가 vertices인 볼록 다각형 (닫힌 링이므로 마지막 점 = 첫 점)
+        angles = np.linspace(0.0, 2 * np.pi, vertices, endpoint=False)
+        radius = rng.uniform(5.0, 20.0, size=(n_features, 1))
+        ring = np.stack([np.cos(angles), np.sin(angles)], axis=-1)[None, :, :] * radius[:, :, None] + centers[:, None, :]
+        ring = np.concatenate([ring, ring[:, :1, :]], axis=1)
+        rings = shapely.linearrings(ring.reshape(-1, 2), indices=np.repeat(np.arange(n_features), vertices + 1))
+        geometry = shapely.polygons(rings)
+    else:
+        raise ValueError(f"unknown kind: {kind}")
+
+    return gpd.GeoDataFrame({"id": np.arange(n_features), "name": [f"F{i:07d}" for i in range(n_features)]}, geometry=geometry, crs="EPSG:5186")
+
+def _timed(func, repeat: int):
+    """ func을 repeat번 실행하여 가장 빠른 시간과 마지막 결과를 돌려줍니다. """
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def _pipeline_in_process(source: str, target: str, engine: str, encoding: str) -> tuple:
+    """ 새 프로세스에서 전체 변환을 실행하고 (소요 시간, 최대 RSS(MB))를 돌려줍니다. (Windows는 최대 working set) """
+    start = time.perf_counter()
+    adjust_shapefile_features(source, target, encoding=encoding, engine=engine, **TRANSFORM)
+    elapsed = time.perf_counter() - start
+    return elapsed, peak_rss_mb()
+
+def run_case(kind: str, n_features: int, vertices: int, workdir: str, repeat: int = 1, legacy_max: int = 10000, encoding: str = 'cp949',
+             formats: tuple = ('.shp',), engines: tuple = ()) -> list:
+    """
+    한 가지 레이어 조건에 대해 읽기, 변환, 반올림, 쓰기 시간을 따로 측정합니다.
+    쓰기는 출력 형식마다 따로 측정합니다 (Shapefile은 'write', 나머지는 'write_fgb', 'write_parquet').
+    engines를 지정하면 adjust_shapefile_features 전체 실행 시간과 최대 RSS를 엔진과 출력 형식별로 새 프로세스에서 측정합니다
+    ('pipeline_<engine>', Shapefile이 아닌 출력은 'pipeline_<engine>_fgb' 등).
+
+    :param kind: (str), 'point', 'line', 'polygon' 중 하나
+    :param n_features: (int), 피처 수
+    :param vertices: (int), 선/면 피처당 정점 수
+    :param workdir: (str), 합성 레이어를 저장할 임시 디렉터리
+    :param repeat: (int), 단계별 반복 횟수 (가장 빠른 시간 기록) (기본값: 1)
+    :param legacy_max: (int), 피처별 transform_geometry 경로를 측정할 최대 피처 수 (기본값: 10000)
+    :param encoding: (str), 속성 인코딩 (기본값: 'cp949')
+    :param formats: (tuple), 쓰기 시간을 측정할 출력 확장자 (기본값: ('.shp',))
+    :param engines: (tuple), 전체 실행을 측정할 엔진 ('geopandas', 'arrow') (기본값: ())
+    :return: (list), stage, seconds 등 측정 결과 dict 목록
+    """
+    source = os.path.join(workdir, f"{kind}_{n_features}_{vertices}.shp")
+    make_synthetic_layer(kind, n_features, vertices).to_file(source, encoding=encoding)
+
+    matrix = build_affine_matrix(**TRANSFORM)
+    stages = {}
+
+    stages["read"], gdf = _timed(lambda: gpd.read_file(source, encoding=encoding), repeat)
+    geometries = gdf['geometry'].values
+    stages["transform"], transformed = _timed(lambda: apply_affine_matrix(geometries, matrix, precision=None), repeat)
+    stages["round"], rounded = _timed(lambda: round_geometries(transformed, precision=3), repeat)
+
+    gdf['geometry'] = gpd.GeoSeries(rounded, index=gdf.index, crs=gdf.crs)
+    for ext in formats:
+        target = os.path.join(workdir, f"{kind}_{n_features}_{vertices}_out{ext}")
+        stage = "write" if ext == ".shp" else f"write_{ext[1:]}"
+        stages[stage], _ = _timed(lambda: write_layer([gdf], target, encoding=encoding), repeat)
+
+    if n_features <= legacy_max:
+        stages["legacy_transform"], _ = _timed(lambda: [transform_geometry(geom, **TRANSFORM) for geom in geometries], repeat)
+
+    peak_rss = {}
+    for engine in engines:
+        for ext in formats:
+            target = os.path.join(workdir, f"{kind}_{n_features}_{vertices}_{engine}{ext}")
+            stage = f"pipeline_{engine}" if ext == ".shp" else f"pipeline_{engine}_{ext[1:]}"
+            # 프로세스마다 최대 RSS가 따로 기록되도록 spawn으로 새 인터프리터에서 실행
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                stages[stage], peak_rss[stage] = executor.submit(_pipeline_in_process, source, target, engine, encoding).result()
+
+    coordinates = int(shapely.get_num_coordinates(geometries).sum())
+    return [{"kind": kind, "features": n_features, "vertices": vertices, "coordinates": coordinates, "stage": stage, "seconds": seconds,
+             "peak_rss_mb": peak_rss.get(stage)}
+            for stage, seconds in stages.items()]
+
+def environment() -> dict:
+    """ 결과 비교에 필요한 실행 환경 정보 """
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "shapely": shapely.__version__,
+        "geopandas": gpd.__version__,
+    }
+
+def write_results(results: list, json_path: str = None, csv_path: str = None, label: str = None):
+    """
+    측정 결과를 JSON 및 CSV로 저장합니다.
+
+    :param results: (list), run_case 결과를 합친 목록
+    :param json_path: (str), JSON 저장 경로 (기본값: None)
+    :param csv_path: (str), CSV 저장 경로 (기본값: None)
+    :param label: (str), 버전 비교용 이름 (기본값: None)
+    """
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({"label": label, "environment": environment(), "results": results}, f, indent=2)
+
+    if csv_path:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["label", "kind", "features", "vertices", "coordinates", "stage", "seconds", "peak_rss_mb"])
+            writer.writeheader()
+            for row in results:
+                writer.writerow(dict(row, label=label))
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the shp_convert transform pipeline on synthetic layers.")
+    parser.add_argument("--kinds", nargs="+", default=["point", "line", "polygon"], choices=["point", "line", "polygon"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000, 1000000], help="feature counts (default: 1k 10k 100k 1M)")
+    parser.add_argument("--vertices", nargs="+", type=int, default=[8], help="vertices per line/polygon feature (default: 8)")
+    parser.add_argument("--formats", nargs="+", default=["shp", "fgb", "parquet"], choices=["shp", "fgb", "parquet"], help="output formats to time writing (default: all)")
+    parser.add_argument("--engines", nargs="*", default=["geopandas", "arrow"], choices=["geopandas", "arrow"], help="time the whole conversion and peak RSS per engine (default: both)")
+    parser.add_argument("--repeat", type=int, default=1, help="repetitions per stage, fastest is kept (default: 1)")
+    parser.add_argument("--legacy-max", type=int, default=10000, help="largest layer to also time the per-feature transform_geometry path on")
+    parser.add_argument("--json", default=None, help="write results as JSON to this path")
+    parser.add_argument("--csv", default=None, help="write results as CSV to this path")
+    parser.add_argument("--label", default=None, help="name stored with the results, e.g. a version or commit")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for kind in args.kinds:
+            for vertices in ([1] if kind == "point" else args.vertices):
+                for size in args.sizes:
+                    for row in run_case(kind, size, vertices, workdir, args.repeat, args.legacy_max, formats=tuple("." + f for f in args.formats),
+                                        engines=tuple(args.engines)):
+                        results.append(row)
+                        rss = f"  {row['peak_rss_mb']:8.1f} MB" if row["peak_rss_mb"] is not None else ""
+                        print(f"{kind:8} {size:>9,} x{vertices:<3} {row['stage']:17} {row['seconds']:9.4f}s{rss}")
+
+    write_results(results, args.json, args.csv, args.label)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
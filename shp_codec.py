@@ -0,0 +1,401 @@
+import mmap
+import os
+import shutil
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from shp_files import (HEADER_SIZE, MULTIPOINT_TYPES, NULL_SHAPE, POINT_TYPES, POLY_TYPES, POLYGON_TYPES, Z_TYPES, copy_sidecar, find_sidecar,
+                       read_header, remove_spatial_index, same_file)
+
+def round_array(values: np.ndarray, precision: int = 3) -> np.ndarray:
+    """
+    좌표 배열을 내장 round()와 같은 결과가 나오도록 소수점 precision 자리로 반올림합니다.
+    np.round는 x * 10^precision 계산 오차 때문에 .5 경계 근처에서 round()와 다를 수 있으므로
+    경계에 걸린 값만 round()로 다시 계산합니다.
+
+    :param values: (np.ndarray), 반올림할 좌표 배열
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :return: (np.ndarray), 반올림된 좌표 배열
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, precision)
+
+    scaled = values * 10.0 ** precision
+    near_tie = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+    if near_tie.any():
+        rounded[near_tie] = [round(float(value), precision) for value in values[near_tie]]
+
+    return rounded
+
+def _read_i4(buf: np.ndarray, positions: np.ndarray, byteorder: str = '<') -> np.ndarray:
+    """ 바이트 버퍼의 여러 위치에서 int32를 한 번에 읽습니다. """
+    positions = np.asarray(positions, dtype=np.int64)
+    if positions.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    raw = buf[positions[:, None] + np.arange(4)]
+    return raw.view(byteorder + 'i4').ravel().astype(np.int64)
+
+def _f8_views(mm) -> dict:
+    """
+    파일 전체를 시작 위치(0 ~ 7바이트)만 다른 8개의 float64 배열로 봅니다.
+    레코드의 좌표 블록은 8바이트 정렬이 보장되지 않으므로 블록 시작 위치의 나머지에 맞는 배열을 사용합니다.
+    """
+    return {r: np.ndarray(shape=((len(mm) - r) // 8,), dtype='<f8', buffer=mm, offset=r) for r in range(8)}
+
+def read_record_index(shapefile: str) -> dict:
+    """
+    .shx 오프셋으로 .shp의 모든 레코드 위치와 좌표 블록 위치를 계산합니다.
+
+    :param shapefile: (str), Shapefile(.shp) 경로 (.shx가 같은 위치에 있어야 함)
+    :return: (dict), 레코드별 배열 content(내용 시작 바이트), shape_type, xy_start(좌표 블록 시작 바이트),
+             num_points, box(레코드 bbox 시작 바이트, 없으면 -1),
+             z_start(Z 블록 시작 바이트, 없으면 -1), z_count(Z 블록의 float64 개수, Z 범위 2개 포함)
+    """
+    shx_path = find_sidecar(shapefile, '.shx')
+    if shx_path is None:
+        raise FileNotFoundError(f".shx not found for {shapefile}")
+
+    with open(shx_path, 'rb') as f:
+        shx = np.frombuffer(f.read(), dtype=np.uint8)
+    count = (len(shx) - HEADER_SIZE) // 8
+    content = shx[HEADER_SIZE:HEADER_SIZE + 8 * count].view('>i4').reshape(count, 2)[:, 0].astype(np.int64) * 2 + 8
+
+    with open(shapefile, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        buf = np.frombuffer(mm, dtype=np.uint8)
+        try:
+            shape_type = _read_i4(buf, content)
+            xy_start = np.full(count, -1, dtype=np.int64)
+            num_points = np.zeros(count, dtype=np.int64)
+            box = np.full(count, -1, dtype=np.int64)
+
+            unknown = ~np.isin(shape_type, (NULL_SHAPE,) + POINT_TYPES + POLY_TYPES + MULTIPOINT_TYPES)
+            if unknown.any():
+                raise ValueError(f"unsupported shape type {int(shape_type[unknown][0])} in {shapefile}")
+
+            is_point = np.isin(shape_type, POINT_TYPES)
+            xy_start[is_point] = content[is_point] + 4
+            num_points[is_point] = 1
+
+            is_poly = np.isin(shape_type, POLY_TYPES)
+            num_parts = _read_i4(buf, content[is_poly] + 36)
+            num_points[is_poly] = _read_i4(buf, content[is_poly] + 40)
+            xy_start[is_poly] = content[is_poly] + 44 + 4 * num_parts
+            box[is_poly] = content[is_poly] + 4
+
+            is_multipoint = np.isin(shape_type, MULTIPOINT_TYPES)
+            num_points[is_multipoint] = _read_i4(buf, content[is_multipoint] + 36)
+            xy_start[is_multipoint] = content[is_multipoint] + 40
+            box[is_multipoint] = content[is_multipoint] + 4
+
+            # PointZ는 XY 뒤의 Z 하나, 나머지 Z 형식은 XY 블록 뒤의 Z 범위(2개)와 점별 Z가 이어짐
+            z_start = np.full(count, -1, dtype=np.int64)
+            z_count = np.zeros(count, dtype=np.int64)
+            has_z = np.isin(shape_type, Z_TYPES)
+            point_z = has_z & is_point
+            z_start[point_z] = xy_start[point_z] + 16
+            z_count[point_z] = 1
+            multi_z = has_z & ~is_point
+            z_start[multi_z] = xy_start[multi_z] + 16 * num_points[multi_z]
+            z_count[multi_z] = num_points[multi_z] + 2
+        finally:
+            del buf
+
+    return {"content": content, "shape_type": shape_type, "xy_start": xy_start, "num_points": num_points, "box": box,
+            "z_start": z_start, "z_count": z_count}
+
+def record_xy(mm, xy_start: int, num_points: int) -> np.ndarray:
+    """
+    레코드 하나의 좌표 블록을 복사 없이 (num_points x 2) float64 배열로 돌려줍니다.
+
+    :param mm: (mmap), .shp 파일 mmap
+    :param xy_start: (int), 좌표 블록 시작 바이트 (read_record_index 참고)
+    :param num_points: (int), 점 개수
+    :return: (np.ndarray), mmap을 그대로 가리키는 좌표 배열
+    """
+    return np.ndarray(shape=(num_points, 2), dtype='<f8', buffer=mm, offset=xy_start)
+
+def _transform_batch(views: dict, xy_start: np.ndarray, num_points: np.ndarray, box: np.ndarray, matrix: np.ndarray, precision: int) -> tuple:
+    """ 점이 1개 이상인 레코드 묶음의 좌표를 mmap 위에서 바로 변환하고 레코드 bbox를 다시 씁니다. """
+    (a, b, xoff), (d, e, yoff) = matrix
+    total = int(num_points.sum())
+    first = np.cumsum(num_points) - num_points
+    record = np.repeat(np.arange(len(num_points)), num_points)
+    position = xy_start[record] + 16 * (np.arange(total) - first[record])
+
+    # 레코드 안의 점은 16바이트 간격이므로 같은 레코드는 항상 같은 나머지 배열에 속함
+    residue = position % 8
+    groups = [(r, residue == r) for r in np.unique(residue)]
+
+    x = np.empty(total)
+    y = np.empty(total)
+    for r, selected in groups:
+        index = (position[selected] - r) // 8
+        x[selected] = views[r][index]
+        y[selected] = views[r][index + 1]
+
+    new_x = a * x + b * y + xoff
+    new_y = d * x + e * y + yoff
+    if precision is not None:
+        new_x = round_array(new_x, precision)
+        new_y = round_array(new_y, precision)
+
+    for r, selected in groups:
+        index = (position[selected] - r) // 8
+        views[r][index] = new_x[selected]
+        views[r][index + 1] = new_y[selected]
+
+    # 레코드 bbox (Polyline, Polygon, MultiPoint)
+    has_box = box >= 0
+    if has_box.any():
+        bounds = np.column_stack([np.minimum.reduceat(new_x, first), np.minimum.reduceat(new_y, first),
+                                  np.maximum.reduceat(new_x, first), np.maximum.reduceat(new_y, first)])[has_box]
+        box_start = box[has_box]
+        for r in np.unique(box_start % 8):
+            selected = (box_start % 8) == r
+            index = (box_start[selected] - r) // 8
+            for k in range(4):
+                views[r][index + k] = bounds[selected, k]
+
+    return new_x.min(), new_y.min(), new_x.max(), new_y.max()
+
+def _round_z_batch(views: dict, z_start: np.ndarray, z_count: np.ndarray, precision: int):
+    """
+    레코드 묶음의 Z 블록을 mmap 위에서 XY와 같은 자리로 반올림합니다. (apply_affine_matrix도 Z를 반올림함)
+    반올림은 순서를 바꾸지 않으므로 Z 범위도 같은 방식으로 반올림하면 그대로 맞습니다.
+    """
+    first = np.cumsum(z_count) - z_count
+    record = np.repeat(np.arange(len(z_count)), z_count)
+    position = z_start[record] + 8 * (np.arange(int(z_count.sum())) - first[record])
+    for r in np.unique(position % 8):
+        index = (position[position % 8 == r] - r) // 8
+        views[r][index] = round_array(views[r][index], precision)
+
+def _round_header_z_range(path: str, precision: int):
+    """ .shp 또는 .shx 헤더의 Z 범위를 레코드 Z와 같은 자리로 반올림합니다. """
+    with open(path, 'r+b') as f:
+        f.seek(68)
+        z_range = round_array(np.array(struct.unpack('<2d', f.read(16))), precision)
+        f.seek(68)
+        f.write(struct.pack('<2d', *z_range))
+
+def transform_records(mm, index: dict, start: int, stop: int, matrix, precision: int = 3, batch_points: int = 1 << 20, progress_callback=None) -> tuple:
+    """
+    mmap으로 연 .shp의 start ~ stop 레코드 좌표에 아핀 행렬을 적용합니다.
+    batch_points개 점 단위로 나누어 처리하므로 추가 메모리는 레이어 크기와 관계없이 일정합니다.
+
+    :param mm: (mmap), 쓰기 가능한 .shp 파일 mmap
+    :param index: (dict), read_record_index 결과
+    :param start: (int), 시작 레코드 번호
+    :param stop: (int), 끝 레코드 번호 (포함하지 않음)
+    :param matrix: (array-like), 2x3 아핀 행렬
+    :param precision: (int), 반올림할 소수점 자리 수, None이면 반올림하지 않음 (기본값: 3)
+    :param batch_points: (int), 한 번에 처리할 최대 점 개수 (기본값: 1048576)
+    :param progress_callback: (callable), 묶음 처리 후 (처리된 레코드 수, 전체 레코드 수)로 호출됨 (기본값: None)
+    :return: (tuple), 변환된 좌표의 (xmin, ymin, xmax, ymax), 점이 없으면 None
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    num_points = index["num_points"][start:stop]
+    cumulative = np.cumsum(num_points)
+    bounds = None
+
+    views = _f8_views(mm)
+    try:
+        batch_start = 0
+        while batch_start < len(num_points):
+            # 누적 점 개수가 batch_points를 넘기 직전까지 (최소 1개 레코드)
+            done = cumulative[batch_start - 1] if batch_start > 0 else 0
+            batch_stop = max(int(np.searchsorted(cumulative, done + batch_points, side='right')), batch_start + 1)
+
+            selected = slice(start + batch_start, start + batch_stop)
+            has_points = index["num_points"][selected] > 0
+            if has_points.any():
+                batch_bounds = _transform_batch(views, index["xy_start"][selected][has_points], index["num_points"][selected][has_points],
+                                                index["box"][selected][has_points], matrix, precision)
+                bounds = batch_bounds if bounds is None else (min(bounds[0], batch_bounds[0]), min(bounds[1], batch_bounds[1]),
+                                                              max(bounds[2], batch_bounds[2]), max(bounds[3], batch_bounds[3]))
+            has_z = index["z_count"][selected] > 0
+            if precision is not None and has_z.any():
+                _round_z_batch(views, index["z_start"][selected][has_z], index["z_count"][selected][has_z], precision)
+
+            batch_start = batch_stop
+            if progress_callback is not None:
+                progress_callback(batch_start, len(num_points))
+    finally:
+        del views
+
+    return bounds
+
+def _merge_bounds(bounds: list) -> tuple:
+    """ 구간별 bbox를 합칩니다. 점이 없는 구간(None)은 무시합니다. """
+    bounds = [b for b in bounds if b is not None]
+    if not bounds:
+        return None
+    return (min(b[0] for b in bounds), min(b[1] for b in bounds), max(b[2] for b in bounds), max(b[3] for b in bounds))
+
+def _transform_partition(shapefile: str, index: dict, matrix: np.ndarray, precision: int, batch_points: int) -> tuple:
+    """ 출력 .shp를 mmap으로 열어 index에 담긴 레코드만 변환합니다. 프로세스 풀의 작업 단위입니다. """
+    with open(shapefile, 'r+b') as f, mmap.mmap(f.fileno(), 0) as mm:
+        bounds = transform_records(mm, index, 0, len(index["num_points"]), matrix, precision, batch_points)
+        mm.flush()
+    return bounds
+
+def partition_records(num_points: np.ndarray, partitions: int) -> list:
+    """
+    점 개수가 고르게 나뉘도록 레코드 범위를 연속 구간으로 나눕니다.
+
+    :param num_points: (np.ndarray), 레코드별 점 개수
+    :param partitions: (int), 구간 수
+    :return: (list), (시작 레코드, 끝 레코드) 튜플 목록
+    """
+    cumulative = np.cumsum(num_points)
+    total = int(cumulative[-1]) if len(cumulative) else 0
+    targets = total * np.arange(1, partitions) / partitions
+    cuts = np.unique(np.concatenate([[0], np.searchsorted(cumulative, targets, side='right'), [len(num_points)]]))
+    return [(int(start), int(stop)) for start, stop in zip(cuts[:-1], cuts[1:])]
+
+def write_header_bbox(path: str, bbox: tuple):
+    """ .shp 또는 .shx 헤더의 XY bbox를 다시 씁니다. """
+    with open(path, 'r+b') as f:
+        f.seek(36)
+        f.write(struct.pack('<4d', *bbox))
+
+def transform_shapefile(input_shapefile: str, output_shapefile: str, matrix, precision: int = 3, sidecars: bool = True, hardlink: bool = False,
+                        batch_points: int = 1 << 20, progress_callback=None, workers: int = None, spatial_index: bool = False) -> dict:
+    """
+    GDAL을 거치지 않고 .shp를 mmap으로 열어 좌표 블록에 아핀 변환을 직접 적용합니다.
+    .shp/.shx를 출력 위치에 복사한 뒤 출력 mmap 위에서 좌표와 레코드/파일 bbox를 고쳐 씁니다.
+    Point, PolyLine, Polygon, MultiPoint(Z/M 포함) 형식을 지원하며 Z 값은 XY와 같은 자리로 반올림하고 M 값은 그대로 유지됩니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param output_shapefile: (str), 출력 Shapefile 경로
+    :param matrix: (array-like), 2x3 아핀 행렬
+    :param precision: (int), 반올림할 소수점 자리 수, None이면 반올림하지 않음 (기본값: 3)
+    :param sidecars: (bool), .dbf, .prj, .cpg도 바이트 단위로 복사할지 여부 (기본값: True)
+    :param hardlink: (bool), 부속 파일을 하드링크로 연결 (기본값: False)
+    :param batch_points: (int), 한 번에 처리할 최대 점 개수 (기본값: 1048576)
+    :param progress_callback: (callable), (처리된 레코드 수, 전체 레코드 수)로 호출됨 (기본값: None)
+    :param workers: (int), 프로세스 수. 2 이상이면 레코드 범위를 나누어 각 프로세스가 같은 출력 mmap의
+                    서로 다른 구간을 변환하므로 결과는 프로세스 수와 관계없이 같음 (기본값: None)
+    :param spatial_index: (bool), 변환된 레코드 bbox로 .qix 공간 인덱스를 새로 만듦 (기본값: False)
+    :return: (dict), records, points, bbox 항목을 가진 결과
+    """
+    if same_file(input_shapefile, output_shapefile):
+        raise ValueError("the mmap codec cannot write over its input")
+
+    matrix = np.asarray(matrix, dtype=float)
+    header = read_header(input_shapefile)
+    if header["shape_type"] in POLYGON_TYPES and np.linalg.det(matrix[:, :2]) < 0:
+        # 반사 변환은 링 방향(외곽 시계방향)을 뒤집으므로 점 순서를 바꿔야 함
+        raise ValueError("mirroring transforms would reverse polygon ring orientation")
+
+    base_path = os.path.splitext(output_shapefile)[0]
+    # 이전 출력에 남아 있을 수 있는 공간 인덱스는 변환 후 좌표와 맞지 않으므로 삭제
+    remove_spatial_index(output_shapefile)
+
+    shutil.copyfile(input_shapefile, base_path + '.shp')
+    shutil.copyfile(find_sidecar(input_shapefile, '.shx'), base_path + '.shx')
+
+    index = read_record_index(base_path + '.shp')
+    count = len(index["content"])
+    if workers is not None and workers > 1 and count > 1:
+        # 출력 파일의 페이지 캐시를 모든 프로세스가 공유하며 서로 겹치지 않는 레코드 구간만 변환
+        ranges = partition_records(index["num_points"], workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_transform_partition, base_path + '.shp', {key: value[start:stop] for key, value in index.items()},
+                                       matrix, precision, batch_points) for start, stop in ranges]
+            bounds = []
+            for future, (_, stop) in zip(futures, ranges):
+                bounds.append(future.result())
+                if progress_callback is not None:
+                    progress_callback(stop, count)
+        bbox = _merge_bounds(bounds)
+    else:
+        with open(base_path + '.shp', 'r+b') as f, mmap.mmap(f.fileno(), 0) as mm:
+            bbox = transform_records(mm, index, 0, count, matrix, precision, batch_points, progress_callback)
+            mm.flush()
+
+    if bbox is not None:
+        write_header_bbox(base_path + '.shp', bbox)
+        write_header_bbox(base_path + '.shx', bbox)
+    if precision is not None and header["shape_type"] in Z_TYPES:
+        _round_header_z_range(base_path + '.shp', precision)
+        _round_header_z_range(base_path + '.shx', precision)
+
+    if sidecars:
+        for ext in ('.dbf', '.prj', '.cpg'):
+            sidecar = find_sidecar(input_shapefile, ext)
+            if sidecar is not None:
+                copy_sidecar(sidecar, base_path + ext, hardlink=hardlink)
+
+    if spatial_index:
+        from shp_index import write_qix
+
+        write_qix(base_path + '.shp')
+
+    return {"records": count, "points": int(index["num_points"].sum()), "bbox": bbox}
+
+def transform_record_subset(input_shapefile: str, output_shapefile: str, ids, matrix, precision: int = 3) -> dict:
+    """
+    지정한 레코드만 새 .shp/.shx에 옮겨 쓰고 그 좌표에만 transform_shapefile과 같은 변환을 적용합니다.
+    나머지 레코드의 좌표 블록은 읽지 않으므로 큰 레이어의 표본 검증(shp_engine.verify_backends)에 사용합니다. .dbf는 만들지 않습니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param output_shapefile: (str), 출력 Shapefile 경로
+    :param ids: (array-like), 옮겨 쓸 레코드 번호 (0부터), 출력 레코드는 이 순서를 따름
+    :param matrix: (array-like), 2x3 아핀 행렬
+    :param precision: (int), 반올림할 소수점 자리 수, None이면 반올림하지 않음 (기본값: 3)
+    :return: (dict), records, points, bbox 항목을 가진 결과
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    ids = np.asarray(ids, dtype=np.int64)
+    header = read_header(input_shapefile)
+    if header["shape_type"] in POLYGON_TYPES and np.linalg.det(matrix[:, :2]) < 0:
+        raise ValueError("mirroring transforms would reverse polygon ring orientation")
+
+    index = read_record_index(input_shapefile)
+    with open(input_shapefile, 'rb') as f:
+        buf = bytearray(f.read(HEADER_SIZE))
+        content = np.empty(len(ids), dtype=np.int64)
+        lengths = np.empty(len(ids), dtype=np.int64)
+        for position, record in enumerate(ids):
+            f.seek(int(index["content"][record]) - 4)
+            lengths[position] = struct.unpack('>i', f.read(4))[0] * 2
+            buf += struct.pack('>2i', position + 1, int(lengths[position]) // 2)
+            content[position] = len(buf)
+            buf += f.read(int(lengths[position]))
+    struct.pack_into('>i', buf, 24, len(buf) // 2)
+
+    # 옮긴 위치만큼 좌표 블록과 레코드 bbox 위치를 옮김
+    shift = content - index["content"][ids]
+    num_points = index["num_points"][ids]
+    box = np.where(index["box"][ids] >= 0, index["box"][ids] + shift, -1)
+    has_points = num_points > 0
+    bbox = None
+    if has_points.any():
+        views = _f8_views(buf)
+        try:
+            bbox = _transform_batch(views, (index["xy_start"][ids] + shift)[has_points], num_points[has_points], box[has_points], matrix, precision)
+            z_count = index["z_count"][ids]
+            has_z = z_count > 0
+            if precision is not None and has_z.any():
+                _round_z_batch(views, (index["z_start"][ids] + shift)[has_z], z_count[has_z], precision)
+        finally:
+            del views
+        struct.pack_into('<4d', buf, 36, *bbox)
+
+    shx = bytearray(buf[:HEADER_SIZE])
+    for start, length in zip(content, lengths):
+        shx += struct.pack('>2i', (int(start) - 8) // 2, int(length) // 2)
+    struct.pack_into('>i', shx, 24, len(shx) // 2)
+
+    base_path = os.path.splitext(output_shapefile)[0]
+    with open(base_path + '.shp', 'wb') as f:
+        f.write(buf)
+    with open(base_path + '.shx', 'wb') as f:
+        f.write(shx)
+    if precision is not None and header["shape_type"] in Z_TYPES:
+        _round_header_z_range(base_path + '.shp', precision)
+        _round_header_z_range(base_path + '.shx', precision)
+    return {"records": len(ids), "points": int(num_points.sum()), "bbox": bbox}
@@ -1,7 +1,34 @@
 import geopandas as gpd
-from shapely.geometry import Point, base, mapping, shape
+import numpy as np
+import pyogrio
+import shapely
+from shapely.geometry import Point, base
 from shapely.affinity import translate, rotate, scale
+import itertools
+import json
 import math
+import re
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from shp_codec import round_array
+from shp_encoding import detect_encoding
+from shp_files import SHAPEFILE_EXTENSIONS, copy_sidecar, find_sidecar, remove_spatial_index, same_file
+from shp_stats import StageTimer, profiled, write_stats_log
+
+# 출력 확장자별 형식 (GeoParquet은 GDAL이 아닌 pyarrow로 씀)
+OUTPUT_FORMATS = {'.shp': 'ESRI Shapefile', '.fgb': 'FlatGeobuf', '.parquet': 'GeoParquet'}
+
+# engine='arrow'에서 chunk_size를 지정하지 않았을 때 한 번에 읽을 피처 수
+ARROW_BATCH_SIZE = 65536
+
+class ConversionCancelled(Exception):
+    """ 변환 작업이 사용자 요청으로 중단되었을 때 발생하는 예외 """
 
 def calculate_length_and_bearing(start_point: Point, end_point: Point) -> tuple: 
     """
@@ -75,53 +102,822 @@ def transform_geometry(geometry: base.BaseGeometry, translation: tuple=(0, 0), r
     
     return transformed_geometry
 
+def load_conversion(conversion_file: str) -> dict:
+    """
+    ShpConverter.save_convert가 저장한 좌표변환 파일(JSON)을 읽습니다.
+
+    :param conversion_file: (str), 좌표변환 파일 경로
+    :return: (dict), saup_name, detail, px1 ~ qy2 항목을 가진 좌표변환 정보
+    """
+    with open(conversion_file, "r") as f:
+        return json.load(f)
+
+def conversion_to_parameters(dict_convert: dict) -> tuple:
+    """
+    좌표변환 정보의 두 기준선(P1→P2, Q1→Q2)으로 이동, 회전, 축척 변환량을 계산합니다.
+    측량 좌표계 관례에 따라 X는 북(세로), Y는 동(가로) 방향이므로 (Y, X) 순서로 점을 만듭니다.
+
+    :param dict_convert: (dict), px1 ~ qy2 항목을 가진 좌표변환 정보 (문자열 또는 숫자)
+    :return: (tuple), translation, rotation_angle, scaling_factor, rotation_origin
+    """
+    l1_s = (float(dict_convert["py1"]), float(dict_convert["px1"]))
+    l1_e = (float(dict_convert["py2"]), float(dict_convert["px2"]))
+    l2_s = (float(dict_convert["qy1"]), float(dict_convert["qx1"]))
+    l2_e = (float(dict_convert["qy2"]), float(dict_convert["qx2"]))
+
+    # 변환량 계산
+    r1, v1 = calculate_length_and_bearing(l1_s, l1_e) # 기준선의 거리 방위각
+    r2, v2 = calculate_length_and_bearing(l2_s, l2_e) # 이동선의 거리 방위각
+
+    translation = calculate_dxdy(l1_s, l2_s)  # x, y 이동량
+    rotation_angle = v2 - v1 # 회전량
+    scaling_factor = r2 / r1 # 축척계수
+    rotation_origin = (l2_s[0], l2_s[1])  # 회전 기준점
+
+    return translation, rotation_angle, scaling_factor, rotation_origin
+
+def estimate_transform(source_points, target_points, method: str = 'helmert') -> dict:
+    """
+    여러 쌍의 기준점으로 최소제곱 변환을 추정합니다.
+    'helmert'는 이동, 회전, 축척(4 파라미터), 'affine'은 일반 아핀 변환(6 파라미터)을 추정합니다.
+    수치 안정성을 위해 각 점군의 중심을 원점으로 옮긴 뒤 계산합니다.
+
+    :param source_points: (array-like), 변환 전 기준점 좌표 (N x 2)
+    :param target_points: (array-like), 변환 후 기준점 좌표 (N x 2)
+    :param method: (str), 'helmert' 또는 'affine' (기본값: 'helmert')
+    :return: (dict), method, matrix(2x3 리스트), residuals(N x 2 리스트), rmse 항목을 가진 결과.
+             helmert인 경우 rotation_angle(degree), scaling_factor, translation(회전·축척 후 이동량)을 함께 포함
+    """
+    src = np.asarray(source_points, dtype=float)
+    dst = np.asarray(target_points, dtype=float)
+    if src.ndim != 2 or src.shape[1] != 2 or src.shape != dst.shape:
+        raise ValueError("source_points and target_points must both be N x 2 arrays")
+
+    src_center = src.mean(axis=0)
+    dst_center = dst.mean(axis=0)
+    src_c = src - src_center
+    dst_c = dst - dst_center
+
+    if method == 'helmert':
+        if len(src) < 2:
+            raise ValueError("helmert fit needs at least 2 control point pairs")
+        denom = np.sum(src_c ** 2)
+        if denom == 0:
+            raise ValueError("control points must not all coincide")
+        a = np.sum(src_c[:, 0] * dst_c[:, 0] + src_c[:, 1] * dst_c[:, 1]) / denom
+        b = np.sum(src_c[:, 0] * dst_c[:, 1] - src_c[:, 1] * dst_c[:, 0]) / denom
+        linear = np.array([[a, -b], [b, a]])
+    elif method == 'affine':
+        if len(src) < 3:
+            raise ValueError("affine fit needs at least 3 control point pairs")
+        solution, _, rank, _ = np.linalg.lstsq(src_c, dst_c, rcond=None)
+        if rank < 2:
+            raise ValueError("control points must not be collinear")
+        linear = solution.T
+    else:
+        raise ValueError(f"unknown method: {method}")
+
+    offset = dst_center - linear @ src_center
+    matrix = np.column_stack([linear, offset])
+    residuals = src @ linear.T + offset - dst
+
+    result = {
+        "method": method,
+        "matrix": matrix.tolist(),
+        "residuals": residuals.tolist(),
+        "rmse": float(np.sqrt(np.mean(np.sum(residuals ** 2, axis=1)))),
+    }
+    if method == 'helmert':
+        result["rotation_angle"] = math.degrees(math.atan2(linear[1, 0], linear[0, 0]))
+        result["scaling_factor"] = float(math.hypot(linear[0, 0], linear[1, 0]))
+        result["translation"] = (float(offset[0]), float(offset[1]))
+
+    return result
+
+def conversion_to_matrix(dict_convert: dict) -> np.ndarray:
+    """
+    좌표변환 정보를 2x3 아핀 행렬로 만듭니다.
+    "control_points"([[px, py, qx, qy], ...])가 있으면 "method"(기본값 'helmert')로 최소제곱 추정하고,
+    "matrix"가 있으면 그대로 사용하며, 둘 다 없으면 기존 두 기준선(px1 ~ qy2) 방식으로 계산합니다.
+
+    :param dict_convert: (dict), 좌표변환 정보
+    :return: (np.ndarray), 2x3 아핀 행렬
+    """
+    if "control_points" in dict_convert:
+        pairs = np.asarray(dict_convert["control_points"], dtype=float)
+        # conversion_to_parameters와 같이 (Y, X) 순서로 점 구성
+        estimate = estimate_transform(pairs[:, [1, 0]], pairs[:, [3, 2]], dict_convert.get("method", "helmert"))
+        return np.asarray(estimate["matrix"])
+    if "matrix" in dict_convert:
+        return np.asarray(dict_convert["matrix"], dtype=float)
+    return build_affine_matrix(*conversion_to_parameters(dict_convert))
+
+def build_affine_matrix(translation: tuple=(0, 0), rotation_angle: float=0, scaling_factor: float=1.0, rotation_origin: tuple=(0, 0)) -> np.ndarray:
+    """
+    이동 → 회전 → 축척 변환을 하나의 2x3 아핀 행렬로 합성합니다.
+    transform_geometry와 같은 순서, 같은 기준점으로 합성하므로 반올림한 두 경로의 결과가 같습니다 (apply_affine_matrix 참고).
+
+    :param translation: (tuple), x, y 이동 거리 (기본값: (0, 0))
+    :param rotation_angle: (float), 회전 각도(단위: degree) (기본값: 0도)
+    :param scaling_factor: (float), 축척 배율 (기본값: 1)
+    :param rotation_origin: (tuple), 회전 및 축척 기준점 (기본값: (0, 0))
+    :return: (np.ndarray), [[a, b, xoff], [d, e, yoff]] 형태의 2x3 행렬
+    """
+    x0, y0 = rotation_origin
+
+    # shapely.affinity.rotate와 동일하게 미소값은 0으로 처리
+    theta = math.radians(rotation_angle)
+    cosp, sinp = math.cos(theta), math.sin(theta)
+    if abs(cosp) < 2.5e-16:
+        cosp = 0.0
+    if abs(sinp) < 2.5e-16:
+        sinp = 0.0
+
+    translate_matrix = np.array([[1.0, 0.0, translation[0]],
+                                 [0.0, 1.0, translation[1]],
+                                 [0.0, 0.0, 1.0]])
+    rotate_matrix = np.array([[cosp, -sinp, x0 - x0 * cosp + y0 * sinp],
+                              [sinp, cosp, y0 - x0 * sinp - y0 * cosp],
+                              [0.0, 0.0, 1.0]])
+    scale_matrix = np.array([[scaling_factor, 0.0, x0 - x0 * scaling_factor],
+                             [0.0, scaling_factor, y0 - y0 * scaling_factor],
+                             [0.0, 0.0, 1.0]])
+
+    return (scale_matrix @ rotate_matrix @ translate_matrix)[:2]
+
+def invert_affine_matrix(matrix) -> np.ndarray:
+    """
+    2x3 아핀 행렬의 역행렬을 해석적으로 계산합니다.
+    기준점을 맞바꿔 다시 계산하는 대신 이 역행렬을 적용하면 정변환을 정확히 되돌립니다.
+
+    :param matrix: (array-like), 2x3 아핀 행렬
+    :return: (np.ndarray), 역변환 2x3 행렬
+    """
+    (a, b, c), (d, e, f) = np.asarray(matrix, dtype=float)
+    det = a * e - b * d
+    if det == 0:
+        raise ValueError("affine matrix is singular and cannot be inverted")
+
+    return np.array([[e / det, -b / det, (b * f - e * c) / det],
+                     [-d / det, a / det, (d * c - a * f) / det]])
+
+def round_trip_error(geometries, matrix, precision: int = 3) -> dict:
+    """
+    정변환 후 역변환했을 때 원래 좌표와의 차이를 계산합니다.
+    각 단계마다 precision 자리 반올림을 적용하므로 실제 정변환 → 역변환 작업과 같은 오차가 나옵니다.
+
+    :param geometries: (array-like), shapely geometry 배열
+    :param matrix: (array-like), 정변환 2x3 아핀 행렬
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :return: (dict), count(좌표 수), max, mean, rmse(좌표 이동 거리) 항목을 가진 결과
+    """
+    geoms = np.asarray(geometries, dtype=object)
+    forward = apply_affine_matrix(geoms, matrix, precision)
+    backward = apply_affine_matrix(forward, invert_affine_matrix(matrix), precision)
+
+    distance = np.hypot(*(shapely.get_coordinates(backward) - shapely.get_coordinates(geoms)).T)
+    if distance.size == 0:
+        return {"count": 0, "max": 0.0, "mean": 0.0, "rmse": 0.0}
+    return {"count": int(distance.size), "max": float(distance.max()), "mean": float(distance.mean()), "rmse": float(np.sqrt(np.mean(distance ** 2)))}
+
+def shapefile_round_trip_error(input_shapefile: str, matrix, encoding='cp949', chunk_size: int = 100000, precision: int = 3) -> dict:
+    """
+    레이어 전체에 대해 정변환 → 역변환 왕복 오차를 청크 단위로 집계합니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param matrix: (array-like), 정변환 2x3 아핀 행렬
+    :param encoding: (str), 속성 인코딩 (기본값: 'cp949')
+    :param chunk_size: (int), 청크당 피처 수 (기본값: 100000)
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :return: (dict), round_trip_error와 같은 형식의 레이어 전체 결과
+    """
+    count, max_error, total, total_sq = 0, 0.0, 0.0, 0.0
+    for _, _, chunk in iter_feature_chunks(input_shapefile, chunk_size, encoding=encoding):
+        error = round_trip_error(chunk['geometry'].values, matrix, precision)
+        if error["count"] == 0:
+            continue
+        count += error["count"]
+        max_error = max(max_error, error["max"])
+        total += error["mean"] * error["count"]
+        total_sq += error["rmse"] ** 2 * error["count"]
+
+    if count == 0:
+        return {"count": 0, "max": 0.0, "mean": 0.0, "rmse": 0.0}
+    return {"count": count, "max": max_error, "mean": total / count, "rmse": math.sqrt(total_sq / count)}
+
+def apply_affine_matrix(geometries, matrix: np.ndarray, precision: int = 3, timer: StageTimer = None) -> np.ndarray:
+    """
+    geometry 배열 전체의 좌표에 아핀 행렬을 한 번의 NumPy 연산으로 적용합니다.
+    결과는 피처마다 transform_geometry를 적용한 것과 바이트 단위로 같습니다. 단, 합성 행렬은 이동, 회전, 축척을 차례로 계산하는 것과
+    반올림 전 값이 1e-10 정도(좌표 크기 수십만 m 기준) 다를 수 있어, 그 값이 반올림 경계(10^-precision의 절반)에 그만큼 가까우면
+    마지막 자리가 10^-precision만큼 달라집니다 (무작위 좌표 약 500만 개 중 1개). round_array의 경계 보정은 반올림 단계만 다루므로 이 차이는 남습니다.
+
+    :param geometries: (array-like), shapely geometry 배열 (GeoSeries, GeometryArray 등)
+    :param matrix: (np.ndarray), build_affine_matrix로 만든 2x3 행렬
+    :param precision: (int), 반올림할 소수점 자리 수, None이면 반올림하지 않음 (기본값: 3)
+    :param timer: (StageTimer), 반올림 시간을 'round' 단계로 기록할 타이머 (기본값: None)
+    :return: (np.ndarray), 변환된 shapely geometry 객체 배열
+    """
+    geoms = np.asarray(geometries, dtype=object)
+    if geoms.size == 0:
+        return geoms
+
+    matrix = np.asarray(matrix, dtype=float)
+    include_z = bool(shapely.has_z(geoms).any())
+    return shapely.transform(geoms, lambda coords: _affine_coordinates(coords, matrix, precision, timer), include_z=include_z)
+
+def _affine_coordinates(coords: np.ndarray, matrix: np.ndarray, precision: int = 3, timer: StageTimer = None) -> np.ndarray:
+    """ 좌표 배열(N x 2 또는 N x 3)의 XY에 아핀 행렬을 적용하고 반올림합니다. 배열을 직접 수정합니다. """
+    (a, b, xoff), (d, e, yoff) = matrix
+    x = coords[:, 0].copy()
+    y = coords[:, 1].copy()
+    coords[:, 0] = a * x + b * y + xoff
+    coords[:, 1] = d * x + e * y + yoff
+    # 반올림도 같은 좌표 버퍼에서 처리
+    if precision is not None:
+        start = time.perf_counter()
+        coords[:] = round_array(coords, precision)
+        if timer is not None:
+            timer.add('round', time.perf_counter() - start)
+    return coords
+
+def apply_affine_matrices(geometries, matrices, precision: int = 3, timer: StageTimer = None) -> list:
+    """
+    geometry 배열 하나에 아핀 행렬 K개를 함께 적용합니다.
+    좌표 버퍼는 한 번만 꺼내고 K개 행렬을 (K x 좌표 수) 배열로 한꺼번에 계산하며,
+    각 결과는 apply_affine_matrix를 행렬마다 따로 호출한 것과 같습니다.
+
+    :param geometries: (array-like), shapely geometry 배열
+    :param matrices: (array-like), (K x 2 x 3) 아핀 행렬 배열
+    :param precision: (int), 반올림할 소수점 자리 수, None이면 반올림하지 않음 (기본값: 3)
+    :param timer: (StageTimer), 반올림 시간을 'round' 단계로 기록할 타이머 (기본값: None)
+    :return: (list), 행렬 순서대로 변환된 geometry 배열 K개
+    """
+    geoms = np.asarray(geometries, dtype=object)
+    matrices = np.asarray(matrices, dtype=float).reshape(-1, 2, 3)
+    if geoms.size == 0:
+        return [geoms.copy() for _ in matrices]
+
+    include_z = bool(shapely.has_z(geoms).any())
+    coords = shapely.get_coordinates(geoms, include_z=include_z)
+    # (K x 1) 계수와 (좌표 수) 벡터의 브로드캐스트: _affine_coordinates와 같은 연산 순서
+    a, b, xoff = (matrices[:, 0, i, None] for i in range(3))
+    d, e, yoff = (matrices[:, 1, i, None] for i in range(3))
+    x, y = coords[:, 0], coords[:, 1]
+    stacked = np.stack([a * x + b * y + xoff, d * x + e * y + yoff], axis=-1)
+    if precision is not None:
+        start = time.perf_counter()
+        stacked = round_array(stacked, precision)
+        if timer is not None:
+            timer.add('round', time.perf_counter() - start)
+
+    results = []
+    for xy in stacked:
+        transformed = coords.copy()
+        transformed[:, :2] = xy
+        results.append(shapely.transform(geoms, lambda _, transformed=transformed: transformed, include_z=include_z))
+    return results
+
+def apply_keyed_matrices(geometries, groups, matrices, precision: int = 3, timer: StageTimer = None) -> np.ndarray:
+    """
+    피처마다 다른 아핀 행렬을 한 번의 NumPy 연산으로 적용합니다.
+    피처별 행렬 번호를 좌표 단위로 펼쳐 계수를 모은 뒤 전체 좌표 버퍼를 한꺼번에 계산하므로 피처 순서가 그대로 유지됩니다.
+
+    :param geometries: (array-like), shapely geometry 배열
+    :param groups: (array-like), 피처별 행렬 번호 (0 ~ K-1)
+    :param matrices: (array-like), (K x 2 x 3) 아핀 행렬 배열
+    :param precision: (int), 반올림할 소수점 자리 수, None이면 반올림하지 않음 (기본값: 3)
+    :param timer: (StageTimer), 반올림 시간을 'round' 단계로 기록할 타이머 (기본값: None)
+    :return: (np.ndarray), 변환된 shapely geometry 객체 배열
+    """
+    geoms = np.asarray(geometries, dtype=object)
+    if geoms.size == 0:
+        return geoms
+
+    matrices = np.asarray(matrices, dtype=float).reshape(-1, 2, 3)
+    include_z = bool(shapely.has_z(geoms).any())
+    coords = shapely.get_coordinates(geoms, include_z=include_z)
+    group = np.repeat(np.asarray(groups), shapely.get_num_coordinates(geoms))
+    a, b, xoff = (matrices[group, 0, i] for i in range(3))
+    d, e, yoff = (matrices[group, 1, i] for i in range(3))
+    x = coords[:, 0].copy()
+    y = coords[:, 1].copy()
+    coords[:, 0] = a * x + b * y + xoff
+    coords[:, 1] = d * x + e * y + yoff
+    if precision is not None:
+        start = time.perf_counter()
+        coords = round_array(coords, precision)
+        if timer is not None:
+            timer.add('round', time.perf_counter() - start)
+    return shapely.transform(geoms, lambda _: coords, include_z=include_z)
+
+def round_geometries(geometries, precision: int = 3) -> np.ndarray:
+    """
+    geometry 배열 전체의 좌표를 한 번에 소수점 precision 자리로 반올림합니다.
+
+    :param geometries: (array-like), shapely geometry 배열 (GeoSeries, GeometryArray 등)
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :return: (np.ndarray), 좌표가 반올림된 shapely geometry 객체 배열
+    """
+    geoms = np.asarray(geometries, dtype=object)
+    if geoms.size == 0:
+        return geoms
+
+    include_z = bool(shapely.has_z(geoms).any())
+    return shapely.transform(geoms, lambda coords: round_array(coords, precision), include_z=include_z)
+
 def round_coordinates(geom: base.BaseGeometry, precision: int = 3) -> base.BaseGeometry:
     """
     주어진 geometry 객체의 모든 좌표를 소수점 precision 자리로 반올림합니다.
 
     :param geom: (BaseGeometry), 변환할 shapely geometry 객체
     :param precision: (int), 반올림할 소수점 자리 수 (기본값은 3)
-    
+
     Return: BaseGeometry, 좌표가 반올림된 새로운 geometry 객체
     """
     if geom.is_empty:
         return geom
-    
-    # geometry를 GeoJSON 포맷으로 변환하여 좌표 접근
-    geom_mapping = mapping(geom)
-    
-    # 좌표 반올림 처리
-    def round_elements(nested):
-        rounded = []
-        for item in nested:
-            if isinstance(item, (list, tuple)):
-                # 리스트나 튜플인 경우 재귀적으로 호출
-                rounded.append(round_elements(item))
+
+    # 좌표 버퍼를 꺼내 한 번에 반올림 (Z 좌표 포함)
+    return shapely.transform(geom, lambda coords: round_array(coords, precision), include_z=geom.has_z)
+
+def transform_geodataframe(gdf: gpd.GeoDataFrame, matrix: np.ndarray, precision: int = 3, timer: StageTimer = None) -> gpd.GeoDataFrame:
+    """
+    GeoDataFrame의 geometry 컬럼 전체에 아핀 행렬을 적용합니다.
+
+    :param gdf: (GeoDataFrame), 변환할 GeoDataFrame (geometry 컬럼이 교체됨)
+    :param matrix: (np.ndarray), build_affine_matrix로 만든 2x3 행렬
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :param timer: (StageTimer), 반올림 시간을 기록할 타이머 (기본값: None)
+    :return: (GeoDataFrame), 변환된 GeoDataFrame
+    """
+    transformed = apply_affine_matrix(gdf['geometry'].values, matrix, precision, timer)
+    gdf['geometry'] = gpd.GeoSeries(transformed, index=gdf.index, crs=gdf.crs)
+    return gdf
+
+def select_features(input_shapefile: str, encoding='cp949', where: str=None, bbox: tuple=None, mask=None) -> np.ndarray:
+    """
+    필터에 맞는 피처의 FID를 구합니다. 필터는 GDAL에서 처리되므로 속성은 읽지 않고 geometry는 WKB로만 받으며,
+    bbox, mask 필터는 입력에 .qix 또는 .sbn/.sbx 공간 인덱스가 있으면 GDAL Shapefile 드라이버가 자동으로 사용합니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param encoding: (str), 속성 인코딩 (기본값: 'cp949')
+    :param where: (str), OGR SQL WHERE 조건 (예: "SGG_CD = '11110'") (기본값: None)
+    :param bbox: (tuple), (xmin, ymin, xmax, ymax) 영역과 겹치는 피처만 선택 (기본값: None)
+    :param mask: (BaseGeometry), 이 geometry와 겹치는 피처만 선택 (bbox와 함께 쓸 수 없음) (기본값: None)
+    :return: (np.ndarray), 선택된 피처의 FID (오름차순)
+    """
+    from pyogrio.raw import read
+
+    # 읽지 않는 필드는 GDAL이 WHERE 조건에서도 무시하므로 조건에 나오는 필드만 읽음
+    columns = where_fields(input_shapefile, where, encoding) if where is not None else []
+    # geometry를 읽지 않으면 GDAL이 공간 필터를 적용하지 않으므로(OGR_GEOMETRY 무시) 공간 필터가 있을 때만 WKB를 받음 (디코딩하지 않음)
+    spatial = bbox is not None or mask is not None
+    _, fids, _, _ = read(input_shapefile, encoding=encoding, columns=columns, read_geometry=spatial, where=where, bbox=bbox, mask=mask,
+                          return_fids=True)
+    return np.sort(fids)
+
+def where_fields(input_shapefile: str, where: str, encoding='cp949') -> list:
+    """ WHERE 조건에 이름이 나오는 속성 필드 목록 (대소문자 무시, 따옴표로 감싼 이름 포함) """
+    words = {word.upper() for word in re.findall(r'[^\W\d]\w*', where) + re.findall(r'"([^"]+)"', where)}
+    return [field for field in pyogrio.read_info(input_shapefile, encoding=encoding)['fields'] if field.upper() in words]
+
+def iter_feature_chunks(input_shapefile: str, chunk_size: int, encoding='cp949', columns: list=None, where: str=None, bbox: tuple=None, mask=None):
+    """
+    Shapefile을 chunk_size개 피처 단위로 나누어 읽습니다.
+    chunk_size가 None이면 전체를 한 번에 읽고, 피처가 없더라도 스키마를 넘겨주기 위해 빈 청크를 하나 돌려줍니다.
+    where, bbox, mask를 지정하면 선택된 피처만 읽습니다. (청크로 나눌 때는 select_features로 FID를 먼저 구해 FID로 읽음)
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param chunk_size: (int), 한 번에 읽을 피처 수, None이면 전체
+    :param encoding: (str), 속성 인코딩 (기본값: 'cp949')
+    :param columns: (list), 읽을 속성 컬럼, None이면 전체, []이면 geometry만 (기본값: None)
+    :param where: (str), OGR SQL WHERE 조건 (기본값: None)
+    :param bbox: (tuple), (xmin, ymin, xmax, ymax) 영역 필터 (기본값: None)
+    :param mask: (BaseGeometry), geometry 필터 (기본값: None)
+    :return: (generator), (시작 인덱스, 전체 피처 수, GeoDataFrame) 튜플. 필터가 있으면 전체 피처 수는 선택된 피처 수
+    """
+    filtered = where is not None or bbox is not None or mask is not None
+    if chunk_size is None:
+        gdf = gpd.read_file(input_shapefile, encoding=encoding, columns=columns, where=where, bbox=bbox, mask=mask)
+        yield 0, len(gdf), gdf
+        return
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive: {chunk_size}")
+
+    fids = select_features(input_shapefile, encoding, where, bbox, mask) if filtered else None
+    total = len(fids) if filtered else pyogrio.read_info(input_shapefile, encoding=encoding)['features']
+    for start in range(0, max(total, 1), chunk_size):
+        stop = min(start + chunk_size, total)
+        if filtered:
+            if total:
+                chunk = gpd.read_file(input_shapefile, encoding=encoding, columns=columns, fids=fids[start:stop])
             else:
-                # 소수점 3째 자리에서 반올림
-                rounded.append(round(item, 3))
-        return rounded
+                # 선택된 피처가 없으면 같은 필터로 읽은 빈 청크로 스키마만 넘김
+                chunk = gpd.read_file(input_shapefile, encoding=encoding, columns=columns, where=where, bbox=bbox, mask=mask)
+        else:
+            chunk = gpd.read_file(input_shapefile, encoding=encoding, columns=columns, rows=slice(start, stop))
+        yield start, total, chunk
+
+def output_format(output_path: str) -> str:
+    """
+    출력 파일 확장자로 형식을 정합니다.
 
-    geom_mapping['coordinates'] = round_elements(geom_mapping['coordinates'])
-    return shape(geom_mapping)
+    :param output_path: (str), 출력 경로 (.shp, .fgb, .parquet)
+    :return: (str), 'ESRI Shapefile', 'FlatGeobuf', 'GeoParquet' 중 하나
+    """
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext not in OUTPUT_FORMATS:
+        raise ValueError(f"unsupported output format '{ext}', expected one of {', '.join(OUTPUT_FORMATS)}")
+    return OUTPUT_FORMATS[ext]
+
+def _record_batch(frame: gpd.GeoDataFrame, schema=None):
+    """ GeoDataFrame을 geometry가 WKB인 Arrow RecordBatch로 바꿉니다. schema를 주면 그 형식에 맞춤 """
+    import pyarrow as pa
+
+    geometry_name = frame.geometry.name
+    table = frame.drop(columns=geometry_name).assign(**{geometry_name: shapely.to_wkb(frame.geometry.values)})
+    return pa.RecordBatch.from_pandas(table, schema=schema, preserve_index=False)
+
+def _promote_null_fields(schema, geometry_name: str):
+    """
+    첫 청크의 값이 모두 null이라 Arrow null 형식이 된 열을 나머지 청크도 담을 수 있는 형식으로 바꿉니다.
+    pyogrio는 숫자, 날짜 필드를 float/datetime으로 읽으므로 object 열은 문자열 필드이고, geometry는 WKB(binary)입니다.
+    """
+    import pyarrow as pa
+
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.binary() if field.name == geometry_name else pa.string()))
+    return schema
+
+def _geoparquet_metadata(geometry_name: str, crs) -> bytes:
+    """ GeoParquet 1.0 'geo' 메타데이터. 청크 단위로 쓰므로 전체 bbox와 geometry_types(빈 목록 = 알 수 없음)는 생략 """
+    import pyproj
+
+    # crs가 없으면 명시적으로 null을 기록해야 함 (생략 시 읽는 쪽에서 OGC:CRS84로 해석)
+    projjson = pyproj.CRS.from_user_input(crs).to_json_dict() if crs is not None else None
+    column = {"encoding": "WKB", "geometry_types": [], "crs": projjson}
+    return json.dumps({"version": "1.0.0", "primary_column": geometry_name, "columns": {geometry_name: column}}).encode('utf-8')
+
+def _write_geoparquet(batches, schema, output_path: str, geometry_name: str, crs):
+    """ RecordBatch들을 하나의 GeoParquet 파일에 row group 단위로 이어 씁니다. """
+    import pyarrow.parquet as pq
 
-def adjust_shapefile_features(input_shapefile: str, output_shapefile: str, translation: tuple=(0, 0), rotation_angle: float=0, scaling_factor: float=1.0, rotation_origin: tuple=(0, 0), encoding='cp949'):
+    schema = schema.with_metadata({b'geo': _geoparquet_metadata(geometry_name, crs)})
+    with pq.ParquetWriter(output_path, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+
+def _layer_geometry_type(frame: gpd.GeoDataFrame) -> str:
+    """ 첫 청크의 geometry 종류가 하나면 그 이름, 섞여 있으면 'Unknown' """
+    types = set(frame.geometry.geom_type.dropna())
+    return types.pop() if len(types) == 1 else 'Unknown'
+
+def _write_arrow_batches(batches, schema, output_path: str, geometry_name: str, geometry_type: str, crs, encoding=None):
+    """
+    RecordBatch 스트림을 GDAL(pyogrio write_arrow)로 하나의 레이어에 씁니다. (FlatGeobuf는 이어쓰기를 지원하지 않음)
+    FlatGeobuf에는 packed Hilbert R-tree 공간 인덱스(SPATIAL_INDEX=YES)를 함께 만들며, 이때 GDAL이 피처를 Hilbert 순서로 다시 정렬하므로
+    출력 피처 순서는 입력과 다릅니다.
+    """
+    import pyarrow as pa
+    from pyogrio.raw import write_arrow
+
+    driver = output_format(output_path)
+    options = {}
+    if driver == 'FlatGeobuf':
+        options['layer_options'] = {'SPATIAL_INDEX': 'YES'}
+        # Shapefile의 선/면 레이어는 단일/멀티 geometry가 섞여 있고 FlatGeobuf는 레이어 형식과 다른 피처를 거부함
+        if geometry_type.split(' ')[0] not in ('Point', 'MultiPoint', 'MultiLineString', 'MultiPolygon'):
+            geometry_type = 'Unknown'
+    elif encoding is not None:
+        options['encoding'] = encoding
+
+    errors = []
+
+    def guarded():
+        # GDAL이 스트림을 읽는 도중 발생한 예외(작업 취소 등)는 원래 형태로 다시 던지기 위해 보관
+        try:
+            yield from batches
+        except BaseException as e:
+            errors.append(e)
+            raise
+
+    reader = pa.RecordBatchReader.from_batches(schema, guarded())
+    try:
+        write_arrow(reader, output_path, driver=driver, geometry_name=geometry_name, geometry_type=geometry_type, crs=crs, **options)
+    except Exception:
+        if errors:
+            raise errors[0] from None
+        raise
+
+def write_layer(frames, output_path: str, encoding='cp949'):
     """
-    Shapefile의 피처 좌표에 대해 이동, 회전, 축척 변환을 적용하여 새로운 Shapefile에 저장합니다.
+    GeoDataFrame 청크들을 출력 확장자에 맞는 형식으로 하나의 레이어에 씁니다.
+    Shapefile은 첫 청크로 파일을 만든 뒤 이어 쓰고, FlatGeobuf와 GeoParquet은 Arrow(WKB)로 변환하여 씁니다.
+
+    :param frames: (iterable), GeoDataFrame 청크 (스키마가 같아야 함)
+    :param output_path: (str), 출력 경로 (.shp, .fgb, .parquet)
+    :param encoding: (str), Shapefile 속성 인코딩 (다른 형식은 UTF-8) (기본값: 'cp949')
+    :return: none
+    """
+    driver = output_format(output_path)
+    frames = iter(frames)
+    if driver == 'ESRI Shapefile':
+        mode = 'w'
+        for frame in frames:
+            frame.to_file(output_path, encoding=encoding, mode=mode)
+            mode = 'a'
+        return
+
+    # 레이어 스키마는 첫 청크로 정하되, 첫 청크에서 값이 모두 null인 열은 뒤 청크의 값을 담을 수 있도록 형식을 올림
+    first = next(frames)
+    first_batch = _record_batch(first)
+    schema = _promote_null_fields(first_batch.schema, first.geometry.name)
+    if not schema.equals(first_batch.schema):
+        first_batch = _record_batch(first, schema)
+    batches = itertools.chain([first_batch], (_record_batch(frame, schema) for frame in frames))
+    if driver == 'GeoParquet':
+        _write_geoparquet(batches, schema, output_path, first.geometry.name, first.crs)
+    else:
+        _write_arrow_batches(batches, schema, output_path, first.geometry.name, _layer_geometry_type(first),
+                             first.crs.to_wkt() if first.crs is not None else None)
+
+def _transformed_frames(chunks, matrix: np.ndarray, progress_callback=None, timer: StageTimer=None, precision: int=3):
+    """ 청크마다 변환을 적용하여 돌려주고, 다음 청크를 요청받으면(= 이전 청크를 다 쓰면) 진행률을 알립니다. """
+    timer = timer if timer is not None else StageTimer()
+    for start, total, chunk in timer.iterate('read', chunks):
+        vertices = int(shapely.get_num_coordinates(chunk.geometry.values).sum())
+        with timer.stage('transform', features=len(chunk), vertices=vertices):
+            frame = transform_geodataframe(chunk, matrix, precision, timer=timer)
+        yield frame
+        if progress_callback is not None:
+            progress_callback(start + len(chunk), total)
+
+def _read_transform_slice(input_shapefile: str, encoding, columns, rows: tuple, fids, matrix: np.ndarray, precision: int) -> gpd.GeoDataFrame:
+    """ 피처 구간 하나(rows: (시작, 끝) 행 또는 fids: FID 배열)를 읽고 변환합니다. 프로세스 풀의 작업 단위입니다. """
+    if fids is not None:
+        chunk = gpd.read_file(input_shapefile, encoding=encoding, columns=columns, fids=fids)
+    else:
+        chunk = gpd.read_file(input_shapefile, encoding=encoding, columns=columns, rows=slice(*rows))
+    return transform_geodataframe(chunk, matrix, precision)
+
+def _parallel_frames(input_shapefile: str, chunk_size: int, matrix: np.ndarray, executor: ProcessPoolExecutor, workers: int, encoding='cp949',
+                     columns: list=None, filters: dict=None, progress_callback=None, timer: StageTimer=None, precision: int=3):
+    """
+    피처 범위를 행 구간(필터가 있으면 FID 구간)으로 나누어 프로세스 풀에서 구간마다 읽기와 변환을 함께 실행하고, 결과를 입력 순서대로 돌려줍니다.
+    chunk_size가 None이면 workers개 구간으로 나누며, 메모리를 제한하기 위해 동시에 workers + 1개 구간까지만 맡깁니다.
+    쓰기는 하나의 출력 파일에 순서대로 해야 하므로 호출한 프로세스에서 합니다. 현재 프로세스에서는 작업 결과를 기다린 시간이 transform 단계로 기록됩니다.
+    """
+    timer = timer if timer is not None else StageTimer()
+    filters = filters or {}
+    fids = select_features(input_shapefile, encoding, **filters) if filters else None
+    total = len(fids) if filters else pyogrio.read_info(input_shapefile, encoding=encoding)['features']
+    if total == 0:
+        # 피처가 없어도 스키마를 넘기기 위해 빈 청크 하나를 돌려줌
+        yield from _transformed_frames(iter_feature_chunks(input_shapefile, None, encoding, columns, **filters), matrix, progress_callback, timer, precision)
+        return
+
+    size = chunk_size or math.ceil(total / workers)
+    starts = iter(range(0, total, size))
+
+    def submit(start):
+        stop = min(start + size, total)
+        future = executor.submit(_read_transform_slice, input_shapefile, encoding, columns, (start, stop),
+                                 fids[start:stop] if fids is not None else None, matrix, precision)
+        return future, stop
+
+    pending = deque(submit(start) for start in itertools.islice(starts, workers + 1))
+    try:
+        while pending:
+            future, stop = pending.popleft()
+            wait_start = time.perf_counter()
+            frame = future.result()
+            timer.add('transform', time.perf_counter() - wait_start, features=len(frame),
+                      vertices=int(shapely.get_num_coordinates(frame.geometry.values).sum()))
+            # 쓰는 동안에도 작업자가 쉬지 않도록 다음 구간을 먼저 맡김
+            pending.extend(submit(start) for start in itertools.islice(starts, 1))
+            yield frame
+            if progress_callback is not None:
+                progress_callback(stop, total)
+    finally:
+        for future, _ in pending:
+            future.cancel()
+
+def _write_transformed_layer(input_shapefile: str, output_path: str, matrix: np.ndarray, encoding='cp949', chunk_size: int=None, columns: list=None,
+                             filters: dict=None, progress_callback=None, executor: ProcessPoolExecutor=None, workers: int=1, timer: StageTimer=None,
+                             precision: int=3):
+    """
+    입력을 청크(또는 구간)마다 읽고 변환하여 출력 형식에 맞게 하나의 레이어로 씁니다. (읽기, 변환 시간은 write 단계에서 빠짐)
+    executor가 있으면 구간별 읽기와 변환을 프로세스 풀에서 실행합니다 (_parallel_frames).
+    """
+    timer = timer if timer is not None else StageTimer()
+    filters = filters or {}
+    if executor is not None and workers > 1:
+        frames = _parallel_frames(input_shapefile, chunk_size, matrix, executor, workers, encoding, columns, filters, progress_callback, timer, precision)
+    else:
+        chunks = iter_feature_chunks(input_shapefile, chunk_size, encoding=encoding, columns=columns, **filters)
+        frames = _transformed_frames(chunks, matrix, progress_callback, timer, precision)
+    with timer.stage('write'):
+        write_layer(frames, output_path, encoding=encoding)
+
+def _transform_wkb_batch(batch, geometry_index: int, schema, matrix: np.ndarray, timer: StageTimer=None, precision: int=3):
+    """ RecordBatch의 WKB geometry 열만 디코딩 → 변환 → 인코딩하고 속성 열은 그대로 둡니다. """
+    import pyarrow as pa
+
+    geometries = shapely.from_wkb(batch.column(geometry_index).to_numpy(zero_copy_only=False))
+    transformed = apply_affine_matrix(geometries, matrix, precision, timer)
+    columns = list(batch.columns)
+    columns[geometry_index] = pa.array(shapely.to_wkb(transformed), type=schema.field(geometry_index).type)
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+def _adjust_arrow(input_shapefile: str, output_path: str, matrix: np.ndarray, encoding='cp949', chunk_size: int=None, progress_callback=None,
+                  timer: StageTimer=None, filters: dict=None, precision: int=3):
+    """
+    pyogrio Arrow 스트림으로 읽어 geometry(WKB) 열만 변환하고 Arrow로 다시 씁니다.
+    속성 값은 Arrow 버퍼로만 오가며 파이썬 객체(DataFrame)로 만들어지지 않습니다. filters(where, bbox, mask)는 GDAL 읽기 단계에서 적용됩니다.
+    """
+    from pyogrio.raw import open_arrow
+
+    timer = timer if timer is not None else StageTimer()
+    filters = filters or {}
+    if filters:
+        total = len(select_features(input_shapefile, encoding, **filters))
+    else:
+        total = pyogrio.read_info(input_shapefile, encoding=encoding)['features']
+    with open_arrow(input_shapefile, encoding=encoding, batch_size=chunk_size or ARROW_BATCH_SIZE, use_pyarrow=True, **filters) as (meta, reader):
+        geometry_index = reader.schema.get_field_index(meta['geometry_name'] or 'wkb_geometry')
+        schema = reader.schema.set(geometry_index, reader.schema.field(geometry_index).with_name('geometry'))
+
+        def batches():
+            done = 0
+            for batch in timer.iterate('read', reader):
+                with timer.stage('transform', features=batch.num_rows):
+                    transformed = _transform_wkb_batch(batch, geometry_index, schema, matrix, timer, precision)
+                yield transformed
+                done += batch.num_rows
+                if progress_callback is not None:
+                    progress_callback(done, total)
+
+        with timer.stage('write'):
+            if output_format(output_path) == 'GeoParquet':
+                _write_geoparquet(batches(), schema, output_path, 'geometry', meta['crs'])
+            else:
+                _write_arrow_batches(batches(), schema, output_path, 'geometry', meta['geometry_type'], meta['crs'], encoding=encoding)
+
+def _adjust_geometry_only(input_shapefile: str, output_shapefile: str, matrix: np.ndarray, chunk_size: int=None, progress_callback=None, hardlink: bool=False, executor=None, workers: int=1,
+                          timer: StageTimer=None, precision: int=3):
+    """
+    .shp/.shx의 좌표만 변환하고 .dbf, .prj, .cpg는 원본을 그대로 복사합니다.
+    속성 테이블을 읽거나 다시 쓰지 않으므로 DBF가 큰 레이어에서 입출력이 크게 줄어듭니다.
+    """
+    timer = timer if timer is not None else StageTimer()
+
+    # 출력과 같은 디렉터리의 임시 폴더에 geometry만 쓴 뒤 .shp/.shx만 옮김
+    temp_dir = tempfile.mkdtemp(prefix='.shp_convert_', dir=os.path.dirname(os.path.abspath(output_shapefile)))
+    try:
+        temp_shapefile = os.path.join(temp_dir, 'geometry.shp')
+        _write_transformed_layer(input_shapefile, temp_shapefile, matrix, chunk_size=chunk_size, columns=[], progress_callback=progress_callback,
+                                 executor=executor, workers=workers, timer=timer, precision=precision)
+
+        with timer.stage('write'):
+            remove_shapefile(output_shapefile)
+            base_path = os.path.splitext(output_shapefile)[0]
+            os.replace(os.path.join(temp_dir, 'geometry.shp'), base_path + '.shp')
+            os.replace(os.path.join(temp_dir, 'geometry.shx'), base_path + '.shx')
+            for ext in ('.dbf', '.prj', '.cpg'):
+                sidecar = find_sidecar(input_shapefile, ext)
+                if sidecar is not None:
+                    copy_sidecar(sidecar, base_path + ext, hardlink=hardlink)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def adjust_shapefile_features(input_shapefile: str, output_shapefile: str, translation: tuple=(0, 0), rotation_angle: float=0, scaling_factor: float=1.0, rotation_origin: tuple=(0, 0), encoding='cp949', chunk_size: int=None, progress_callback=None, matrix=None, reverse: bool=False, geometry_only: bool=False, hardlink: bool=False, workers: int=None, engine: str='geopandas', spatial_index: bool=False, incremental: bool=False, stats_log: bool=False, profiler: str=None, where: str=None, bbox: tuple=None, mask=None, precision: int=3):
+    """
+    Shapefile의 피처 좌표에 대해 이동, 회전, 축척 변환을 적용하여 새로운 파일에 저장합니다.
+    출력 형식은 확장자로 정합니다 (.shp, .fgb: FlatGeobuf, .parquet: GeoParquet).
+    chunk_size를 지정하면 피처를 나누어 읽고 변환한 뒤 출력 파일에 이어 쓰므로,
+    입력 크기와 관계없이 메모리 사용량이 청크 하나 크기로 유지됩니다.
     
     :param input_shapefile: (str), 입력 Shapefile 경로
-    :param output_shapefile: (str), 출력 Shapefile 경로
+    :param output_shapefile: (str), 출력 경로 (.shp, .fgb, .parquet)
     :param translation: (tuple), x, y 이동 거리 (기본값: (0, 0))
     :param rotation_angle: (float), 회전 각도 (기본값: 0도)
     :param scaling_factor: (float), 축척 배율 (기본값: 1)
     :param rotation_origin: (tuple), 회전 기준점 (기본값: (0, 0))
-    :return: none, shp 파일 저장
+    :param encoding: (str), 속성 인코딩, None이면 .cpg/DBF 헤더/속성 표본으로 감지 (기본값: 'cp949')
+    :param chunk_size: (int), 청크당 피처 수, None이면 한 번에 처리 (기본값: None)
+    :param progress_callback: (callable), 청크 처리 후 (처리된 피처 수, 전체 피처 수)로 호출됨.
+                              ConversionCancelled를 발생시키면 다음 청크 전에 작업이 중단됨 (기본값: None)
+    :param matrix: (np.ndarray | dict), 2x3 아핀 행렬 또는 estimate_transform 결과.
+                   지정하면 translation ~ rotation_origin 대신 사용 (기본값: None)
+    :param reverse: (bool), True이면 변환의 역행렬을 적용 (기본값: False)
+    :param geometry_only: (bool), True이면 .shp/.shx만 다시 쓰고 .dbf/.prj/.cpg는 원본을 복사 (기본값: False)
+    :param hardlink: (bool), geometry_only에서 부속 파일을 복사 대신 하드링크로 연결 (기본값: False)
+    :param workers: (int), 피처 범위를 나누어 구간마다 읽기와 변환을 맡길 프로세스 수, None 또는 1이면 현재 프로세스에서 처리.
+                    쓰기는 현재 프로세스에서 순서대로 하며 engine='arrow'와 함께 쓸 수 없음 (기본값: None)
+    :param engine: (str), 'geopandas'(GeoDataFrame 청크) 또는 'arrow'(Arrow 배치를 그대로 변환하여 씀, pyarrow와 GDAL 3.8 이상 필요).
+                   geometry_only에는 적용되지 않음 (기본값: 'geopandas')
+    :param spatial_index: (bool), .shp 출력이면 변환된 레코드 bbox로 .qix 공간 인덱스를 새로 만듦 (기본값: False)
+    :param incremental: (bool), 이전 실행의 manifest와 비교하여 바뀐 피처만 변환 (shp_incremental 참고).
+                        입력 전체를 한 번에 읽고 출력도 전부 다시 쓰며 건너뛰는 것은 변환 단계뿐이므로
+                        chunk_size, engine='arrow', workers와 함께 쓸 수 없음 (기본값: False)
+    :param stats_log: (bool), 단계별 통계를 출력 옆 JSON(<출력>.stats.json)으로 저장 (기본값: False)
+    :param profiler: (str), 'cprofile' 또는 'pyinstrument'이면 프로파일 결과를 출력 옆에 저장 (기본값: None)
+    :param where: (str), OGR SQL WHERE 조건, 맞는 피처만 변환하여 씀 (예: "SGG_CD = '11110'") (기본값: None)
+    :param bbox: (tuple), (xmin, ymin, xmax, ymax) 영역과 겹치는 피처만 변환 (기본값: None)
+    :param mask: (BaseGeometry), 이 geometry와 겹치는 피처만 변환 (bbox와 함께 쓸 수 없음).
+                 필터는 GDAL 읽기 단계에서 처리되며 선택되지 않은 피처는 디코딩하지 않음 (기본값: None)
+    :param precision: (int), 변환된 좌표를 반올림할 소수점 자리 수 (기본값: 3)
+    :return: (dict), total_seconds, peak_rss_mb, stages(단계별 seconds, calls, features, vertices, peak_rss_mb) 항목을 가진 통계와
+             한 줄 요약(summary). incremental이면 incremental 항목(transformed, reused 등) 추가
     """
-    # Shapefile 읽기
-    gdf = gpd.read_file(input_shapefile, encoding=encoding)
-    
-    # 각 피처의 기하학적 객체에 대해 변환 적용
-    gdf['geometry'] = gdf['geometry'].apply(lambda geom: transform_geometry(geom, translation, rotation_angle, scaling_factor, rotation_origin))
+    # 출력을 처음 쓸 때(또는 취소할 때) 입력이 지워지지 않도록 같은 파일이면 거부 (대소문자만 다른 경로, 하드링크 포함)
+    if same_file(input_shapefile, output_shapefile):
+        raise ValueError("output path must differ from the input path")
+    # 변환 행렬을 한 번만 합성한 뒤 전체 좌표 배열에 일괄 적용
+    if matrix is None:
+        matrix = build_affine_matrix(translation, rotation_angle, scaling_factor, rotation_origin)
+    elif isinstance(matrix, dict):
+        matrix = np.asarray(matrix["matrix"], dtype=float)
+    else:
+        matrix = np.asarray(matrix, dtype=float)
+    if reverse:
+        matrix = invert_affine_matrix(matrix)
+    if encoding is None:
+        encoding = detect_encoding(input_shapefile)
+    if geometry_only and output_format(output_shapefile) != 'ESRI Shapefile':
+        raise ValueError("geometry-only mode requires a .shp output")
+    if geometry_only and incremental:
+        raise ValueError("geometry-only mode cannot be combined with incremental mode")
+    if bbox is not None and mask is not None:
+        raise ValueError("bbox and mask filters cannot be combined")
+    # 입력 좌표계 기준 필터, 지정된 것만 reader에 넘김
+    filters = {key: value for key, value in (('where', where), ('bbox', bbox), ('mask', mask)) if value is not None}
+    if filters and (geometry_only or incremental):
+        raise ValueError("where/bbox/mask filters cannot be combined with geometry-only or incremental mode")
+    if engine not in ('geopandas', 'arrow'):
+        raise ValueError(f"unknown engine: {engine}")
+    if incremental and (chunk_size is not None or engine != 'geopandas' or (workers is not None and workers > 1)):
+        raise ValueError("incremental mode reads the whole input at once and cannot be combined with chunk_size, the arrow engine or workers")
+    if engine == 'arrow' and workers is not None and workers > 1 and not geometry_only:
+        raise ValueError("the arrow engine cannot be combined with workers")
+    shapefile_output = output_format(output_shapefile) == 'ESRI Shapefile'
+    if shapefile_output and not incremental:
+        # 이전 출력에 남아 있을 수 있는 공간 인덱스는 변환 후 좌표와 맞지 않으므로 삭제
+        remove_spatial_index(output_shapefile)
+
+    timer = StageTimer()
+    incremental_stats = None
+    # 프로세스 풀은 청크마다 만들지 않고 작업 전체에서 한 번만 생성
+    partitions = workers if workers is not None and workers > 1 else 1
+    with profiled(output_shapefile, profiler), (ProcessPoolExecutor(max_workers=partitions) if partitions > 1 else nullcontext()) as executor:
+        if incremental:
+            from shp_incremental import incremental_adjust
+
+            incremental_stats = incremental_adjust(input_shapefile, output_shapefile, matrix, encoding, precision, progress_callback=progress_callback, timer=timer)
+            if shapefile_output and not incremental_stats["skipped"]:
+                remove_spatial_index(output_shapefile)
+        elif geometry_only:
+            _adjust_geometry_only(input_shapefile, output_shapefile, matrix, chunk_size, progress_callback, hardlink, executor, partitions, timer, precision)
+        elif engine == 'arrow':
+            _adjust_arrow(input_shapefile, output_shapefile, matrix, encoding, chunk_size, progress_callback, timer, filters, precision)
+        else:
+            # 청크(또는 구간) 단위 읽기 → 변환 → 쓰기
+            _write_transformed_layer(input_shapefile, output_shapefile, matrix, encoding=encoding, chunk_size=chunk_size, filters=filters,
+                                     progress_callback=progress_callback, executor=executor, workers=partitions, timer=timer, precision=precision)
+
+        # 출력을 다시 쓰지 않았으면 남아 있는 공간 인덱스를 그대로 사용
+        index_current = incremental_stats is not None and incremental_stats["skipped"] and find_sidecar(output_shapefile, '.qix') is not None
+        if spatial_index and shapefile_output and not index_current:
+            from shp_index import write_qix
+
+            with timer.stage('index'):
+                write_qix(output_shapefile)
+
+    timer.finish()
+    stats = dict(timer.to_dict(), summary=timer.summary())
+    if incremental_stats is not None:
+        stats["incremental"] = incremental_stats
+    if stats_log:
+        write_stats_log(output_shapefile, stats, input=input_shapefile, engine='incremental' if incremental else 'geometry_only' if geometry_only else engine,
+                        workers=partitions, chunk_size=chunk_size, encoding=encoding, filters={key: list(value.bounds) if key == 'mask' else value for key, value in filters.items()})
+    return stats
+
+def remove_shapefile(shapefile: str):
+    """
+    Shapefile과 그 부속 파일(.shx, .dbf, .prj 등)을 모두 삭제합니다.
+    중단된 변환의 불완전한 출력을 정리할 때 사용합니다. .fgb, .parquet 출력은 그 파일만 삭제합니다.
+
+    :param shapefile: (str), 삭제할 Shapefile(.shp) 또는 출력 파일 경로
+    :return: none
+    """
+    if os.path.splitext(shapefile)[1].lower() in ('.fgb', '.parquet'):
+        if os.path.exists(shapefile):
+            os.remove(shapefile)
+        return
 
-       # 변환된 Shapefile 쓰기
-    gdf.to_file(output_shapefile, encoding=encoding)
+    base_path = os.path.splitext(shapefile)[0]
+    for ext in SHAPEFILE_EXTENSIONS:
+        if os.path.exists(base_path + ext):
+            os.remove(base_path + ext)
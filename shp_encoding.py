@@ -0,0 +1,151 @@
+import codecs
+import functools
+import os
+import struct
+
+from shp_files import find_sidecar
+
+# DBF 헤더 29번째 바이트(Language Driver ID) → 코드페이지 (GDAL Shapefile 드라이버 표 기준)
+LDID_ENCODINGS = {
+    0x01: 'cp437', 0x02: 'cp850', 0x08: 'cp865', 0x0A: 'cp850', 0x0B: 'cp437', 0x0D: 'cp437', 0x0E: 'cp850',
+    0x0F: 'cp437', 0x10: 'cp850', 0x11: 'cp437', 0x12: 'cp850', 0x13: 'cp932', 0x14: 'cp850', 0x15: 'cp437',
+    0x16: 'cp850', 0x17: 'cp865', 0x18: 'cp437', 0x19: 'cp437', 0x1A: 'cp850', 0x1B: 'cp437', 0x1C: 'cp863',
+    0x1D: 'cp850', 0x1F: 'cp852', 0x22: 'cp852', 0x23: 'cp852', 0x24: 'cp860', 0x25: 'cp850', 0x26: 'cp866',
+    0x37: 'cp850', 0x40: 'cp852', 0x4D: 'cp936', 0x4E: 'cp949', 0x4F: 'cp950', 0x50: 'cp874', 0x64: 'cp852',
+    0x65: 'cp866', 0x66: 'cp865', 0x67: 'cp861', 0x6A: 'cp737', 0x6B: 'cp857', 0x6C: 'cp863', 0x78: 'cp950',
+    0x79: 'cp949', 0x7A: 'cp936', 0x7B: 'cp932', 0x7C: 'cp874', 0x86: 'cp737', 0x87: 'cp852', 0x88: 'cp857',
+    0xC8: 'cp1250', 0xC9: 'cp1251', 0xCA: 'cp1254', 0xCB: 'cp1253', 0xCC: 'cp1257',
+}
+
+# 'ANSI'(0x57)나 Latin 계열 LDID는 한글 데이터에도 흔히 기록되어 있어 실제 인코딩을 알려주지 못함
+GENERIC_LDIDS = (0x00, 0x03, 0x57, 0x58, 0x59)
+
+DEFAULT_ENCODING = 'cp949'
+
+# 속성 표본으로 읽을 최대 바이트 수 (파일 앞부분과 뒷부분 각각)
+SAMPLE_BYTES = 1 << 20
+
+def _normalize_cpg(text: str) -> str:
+    """ .cpg 내용을 파이썬 코덱 이름으로 바꿉니다. 알 수 없으면 None """
+    name = text.strip().strip('\x00').upper()
+    if not name:
+        return None
+    if name.startswith('ANSI '):
+        name = name[5:].strip()
+    if name in ('65001', 'UTF8', 'UTF-8'):
+        return 'utf-8'
+    if name in ('88591', '8859-1', 'ISO88591'):
+        return 'latin-1'
+    if name.isdigit():
+        name = 'CP' + name
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+def _character_field_slices(header: bytes) -> list:
+    """ DBF 필드 서술자에서 문자(C) 필드의 레코드 내 (시작, 끝) 위치를 구합니다. """
+    slices = []
+    offset = 1  # 레코드 첫 바이트는 삭제 표시
+    for start in range(32, len(header) - 31, 32):
+        descriptor = header[start:start + 32]
+        if descriptor[0] == 0x0D:
+            break
+        length = descriptor[16]
+        if descriptor[11:12] == b'C':
+            slices.append((offset, offset + length))
+        offset += length
+    return slices
+
+def _sample_text_bytes(dbf_path: str) -> bytes:
+    """ DBF 앞부분과 뒷부분 레코드에서 문자 필드 바이트만 모읍니다. """
+    with open(dbf_path, 'rb') as f:
+        head = f.read(32)
+        if len(head) < 32:
+            return b''
+        record_count, header_length, record_length = struct.unpack('<IHH', head[4:12])
+        header = head + f.read(header_length - 32)
+        slices = _character_field_slices(header)
+        if not slices or record_length == 0 or record_count == 0:
+            return b''
+
+        per_block = max(1, SAMPLE_BYTES // record_length)
+        blocks = [(0, min(record_count, per_block))]
+        if record_count > per_block:
+            blocks.append((max(per_block, record_count - per_block), record_count))
+
+        sample = bytearray()
+        for first, last in blocks:
+            f.seek(header_length + first * record_length)
+            data = f.read((last - first) * record_length)
+            for pos in range(0, len(data) - record_length + 1, record_length):
+                for start, stop in slices:
+                    sample += data[pos + start:pos + stop].rstrip(b' \x00')
+                sample += b'\n'
+    return bytes(sample)
+
+def _guess_from_sample(sample: bytes) -> str:
+    """ 문자 필드 표본 바이트로 인코딩을 추정합니다. ASCII만 있으면 판단할 수 없으므로 None """
+    if sample.isascii():
+        return None
+    for candidate in ('utf-8', 'cp949'):
+        try:
+            sample.decode(candidate)
+            return candidate
+        except UnicodeDecodeError:
+            continue
+    return 'latin-1'
+
+@functools.lru_cache(maxsize=256)
+def _detect(dbf_key: tuple, cpg_key: tuple) -> tuple:
+    # 1) .cpg
+    if cpg_key is not None:
+        with open(cpg_key[0], 'r', encoding='ascii', errors='ignore') as f:
+            encoding = _normalize_cpg(f.read(64))
+        if encoding is not None:
+            return encoding, 'cpg'
+
+    if dbf_key is None:
+        return DEFAULT_ENCODING, 'default'
+
+    # 2) DBF language driver ID
+    with open(dbf_key[0], 'rb') as f:
+        head = f.read(32)
+    ldid = head[29] if len(head) >= 32 else 0
+    if ldid not in GENERIC_LDIDS and ldid in LDID_ENCODINGS:
+        return LDID_ENCODINGS[ldid], 'ldid'
+
+    # 3) 속성 바이트 표본
+    encoding = _guess_from_sample(_sample_text_bytes(dbf_key[0]))
+    if encoding is not None:
+        return encoding, 'sample'
+
+    return DEFAULT_ENCODING, 'default'
+
+def _file_key(path: str) -> tuple:
+    """ 캐시 키로 사용할 (경로, 크기, 수정 시각). 파일이 없으면 None """
+    if path is None:
+        return None
+    stat = os.stat(path)
+    return path, stat.st_size, stat.st_mtime_ns
+
+def detect_encoding_with_source(shapefile: str) -> tuple:
+    """
+    GDAL로 레이어를 열지 않고 Shapefile 속성 인코딩을 추정합니다.
+    .cpg → DBF language driver ID → 문자 필드 표본 순서로 확인하며,
+    결과는 .dbf/.cpg의 (경로, 크기, 수정 시각)별로 캐시됩니다.
+
+    :param shapefile: (str), Shapefile(.shp) 경로
+    :return: (tuple), (인코딩, 근거) 근거는 'cpg', 'ldid', 'sample', 'default' 중 하나
+    """
+    shapefile = os.path.abspath(shapefile)
+    return _detect(_file_key(find_sidecar(shapefile, '.dbf')), _file_key(find_sidecar(shapefile, '.cpg')))
+
+def detect_encoding(shapefile: str) -> str:
+    """
+    GDAL로 레이어를 열지 않고 Shapefile 속성 인코딩을 추정합니다. (detect_encoding_with_source 참고)
+
+    :param shapefile: (str), Shapefile(.shp) 경로
+    :return: (str), 파이썬 코덱 이름 (예: 'cp949', 'utf-8')
+    """
+    return detect_encoding_with_source(shapefile)[0]
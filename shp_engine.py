@@ -0,0 +1,383 @@
+import os
+import queue
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import geopandas as gpd
+import numpy as np
+import pyogrio
+import shapely
+from shapely.affinity import affine_transform
+
+from shp_convert import (adjust_shapefile_features, apply_affine_matrices, apply_affine_matrix, apply_keyed_matrices, iter_feature_chunks,
+                         output_format, round_coordinates, write_layer)
+from shp_encoding import detect_encoding
+from shp_files import remove_spatial_index
+from shp_stats import StageTimer, write_stats_log
+
+# reference: shapely 피처별 변환 (기준 구현), vectorized: NumPy 일괄 변환, native: .shp mmap 직접 수정
+BACKENDS = ('reference', 'vectorized', 'native')
+
+def reference_transform(geometry, matrix, precision: int = 3):
+    """
+    shapely로 피처 하나에 아핀 행렬을 적용합니다. 다른 backend를 검증하는 기준 구현입니다.
+
+    :param geometry: (BaseGeometry), 변환할 shapely geometry (None이면 그대로 돌려줌)
+    :param matrix: (array-like), 2x3 아핀 행렬
+    :param precision: (int), 반올림할 소수점 자리 수, None이면 반올림하지 않음 (기본값: 3)
+    :return: (BaseGeometry), 변환된 geometry
+    """
+    if geometry is None:
+        return None
+    (a, b, xoff), (d, e, yoff) = np.asarray(matrix, dtype=float)
+    transformed = affine_transform(geometry, [a, b, d, e, xoff, yoff])
+    return round_coordinates(transformed, precision) if precision is not None else transformed
+
+def transform_geometries(geometries, matrix, backend: str = 'vectorized', precision: int = 3) -> np.ndarray:
+    """
+    메모리에 있는 geometry 배열을 지정한 backend로 변환합니다.
+
+    :param geometries: (array-like), shapely geometry 배열
+    :param matrix: (array-like), 2x3 아핀 행렬
+    :param backend: (str), 'reference' 또는 'vectorized' ('native'는 파일 단위로만 동작) (기본값: 'vectorized')
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :return: (np.ndarray), 변환된 geometry 배열
+    """
+    if backend == 'reference':
+        return np.array([reference_transform(geom, matrix, precision) for geom in geometries], dtype=object)
+    if backend == 'vectorized':
+        return apply_affine_matrix(geometries, matrix, precision)
+    if backend == 'native':
+        raise ValueError("the native backend rewrites .shp files and cannot transform geometries in memory")
+    raise ValueError(f"unknown backend: {backend}")
+
+def _reference_frames(chunks, matrix, precision: int, progress_callback, timer: StageTimer):
+    for start, total, chunk in timer.iterate('read', chunks):
+        geometries = chunk.geometry.values
+        with timer.stage('transform', features=len(chunk), vertices=int(shapely.get_num_coordinates(geometries).sum())):
+            chunk['geometry'] = gpd.GeoSeries(transform_geometries(geometries, matrix, 'reference', precision), index=chunk.index, crs=chunk.crs)
+        yield chunk
+        if progress_callback is not None:
+            progress_callback(start + len(chunk), total)
+
+def convert(input_shapefile: str, output_path: str, matrix, backend: str = 'vectorized', encoding: str = None, chunk_size: int = None,
+            progress_callback=None, precision: int = 3, stats_log: bool = False, **options) -> dict:
+    """
+    선택한 backend로 Shapefile 하나를 변환합니다. 모든 backend는 같은 행렬과 같은 반올림 규칙을 사용합니다.
+
+    - reference: GeoDataFrame을 읽고 피처마다 shapely로 변환 (느리지만 가장 단순한 기준 구현)
+    - vectorized: adjust_shapefile_features (NumPy 일괄 변환, 출력 형식, engine, workers 등 options 사용 가능)
+    - native: shp_codec.transform_shapefile (.shp 출력만, 속성 파일은 바이트 단위 복사, workers, hardlink, spatial_index 사용 가능)
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param output_path: (str), 출력 경로
+    :param matrix: (array-like), 2x3 아핀 행렬
+    :param backend: (str), 'reference', 'vectorized', 'native' 중 하나 (기본값: 'vectorized')
+    :param encoding: (str), 속성 인코딩, None이면 감지 (기본값: None)
+    :param chunk_size: (int), 청크당 피처 수 (기본값: None)
+    :param progress_callback: (callable), (처리된 수, 전체 수)로 호출됨 (기본값: None)
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :param stats_log: (bool), 단계별 통계를 출력 옆 JSON으로 저장 (기본값: False)
+    :param options: backend별 추가 인자
+    :return: (dict), adjust_shapefile_features와 같은 형식의 통계 (backend 항목 추가)
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    if backend == 'vectorized':
+        stats = adjust_shapefile_features(input_shapefile, output_path, encoding=encoding, chunk_size=chunk_size,
+                                          progress_callback=progress_callback, matrix=matrix, stats_log=stats_log, precision=precision, **options)
+        return dict(stats, backend=backend)
+
+    timer = StageTimer()
+    if backend == 'reference':
+        if options:
+            raise TypeError(f"unexpected options for the reference backend: {', '.join(options)}")
+        if encoding is None:
+            encoding = detect_encoding(input_shapefile)
+        if output_format(output_path) == 'ESRI Shapefile':
+            remove_spatial_index(output_path)
+        chunks = iter_feature_chunks(input_shapefile, chunk_size, encoding=encoding)
+        with timer.stage('write'):
+            write_layer(_reference_frames(chunks, matrix, precision, progress_callback, timer), output_path, encoding=encoding)
+    elif backend == 'native':
+        from shp_codec import transform_shapefile
+
+        if output_format(output_path) != 'ESRI Shapefile':
+            raise ValueError("the native backend only writes .shp outputs")
+        start = time.perf_counter()
+        result = transform_shapefile(input_shapefile, output_path, matrix, precision=precision, progress_callback=progress_callback, **options)
+        timer.add('transform', time.perf_counter() - start, features=result["records"], vertices=result["points"])
+    else:
+        raise ValueError(f"unknown backend: {backend}")
+
+    timer.finish()
+    stats = dict(timer.to_dict(), summary=timer.summary(), backend=backend)
+    if stats_log:
+        write_stats_log(output_path, timer.to_dict(), input=input_shapefile, backend=backend)
+    return stats
+
+def _queued_frames(frames: queue.Queue):
+    """ 큐에서 청크를 꺼내 돌려줍니다. None이면 끝, 예외 객체면 그 예외를 발생시켜 쓰기를 중단합니다. """
+    while True:
+        frame = frames.get()
+        if frame is None:
+            return
+        if isinstance(frame, BaseException):
+            raise frame
+        yield frame
+
+def _put(frames: queue.Queue, item, writer) -> bool:
+    """ 쓰기 스레드의 큐에 넣습니다. 스레드가 이미 끝났으면(실패) 기다리지 않고 False """
+    while not writer.done():
+        try:
+            frames.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def convert_many(input_shapefile: str, output_paths: list, matrices, encoding: str = None, chunk_size: int = None, progress_callback=None,
+                 precision: int = 3, spatial_index: bool = False) -> dict:
+    """
+    Shapefile 하나를 읽어 아핀 행렬 K개로 변환한 K개의 출력을 한 번에 씁니다.
+    읽기와 geometry 디코딩은 청크마다 한 번만 하고, K개 행렬은 apply_affine_matrices로 함께 계산합니다.
+    출력마다 쓰기 스레드가 하나씩 있어 청크 단위로 동시에 이어 씁니다. (FlatGeobuf, GeoParquet도 하나의 스트림으로 씀)
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param output_paths: (list), 행렬 순서에 대응하는 출력 경로 K개 (.shp, .fgb, .parquet)
+    :param matrices: (array-like), (K x 2 x 3) 아핀 행렬 배열
+    :param encoding: (str), 속성 인코딩, None이면 감지 (기본값: None)
+    :param chunk_size: (int), 청크당 피처 수, None이면 한 번에 처리 (기본값: None)
+    :param progress_callback: (callable), 청크마다 (처리된 피처 수, 전체 피처 수)로 호출됨 (기본값: None)
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :param spatial_index: (bool), .shp 출력에 .qix 공간 인덱스를 만듦 (기본값: False)
+    :return: (dict), adjust_shapefile_features와 같은 형식의 통계와 outputs 항목
+    """
+    matrices = np.asarray(matrices, dtype=float).reshape(-1, 2, 3)
+    if len(matrices) != len(output_paths):
+        raise ValueError(f"{len(matrices)} matrices for {len(output_paths)} outputs")
+    if len(set(os.path.abspath(path) for path in output_paths)) != len(output_paths):
+        raise ValueError("output paths must be distinct")
+    if encoding is None:
+        encoding = detect_encoding(input_shapefile)
+    for path in output_paths:
+        if output_format(path) == 'ESRI Shapefile':
+            remove_spatial_index(path)
+
+    timer = StageTimer()
+    # 청크 두 개까지만 미리 변환해 두어 메모리 사용량을 제한
+    queues = [queue.Queue(maxsize=2) for _ in output_paths]
+    with ThreadPoolExecutor(max_workers=len(output_paths), thread_name_prefix='shp_writer') as pool:
+        writers = [pool.submit(write_layer, _queued_frames(frames), path, encoding) for frames, path in zip(queues, output_paths)]
+        try:
+            chunks = iter_feature_chunks(input_shapefile, chunk_size, encoding=encoding)
+            for start, total, chunk in timer.iterate('read', chunks):
+                geometries = chunk.geometry.values
+                vertices = int(shapely.get_num_coordinates(geometries).sum())
+                with timer.stage('transform', features=len(chunk), vertices=vertices):
+                    transformed = apply_affine_matrices(geometries, matrices, precision, timer)
+                # 쓰기 스레드가 밀려 큐가 차 있으면 기다리는 시간을 write 단계로 기록
+                with timer.stage('write'):
+                    for frames, writer, result in zip(queues, writers, transformed):
+                        frame = chunk.assign(**{chunk.geometry.name: gpd.GeoSeries(result, index=chunk.index, crs=chunk.crs)})
+                        if not _put(frames, frame, writer):
+                            writer.result()
+                if progress_callback is not None:
+                    progress_callback(start + len(chunk), total)
+            for frames, writer in zip(queues, writers):
+                _put(frames, None, writer)
+        except BaseException as e:
+            # 나머지 쓰기 스레드도 같은 예외로 중단 (with 블록을 나가면서 스레드 종료를 기다림)
+            for frames, writer in zip(queues, writers):
+                _put(frames, e, writer)
+            raise
+
+        with timer.stage('write'):
+            for writer in writers:
+                writer.result()
+
+    if spatial_index:
+        from shp_index import write_qix
+
+        with timer.stage('index'):
+            for path in output_paths:
+                if output_format(path) == 'ESRI Shapefile':
+                    write_qix(path)
+
+    timer.finish()
+    return dict(timer.to_dict(), summary=timer.summary(), outputs=list(output_paths))
+
+def key_text(value) -> str:
+    """
+    키 컬럼 값을 매핑 키와 비교할 문자열로 바꿉니다.
+    null이 섞인 정수 컬럼은 float64로 읽히므로 정수 값인 실수는 소수점 없이 씁니다. (11110.0 → '11110')
+
+    :param value: 키 컬럼 값
+    :return: (str), 비교할 문자열, null(None, NaN)이면 None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (float, np.floating)):
+        if np.isnan(value):
+            return None
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+    if isinstance(value, np.integer):
+        return str(int(value))
+    return str(value)
+
+def feature_groups(values, keys: list, default: bool = False) -> np.ndarray:
+    """
+    속성 값을 keys의 위치(행렬 번호)로 바꿉니다. 값은 key_text로 바꾼 문자열로 비교합니다.
+    null 값은 기본 변환을 사용하며, 기본 변환이 없으면 ValueError가 발생합니다.
+
+    :param values: (array-like), 피처별 키 컬럼 값
+    :param keys: (list), 행렬 순서의 키 (문자열)
+    :param default: (bool), True이면 목록에 없는 값과 null은 마지막 행렬(기본 변환)을 사용 (기본값: False)
+    :return: (np.ndarray), 피처별 행렬 번호
+    """
+    texts = np.asarray([key_text(value) for value in values], dtype=object)
+    null = np.array([text is None for text in texts], dtype=bool)
+    if null.any() and not default:
+        raise ValueError(f"{int(null.sum())} feature(s) have a null key value and there is no default ('*') conversion")
+
+    groups = np.full(len(texts), len(keys), dtype=np.int64)
+    unique, inverse = np.unique(texts[~null], return_inverse=True)
+    positions = {key: i for i, key in enumerate(keys)}
+    fallback = len(keys) if default else -1
+    lookup = np.array([positions.get(value, fallback) for value in unique], dtype=np.int64)
+    if (lookup < 0).any():
+        missing = unique[lookup < 0]
+        raise ValueError(f"no conversion for key value(s): {', '.join(missing[:10])}" + (" ..." if len(missing) > 10 else ""))
+    groups[~null] = lookup[inverse.reshape(-1)]
+    return groups
+
+def convert_by_key(input_shapefile: str, output_path: str, key_column: str, conversions: dict, default=None, encoding: str = None,
+                   chunk_size: int = None, progress_callback=None, precision: int = 3, spatial_index: bool = False) -> dict:
+    """
+    속성 컬럼 값에 따라 피처마다 다른 아핀 행렬을 적용하여 하나의 출력으로 씁니다. (예: 측량 지구별 좌표변환)
+    청크마다 키 값을 행렬 번호로 바꾼 뒤 apply_keyed_matrices로 한 번에 변환하므로 피처 순서와 속성은 그대로 유지됩니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param output_path: (str), 출력 경로 (.shp, .fgb, .parquet)
+    :param key_column: (str), 변환을 고르는 속성 컬럼 이름
+    :param conversions: (dict), {키 값(문자열): 2x3 아핀 행렬}
+    :param default: (array-like), 키가 없는 피처에 적용할 2x3 행렬, None이면 그런 피처가 있을 때 ValueError (기본값: None)
+    :param encoding: (str), 속성 인코딩, None이면 감지 (기본값: None)
+    :param chunk_size: (int), 청크당 피처 수, None이면 한 번에 처리 (기본값: None)
+    :param progress_callback: (callable), 청크마다 (처리된 피처 수, 전체 피처 수)로 호출됨 (기본값: None)
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :param spatial_index: (bool), .shp 출력이면 .qix 공간 인덱스를 만듦 (기본값: False)
+    :return: (dict), adjust_shapefile_features와 같은 형식의 통계와 groups(키 값별 피처 수) 항목
+    """
+    keys = [str(key) for key in conversions]
+    matrices = [np.asarray(conversions[key], dtype=float) for key in conversions]
+    if default is not None:
+        matrices.append(np.asarray(default, dtype=float))
+    matrices = np.stack(matrices).reshape(-1, 2, 3)
+    if encoding is None:
+        encoding = detect_encoding(input_shapefile)
+    fields = pyogrio.read_info(input_shapefile, encoding=encoding)['fields']
+    if key_column not in fields:
+        raise ValueError(f"key column '{key_column}' not found, expected one of {', '.join(fields)}")
+    if output_format(output_path) == 'ESRI Shapefile':
+        remove_spatial_index(output_path)
+
+    timer = StageTimer()
+    counts = np.zeros(len(matrices), dtype=np.int64)
+
+    def frames():
+        chunks = iter_feature_chunks(input_shapefile, chunk_size, encoding=encoding)
+        for start, total, chunk in timer.iterate('read', chunks):
+            geometries = chunk.geometry.values
+            groups = feature_groups(chunk[key_column].values, keys, default is not None)
+            counts[:] += np.bincount(groups, minlength=len(matrices))
+            with timer.stage('transform', features=len(chunk), vertices=int(shapely.get_num_coordinates(geometries).sum())):
+                chunk['geometry'] = gpd.GeoSeries(apply_keyed_matrices(geometries, groups, matrices, precision, timer), index=chunk.index, crs=chunk.crs)
+            yield chunk
+            if progress_callback is not None:
+                progress_callback(start + len(chunk), total)
+
+    with timer.stage('write'):
+        write_layer(frames(), output_path, encoding=encoding)
+    if spatial_index and output_format(output_path) == 'ESRI Shapefile':
+        from shp_index import write_qix
+
+        with timer.stage('index'):
+            write_qix(output_path)
+
+    timer.finish()
+    groups = dict(zip(keys + (['*'] if default is not None else []), counts.tolist()))
+    return dict(timer.to_dict(), summary=timer.summary(), groups=groups)
+
+def sample_ids(total: int, sample: int, seed: int = 0) -> np.ndarray:
+    """ 0 ~ total-1 중 sample개의 피처 번호를 중복 없이 골라 오름차순으로 돌려줍니다. (처음과 마지막 피처는 항상 포함) """
+    if sample is None or sample >= total:
+        return np.arange(total)
+    if sample < 2:
+        return np.arange(max(sample, 0))
+    # 처음과 마지막을 뺀 1 ~ total-2에서 sample-2개를 고르고 양 끝을 더함
+    rng = np.random.default_rng(seed)
+    middle = rng.choice(np.arange(1, total - 1), size=sample - 2, replace=False)
+    return np.sort(np.concatenate([[0, total - 1], middle]))
+
+def _sample_geometries(backend: str, input_shapefile: str, matrix, ids: np.ndarray, precision: int, workdir: str) -> np.ndarray:
+    """ 표본 피처를 backend로 변환한 geometry 배열 (ids 순서) """
+    if backend == 'native':
+        from shp_codec import transform_record_subset
+
+        # 표본 레코드만 작은 .shp로 옮겨 변환하므로 입력 전체를 복사하거나 변환하지 않음
+        output = os.path.join(workdir, 'native.shp')
+        transform_record_subset(input_shapefile, output, ids, matrix, precision)
+        return gpd.read_file(output, columns=[]).geometry.values
+    geometries = gpd.read_file(input_shapefile, columns=[], fids=ids).geometry.values
+    return transform_geometries(geometries, matrix, backend, precision)
+
+def _compare(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """ 피처별 XY 좌표 최대 차이. 좌표 수가 다르면 inf """
+    difference = np.zeros(len(expected))
+    counts = shapely.get_num_coordinates(expected)
+    same_shape = counts == shapely.get_num_coordinates(actual)
+    difference[~same_shape] = np.inf
+
+    coords_expected = shapely.get_coordinates(expected[same_shape])
+    coords_actual = shapely.get_coordinates(actual[same_shape])
+    feature = np.repeat(np.flatnonzero(same_shape), counts[same_shape])
+    np.maximum.at(difference, feature, np.abs(coords_expected - coords_actual).max(axis=1, initial=0.0))
+    return difference
+
+def verify_backends(input_shapefile: str, matrix, backends: tuple = ('reference', 'vectorized'), sample: int = 1000, tolerance: float = 1e-6,
+                    precision: int = 3, seed: int = 0) -> dict:
+    """
+    표본 피처를 여러 backend로 변환하여 좌표가 허용 오차 안에서 같은지 비교합니다.
+    첫 번째 backend를 기준으로 나머지를 비교하며, 속성은 비교하지 않습니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param matrix: (array-like), 2x3 아핀 행렬
+    :param backends: (tuple), 비교할 backend (기본값: ('reference', 'vectorized'))
+    :param sample: (int), 표본 피처 수, None이면 전체 (기본값: 1000)
+    :param tolerance: (float), 허용 좌표 차이 (기본값: 1e-6)
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :param seed: (int), 표본 추출 난수 시드 (기본값: 0)
+    :return: (dict), backends, features, sample, tolerance, max_difference(backend별), mismatched(backend별 피처 번호, 최대 20개), ok 항목
+    """
+    if len(backends) < 2:
+        raise ValueError("verification needs at least two backends")
+    for backend in backends:
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend: {backend}")
+
+    matrix = np.asarray(matrix, dtype=float)
+    total = pyogrio.read_info(input_shapefile)['features']
+    ids = sample_ids(total, sample, seed)
+
+    with tempfile.TemporaryDirectory(prefix='shp_verify_') as workdir:
+        results = {backend: _sample_geometries(backend, input_shapefile, matrix, ids, precision, workdir) for backend in backends}
+
+    expected = results[backends[0]]
+    report = {"backends": list(backends), "features": total, "sample": len(ids), "tolerance": tolerance, "max_difference": {}, "mismatched": {}}
+    for backend in backends[1:]:
+        difference = _compare(expected, results[backend])
+        report["max_difference"][backend] = float(difference.max(initial=0.0))
+        report["mismatched"][backend] = ids[difference > tolerance][:20].tolist()
+    report["ok"] = all(value <= tolerance for value in report["max_difference"].values())
+    return report
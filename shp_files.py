@@ -0,0 +1,98 @@
+import os
+import shutil
+import struct
+
+# Shapefile을 구성하는 파일 확장자
+SHAPEFILE_EXTENSIONS = ('.shp', '.shx', '.dbf', '.prj', '.cpg', '.sbn', '.sbx', '.qix')
+
+# Shapefile 레코드 형식 (ESRI Shapefile Technical Description)
+NULL_SHAPE = 0
+POINT_TYPES = (1, 11, 21)               # Point, PointZ, PointM
+POLY_TYPES = (3, 5, 13, 15, 23, 25)     # PolyLine, Polygon 및 Z/M
+POLYGON_TYPES = (5, 15, 25)
+MULTIPOINT_TYPES = (8, 18, 28)          # MultiPoint 및 Z/M
+Z_TYPES = (11, 13, 15, 18)              # PointZ, PolyLineZ, PolygonZ, MultiPointZ
+SHAPE_TYPE_NAMES = {0: 'Null', 1: 'Point', 3: 'PolyLine', 5: 'Polygon', 8: 'MultiPoint',
+                    11: 'PointZ', 13: 'PolyLineZ', 15: 'PolygonZ', 18: 'MultiPointZ',
+                    21: 'PointM', 23: 'PolyLineM', 25: 'PolygonM', 28: 'MultiPointM', 31: 'MultiPatch'}
+
+HEADER_SIZE = 100
+FILE_CODE = 9994
+
+def read_header(shapefile: str) -> dict:
+    """
+    .shp 파일 헤더(100바이트)를 읽습니다.
+
+    :param shapefile: (str), Shapefile(.shp) 경로
+    :return: (dict), shape_type, file_length(바이트), bbox(xmin, ymin, xmax, ymax), z_range, m_range 항목
+    """
+    with open(shapefile, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or struct.unpack('>i', header[:4])[0] != FILE_CODE:
+        raise ValueError(f"not a shapefile: {shapefile}")
+
+    return {
+        "shape_type": struct.unpack('<i', header[32:36])[0],
+        "file_length": struct.unpack('>i', header[24:28])[0] * 2,
+        "bbox": struct.unpack('<4d', header[36:68]),
+        "z_range": struct.unpack('<2d', header[68:84]),
+        "m_range": struct.unpack('<2d', header[84:100]),
+    }
+
+def same_file(path: str, other: str) -> bool:
+    """ 두 경로가 같은 파일을 가리키는지 확인합니다. 대소문자를 구분하지 않는 파일시스템과 하드링크도 고려합니다. """
+    if os.path.normcase(os.path.abspath(path)) == os.path.normcase(os.path.abspath(other)):
+        return True
+    try:
+        return os.path.samefile(path, other)
+    except OSError:
+        return False
+
+def find_sidecar(shapefile: str, ext: str) -> str:
+    """ 확장자 대소문자를 구분하지 않고 부속 파일 경로를 찾습니다. 없으면 None """
+    base_path = os.path.splitext(shapefile)[0]
+    for candidate in (base_path + ext, base_path + ext.upper()):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+def _reflink(src: str, dst: str):
+    """ 파일시스템이 지원하면(Btrfs, XFS 등) 데이터 블록을 공유하는 복사본을 만듭니다. 지원하지 않으면 OSError """
+    import fcntl
+
+    FICLONE = 0x40049409
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+
+def copy_sidecar(src: str, dst: str, hardlink: bool=False):
+    """
+    부속 파일을 바이트 단위로 그대로 복사합니다.
+    hardlink이면 하드링크를, 아니면 reflink를 먼저 시도하고 실패하면 일반 복사를 합니다.
+
+    :param src: (str), 원본 파일 경로
+    :param dst: (str), 대상 파일 경로
+    :param hardlink: (bool), 하드링크 사용 여부 (원본과 출력이 같은 파일을 공유함) (기본값: False)
+    :return: none
+    """
+    if os.path.exists(dst):
+        os.remove(dst)
+
+    try:
+        if hardlink:
+            os.link(src, dst)
+        else:
+            _reflink(src, dst)
+        return
+    except (OSError, ImportError):
+        if os.path.exists(dst):
+            os.remove(dst)
+
+    shutil.copyfile(src, dst)
+
+def remove_spatial_index(shapefile: str):
+    """ Shapefile의 공간 인덱스 파일(.sbn, .sbx, .qix)을 삭제합니다. """
+    base_path = os.path.splitext(shapefile)[0]
+    for ext in ('.sbn', '.sbx', '.qix'):
+        for path in (base_path + ext, base_path + ext.upper()):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from shp_convert import apply_affine_matrix, output_format, write_layer
+from shp_encoding import detect_encoding
+from shp_files import find_sidecar
+from shp_stats import StageTimer
+
+MANIFEST_VERSION = 2
+
+# 피처 해시(64비트) 두 개를 서로 다른 키로 계산하여 128비트로 사용 (hash_pandas_object의 hash_key는 16자)
+HASH_KEYS = ('shp-convert-key1', 'shp-convert-key2')
+
+def manifest_paths(output_path: str) -> tuple:
+    """ 출력 파일에 대응하는 (manifest JSON 경로, 피처 해시 .npy 경로) """
+    base_path = os.path.splitext(output_path)[0]
+    return base_path + '.manifest.json', base_path + '.hashes.npy'
+
+def parameters_hash(matrix: np.ndarray, precision: int, encoding: str, output_path: str) -> str:
+    """ 결과에 영향을 주는 변환 조건(행렬, 반올림 자리 수, 인코딩, 출력 형식)의 해시 """
+    parameters = {"matrix": np.asarray(matrix, dtype=float).tolist(), "precision": precision, "encoding": encoding,
+                  "format": output_format(output_path)}
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode('utf-8')).hexdigest()
+
+def feature_hashes(gdf: gpd.GeoDataFrame) -> np.ndarray:
+    """
+    피처별 내용 해시를 계산합니다. geometry는 WKB로, 속성은 값 그대로 해시합니다.
+
+    :param gdf: (GeoDataFrame), 입력 레이어
+    :return: (np.ndarray), (피처 수 x 2) uint64 배열 (128비트 해시)
+    """
+    frame = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    frame['__wkb__'] = shapely.to_wkb(gdf.geometry.values)
+    return np.column_stack([pd.util.hash_pandas_object(frame, index=False, hash_key=key).to_numpy() for key in HASH_KEYS])
+
+def _output_stat(output_path: str) -> list:
+    stat = os.stat(output_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def input_stat(input_shapefile: str) -> dict:
+    """ 입력 Shapefile 구성 파일(.shp, .shx, .dbf, .cpg)별 [크기, 수정 시각(ns)], 없는 파일은 None """
+    stats = {}
+    for ext in ('.shp', '.shx', '.dbf', '.cpg'):
+        path = input_shapefile if ext == '.shp' else find_sidecar(input_shapefile, ext)
+        stats[ext] = _output_stat(path) if path is not None and os.path.exists(path) else None
+    return stats
+
+def load_manifest(output_path: str, parameters: str) -> tuple:
+    """
+    이전 실행의 manifest와 피처 해시를 읽습니다.
+    manifest가 없거나, 변환 조건이 바뀌었거나, 출력 파일이 그 뒤에 바뀌었으면 None (전체 재변환)
+
+    :param output_path: (str), 출력 경로
+    :param parameters: (str), parameters_hash 결과
+    :return: (tuple), (manifest dict, 이전 출력 피처 순서의 (피처 수 x 2) 해시 배열) 또는 None
+    """
+    manifest_path, hashes_path = manifest_paths(output_path)
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if (manifest.get("version") != MANIFEST_VERSION or manifest.get("parameters") != parameters
+                or manifest.get("output") != _output_stat(output_path)):
+            return None
+        hashes = np.load(hashes_path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+    if hashes.shape != (manifest["features"], 2):
+        return None
+    return manifest, hashes
+
+def save_manifest(output_path: str, parameters: str, hashes: np.ndarray, stats: dict, source: dict = None):
+    """ 이번 실행의 피처 해시와 변환 조건, 입력(source: input_stat 결과)과 출력 파일 상태를 기록합니다. """
+    manifest_path, hashes_path = manifest_paths(output_path)
+    np.save(hashes_path, hashes)
+    manifest = dict(stats, version=MANIFEST_VERSION, parameters=parameters, features=len(hashes), input=source, output=_output_stat(output_path))
+    temp_path = manifest_path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, manifest_path)
+
+def match_previous(hashes: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """
+    현재 피처마다 같은 해시를 가진 이전 출력 피처의 위치를 찾습니다.
+
+    :param hashes: (np.ndarray), 현재 피처 해시 (N x 2)
+    :param previous: (np.ndarray), 이전 피처 해시 (M x 2)
+    :return: (np.ndarray), 피처별 이전 출력 위치, 새로 생겼거나 바뀐 피처는 -1
+    """
+    previous_index = pd.MultiIndex.from_arrays([previous[:, 0], previous[:, 1]])
+    # 내용이 완전히 같은 피처가 여러 개면 첫 번째 것을 사용 (출력 geometry도 같음)
+    unique = ~previous_index.duplicated()
+    positions = np.flatnonzero(unique)
+    indexer = previous_index[unique].get_indexer(pd.MultiIndex.from_arrays([hashes[:, 0], hashes[:, 1]]))
+    return np.where(indexer >= 0, positions[indexer], -1)
+
+def _read_output_geometries(output_path: str, positions: np.ndarray) -> np.ndarray:
+    """ 이전 출력에서 positions 위치 피처의 geometry만 읽습니다. """
+    if output_format(output_path) == 'GeoParquet':
+        return gpd.read_parquet(output_path, columns=['geometry']).geometry.values[positions]
+    # Shapefile, FlatGeobuf의 FID는 파일 안의 피처 순서 (0부터)
+    unique, inverse = np.unique(positions, return_inverse=True)
+    return gpd.read_file(output_path, columns=[], fids=unique).geometry.values[inverse]
+
+def incremental_adjust(input_shapefile: str, output_path: str, matrix, encoding: str = None, precision: int = 3, progress_callback=None,
+                       timer: StageTimer = None) -> dict:
+    """
+    이전 실행 이후 새로 생겼거나 바뀐 피처만 변환하고, 나머지는 이전 출력의 geometry를 그대로 가져와 출력 파일을 다시 씁니다.
+    피처 내용 해시(WKB + 속성)는 출력 옆 manifest(<출력>.manifest.json, <출력>.hashes.npy)에 저장되며,
+    변환 조건이 바뀌었거나 이전 출력이 없으면 전체를 변환합니다.
+    입력 파일의 크기와 수정 시각이 manifest와 같으면 아무것도 읽지 않고, 다시 계산한 해시가 이전과 순서까지 같으면 출력을 쓰지 않습니다.
+    바뀐 피처가 있으면 입력 전체를 읽고 출력도 전부 다시 쓰므로, 그때 줄어드는 것은 변환(좌표 계산, 반올림) 시간뿐입니다.
+
+    :param input_shapefile: (str), 입력 Shapefile 경로
+    :param output_path: (str), 출력 경로 (.shp, .fgb, .parquet)
+    :param matrix: (array-like), 2x3 아핀 행렬
+    :param encoding: (str), 속성 인코딩, None이면 감지 (기본값: None)
+    :param precision: (int), 반올림할 소수점 자리 수 (기본값: 3)
+    :param progress_callback: (callable), 단계마다 (처리된 피처 수, 전체 피처 수)로 호출됨 (기본값: None)
+    :param timer: (StageTimer), 단계별 시간을 기록할 타이머 (기본값: None)
+    :return: (dict), features, transformed, reused, full_rebuild, skipped(출력을 다시 쓰지 않음) 항목을 가진 결과
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    timer = timer if timer is not None else StageTimer()
+    if encoding is None:
+        encoding = detect_encoding(input_shapefile)
+    parameters = parameters_hash(matrix, precision, encoding, output_path)
+    source = input_stat(input_shapefile)
+
+    loaded = load_manifest(output_path, parameters) if os.path.exists(output_path) else None
+    manifest, previous = loaded if loaded is not None else (None, None)
+    if manifest is not None and manifest.get("input") == source:
+        # 입력 파일이 그대로이면 읽지 않고 끝냄
+        stats = {"features": len(previous), "transformed": 0, "reused": len(previous), "full_rebuild": False, "skipped": True}
+        if progress_callback is not None:
+            progress_callback(len(previous), len(previous))
+        return stats
+
+    with timer.stage('read'):
+        gdf = gpd.read_file(input_shapefile, encoding=encoding)
+    with timer.stage('hash', features=len(gdf)):
+        hashes = feature_hashes(gdf)
+    if previous is not None and np.array_equal(hashes, previous):
+        # 파일은 다시 저장되었지만 내용과 순서가 같으면 출력은 그대로 두고 입력 상태만 갱신
+        stats = {"features": len(gdf), "transformed": 0, "reused": len(gdf), "full_rebuild": False, "skipped": True}
+        save_manifest(output_path, parameters, hashes, stats, source)
+        if progress_callback is not None:
+            progress_callback(len(gdf), len(gdf))
+        return stats
+    reused = match_previous(hashes, previous) if previous is not None else np.full(len(gdf), -1)
+
+    geometries = np.array(gdf.geometry.values, dtype=object)
+    unchanged = reused >= 0
+    if unchanged.any():
+        with timer.stage('read'):
+            geometries[unchanged] = np.asarray(_read_output_geometries(output_path, reused[unchanged]), dtype=object)
+    if progress_callback is not None:
+        progress_callback(int(unchanged.sum()), len(gdf))
+
+    changed = ~unchanged
+    if changed.any():
+        vertices = int(shapely.get_num_coordinates(geometries[changed]).sum())
+        with timer.stage('transform', features=int(changed.sum()), vertices=vertices):
+            geometries[changed] = apply_affine_matrix(geometries[changed], matrix, precision, timer)
+    gdf['geometry'] = gpd.GeoSeries(geometries, index=gdf.index, crs=gdf.crs)
+
+    with timer.stage('write', features=len(gdf)):
+        # 쓰는 도중 실패해도 이전 manifest가 새 출력과 짝지어지지 않도록 먼저 삭제
+        manifest_path, _ = manifest_paths(output_path)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        write_layer([gdf], output_path, encoding=encoding)
+
+        stats = {"features": len(gdf), "transformed": int(changed.sum()), "reused": int(unchanged.sum()), "full_rebuild": previous is None,
+                 "skipped": False}
+        save_manifest(output_path, parameters, hashes, stats, source)
+    if progress_callback is not None:
+        progress_callback(len(gdf), len(gdf))
+    return stats
@@ -0,0 +1,154 @@
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from shp_codec import read_record_index
+from shp_files import NULL_SHAPE, POINT_TYPES, read_header
+
+# shapelib(shptree.c)과 같은 분할 비율과 자동 깊이 상한
+SPLIT_RATIO = 0.55
+MAX_DEFAULT_DEPTH = 12
+
+def _read_f8(buf: np.ndarray, positions: np.ndarray, count: int) -> np.ndarray:
+    """ 바이트 버퍼의 여러 위치에서 float64 count개씩을 한 번에 읽습니다. """
+    if positions.size == 0:
+        return np.zeros((0, count))
+    raw = buf[positions[:, None] + np.arange(8 * count)]
+    return raw.view('<f8').reshape(len(positions), count)
+
+def record_bounds(shapefile: str) -> np.ndarray:
+    """
+    .shx 오프셋과 레코드 헤더만 읽어 레코드별 bbox를 구합니다. (좌표 블록 전체를 읽지 않음)
+
+    :param shapefile: (str), Shapefile(.shp) 경로
+    :return: (np.ndarray), (레코드 수 x 4) xmin, ymin, xmax, ymax 배열. Null 레코드는 NaN
+    """
+    index = read_record_index(shapefile)
+    bounds = np.full((len(index["content"]), 4), np.nan)
+
+    with open(shapefile, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        buf = np.frombuffer(mm, dtype=np.uint8)
+        try:
+            is_point = np.isin(index["shape_type"], POINT_TYPES)
+            xy = _read_f8(buf, index["xy_start"][is_point], 2)
+            bounds[is_point] = np.column_stack([xy, xy])
+
+            has_box = index["box"] >= 0
+            bounds[has_box] = _read_f8(buf, index["box"][has_box], 4)
+        finally:
+            del buf
+
+    bounds[index["shape_type"] == NULL_SHAPE] = np.nan
+    return bounds
+
+def default_depth(count: int) -> int:
+    """ shapelib과 같은 방식으로 노드당 평균 4개 이하가 되도록 최대 깊이를 정합니다. (최대 12) """
+    depth, nodes = 0, 1
+    while nodes * 4 < count:
+        depth += 1
+        nodes *= 2
+    return min(depth, MAX_DEFAULT_DEPTH)
+
+def _split(lo: np.ndarray, hi: np.ndarray) -> tuple:
+    """ 긴 축을 기준으로 영역을 겹치는 두 부분(각 55%)으로 나눕니다. lo, hi는 (N x 2) 배열 """
+    wide = (hi[:, 0] - lo[:, 0]) > (hi[:, 1] - lo[:, 1])
+    axis = np.where(wide, 0, 1)
+    rows = np.arange(len(lo))
+    span = hi[rows, axis] - lo[rows, axis]
+
+    hi1 = hi.copy()
+    hi1[rows, axis] = lo[rows, axis] + span * SPLIT_RATIO
+    lo2 = lo.copy()
+    lo2[rows, axis] = hi[rows, axis] - span * SPLIT_RATIO
+    return (lo, hi1), (lo2, hi)
+
+def _quadrants(lo: np.ndarray, hi: np.ndarray) -> list:
+    """ shapelib과 같은 순서의 네 하위 영역 [(lo, hi), ...] """
+    half1, half2 = _split(lo, hi)
+    return list(_split(*half1)) + list(_split(*half2))
+
+def build_quadtree(bounds: np.ndarray, extent: tuple, max_depth: int) -> tuple:
+    """
+    각 피처를 자신을 완전히 포함하는 가장 깊은 노드에 배정합니다.
+    노드 경계는 부모 영역에서 고정적으로 정해지므로 피처별로 독립적으로(벡터 연산으로) 내려갈 수 있습니다.
+
+    :param bounds: (np.ndarray), (N x 4) 피처 bbox, NaN 행은 제외
+    :param extent: (tuple), 루트 노드 영역 (xmin, ymin, xmax, ymax)
+    :param max_depth: (int), 최대 깊이 (루트 = 1)
+    :return: (tuple), (피처별 노드 키, {노드 키: 노드 영역}) 노드 키는 루트 0, 자식 = 부모 * 4 + 사분면 + 1
+    """
+    count = len(bounds)
+    keys = np.zeros(count, dtype=np.int64)
+    node_bounds = {0: tuple(float(v) for v in extent)}
+
+    lo = np.tile(np.asarray(extent[:2], dtype=float), (count, 1))
+    hi = np.tile(np.asarray(extent[2:], dtype=float), (count, 1))
+    active = np.arange(count)
+    for _ in range(max_depth - 1):
+        if active.size == 0:
+            break
+        shape_lo, shape_hi = bounds[active, :2], bounds[active, 2:]
+        chosen = np.full(active.size, -1)
+        child_lo, child_hi = lo[active].copy(), hi[active].copy()
+        for quadrant, (q_lo, q_hi) in enumerate(_quadrants(lo[active], hi[active])):
+            fits = (chosen < 0) & np.all(shape_lo >= q_lo, axis=1) & np.all(shape_hi <= q_hi, axis=1)
+            chosen[fits] = quadrant
+            child_lo[fits], child_hi[fits] = q_lo[fits], q_hi[fits]
+
+        descend = chosen >= 0
+        active, chosen = active[descend], chosen[descend]
+        keys[active] = keys[active] * 4 + chosen + 1
+        lo[active], hi[active] = child_lo[descend], child_hi[descend]
+
+        new_keys, first = np.unique(keys[active], return_index=True)
+        for key, row in zip(new_keys.tolist(), active[first]):
+            node_bounds[key] = (lo[row, 0], lo[row, 1], hi[row, 0], hi[row, 1])
+
+    return keys, node_bounds
+
+def _encode_tree(ids: np.ndarray, keys: np.ndarray, node_bounds: dict) -> bytes:
+    """ 노드를 깊이 우선으로 SHPWriteTreeNode 형식에 맞춰 직렬화합니다. """
+    order = np.argsort(keys, kind='stable')
+    unique_keys, starts = np.unique(keys[order], return_index=True)
+    members = dict(zip(unique_keys.tolist(), np.split(ids[order], starts[1:])))
+
+    children = {}
+    for key in sorted(node_bounds):
+        if key != 0:
+            children.setdefault((key - 1) // 4, []).append(key)
+
+    def encode(key):
+        shape_ids = members.get(key, np.zeros(0, dtype=np.int64))
+        subnodes = b''.join(encode(child) for child in children.get(key, []))
+        xmin, ymin, xmax, ymax = node_bounds[key]
+        # 하위 노드 전체 크기(offset), 노드 영역, 피처 수, 피처 id, 하위 노드 수
+        head = struct.pack('<i4di', len(subnodes), xmin, ymin, xmax, ymax, len(shape_ids))
+        return head + shape_ids.astype('<i4').tobytes() + struct.pack('<i', len(children.get(key, []))) + subnodes
+
+    return encode(0)
+
+def write_qix(shapefile: str, max_depth: int = None) -> dict:
+    """
+    변환된 .shp의 레코드 bbox로 MapServer/GDAL 형식(.qix)의 사분 트리 공간 인덱스를 만듭니다.
+    GDAL Shapefile 드라이버는 .qix가 있으면 공간 필터 질의에 자동으로 사용합니다.
+
+    :param shapefile: (str), Shapefile(.shp) 경로
+    :param max_depth: (int), 트리 최대 깊이, None이면 피처 수로 정함 (기본값: None)
+    :return: (dict), path, shapes, depth, nodes 항목을 가진 결과
+    """
+    bounds = record_bounds(shapefile)
+    valid = ~np.isnan(bounds).any(axis=1)
+    ids = np.flatnonzero(valid)
+    depth = max_depth if max_depth is not None else default_depth(len(ids))
+
+    extent = read_header(shapefile)["bbox"]
+    keys, node_bounds = build_quadtree(bounds[valid], extent, max(depth, 1))
+    # 헤더: "SQT", 바이트 순서(1 = little endian), 버전 1, 예약 3바이트, 피처 수, 최대 깊이
+    data = b'SQT' + bytes([1, 1, 0, 0, 0]) + struct.pack('<2i', len(ids), max(depth, 1)) + _encode_tree(ids, keys, node_bounds)
+
+    path = os.path.splitext(shapefile)[0] + '.qix'
+    with open(path, 'wb') as f:
+        f.write(data)
+    return {"path": path, "shapes": len(ids), "depth": max(depth, 1), "nodes": len(node_bounds)}
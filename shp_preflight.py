@@ -0,0 +1,277 @@
+import argparse
+import copy
+import json
+import math
+import os
+import struct
+import sys
+
+import numpy as np
+
+from shp_encoding import detect_encoding_with_source
+from shp_files import HEADER_SIZE, POINT_TYPES, SHAPE_TYPE_NAMES, find_sidecar, read_header
+
+# .shx 레코드 길이로 정점 수를 추정할 때의 (고정 바이트, 정점당 바이트)
+# 선/면은 파트 1개, Z는 M 블록이 없다고 가정하므로 여러 파트이거나 ZM이면 조금 크게 추정됨
+RECORD_LAYOUT = {3: (48, 16), 5: (48, 16), 13: (64, 24), 15: (64, 24), 23: (64, 24), 25: (64, 24),
+                 8: (40, 16), 18: (56, 24), 28: (56, 24)}
+
+# 단계별 소요 시간(초)과 메모리(바이트)의 기본 계수. shp_benchmark 결과 JSON으로 다시 맞출 수 있음 (load_calibration)
+DEFAULT_CALIBRATION = {
+    "seconds": {
+        "read": {"feature": 4e-6, "vertex": 6e-8, "byte": 1.5e-8},
+        "transform": {"feature": 2e-7, "vertex": 3e-8, "byte": 0.0},
+        "round": {"feature": 0.0, "vertex": 2e-8, "byte": 0.0},
+        "write": {"feature": 8e-6, "vertex": 8e-8, "byte": 2e-8},
+    },
+    "chunk_seconds": 0.05,          # 청크마다 파일을 열고 이어 쓰는 고정 비용
+    "memory": {"base_mb": 180.0, "feature": 600.0, "vertex": 80.0, "byte": 4.0},
+}
+
+# 사용 가능한 메모리 중 변환에 쓸 비율과, 알 수 없을 때의 메모리 예산
+MEMORY_FRACTION = 0.5
+DEFAULT_BUDGET_MB = 2048.0
+MIN_CHUNK_SIZE = 1000
+# 읽기와 변환 단계가 이보다 오래 걸릴 때만 프로세스를 나눔 (프로세스 생성과 결과 GeoDataFrame 전달 비용)
+PARALLEL_MIN_SECONDS = 2.0
+MAX_WORKERS = 8
+
+def _read_dbf_header(dbf_path: str) -> dict:
+    """ DBF 헤더 32바이트에서 레코드 수, 헤더 길이, 레코드(행) 길이, 필드 수를 읽습니다. """
+    with open(dbf_path, 'rb') as f:
+        header = f.read(32)
+    if len(header) < 32:
+        raise ValueError(f"not a dBASE file: {dbf_path}")
+    records, header_length, row_width = struct.unpack('<IHH', header[4:12])
+    return {"records": records, "header_length": header_length, "row_width": row_width, "fields": max((header_length - 33) // 32, 0)}
+
+def estimate_vertices(shape_type: int, content_lengths: np.ndarray) -> int:
+    """
+    .shx의 레코드 내용 길이(바이트)만으로 전체 정점 수를 추정합니다.
+
+    :param shape_type: (int), .shp 헤더의 shape type
+    :param content_lengths: (np.ndarray), 레코드별 내용 길이 (바이트)
+    :return: (int), 추정 정점 수 (Null 레코드는 0)
+    """
+    present = content_lengths > 4  # Null 레코드는 shape type 4바이트뿐
+    if shape_type in POINT_TYPES:
+        return int(present.sum())
+    if shape_type not in RECORD_LAYOUT:
+        return 0
+    overhead, point_bytes = RECORD_LAYOUT[shape_type]
+    return int(np.maximum((content_lengths[present] - overhead) // point_bytes, 1).sum())
+
+def scan_headers(shapefile: str) -> dict:
+    """
+    .shp/.dbf 헤더와 .shx 레코드 길이만 읽어 레이어 규모를 파악합니다. (좌표와 속성 값은 읽지 않음)
+
+    :param shapefile: (str), Shapefile(.shp) 경로
+    :return: (dict), features, shape_type, geometry_type, bbox, vertices(추정), shp_bytes, dbf(records, fields, row_width),
+             encoding, encoding_source 항목
+    """
+    header = read_header(shapefile)
+    shape_type, shp_bytes = header["shape_type"], header["file_length"]
+
+    shx_path = find_sidecar(shapefile, '.shx')
+    dbf_path = find_sidecar(shapefile, '.dbf')
+    dbf = _read_dbf_header(dbf_path) if dbf_path is not None else {"records": None, "header_length": 0, "row_width": 0, "fields": 0}
+
+    if shx_path is not None:
+        # .shx 레코드: 오프셋, 내용 길이 (big endian, 16비트 워드 단위)
+        index = np.fromfile(shx_path, dtype='>i4', offset=HEADER_SIZE).reshape(-1, 2)
+        features = len(index)
+        vertices = estimate_vertices(shape_type, index[:, 1].astype(np.int64) * 2)
+    else:
+        # .shx가 없으면 DBF 레코드 수와 .shp 크기로 추정
+        features = dbf["records"] or 0
+        overhead, point_bytes = RECORD_LAYOUT.get(shape_type, (0, 16))
+        vertices = features if shape_type in POINT_TYPES else max((shp_bytes - HEADER_SIZE - features * (8 + overhead)) // point_bytes, 0)
+
+    encoding, source = detect_encoding_with_source(shapefile) if dbf_path is not None else (None, None)
+    return {
+        "path": shapefile,
+        "features": features,
+        "shape_type": shape_type,
+        "geometry_type": SHAPE_TYPE_NAMES.get(shape_type, f"type {shape_type}"),
+        "bbox": header["bbox"],
+        "vertices": int(vertices),
+        "shp_bytes": shp_bytes,
+        "dbf": {key: dbf[key] for key in ("records", "fields", "row_width")},
+        "encoding": encoding,
+        "encoding_source": source,
+    }
+
+def load_calibration(benchmark_json: str) -> dict:
+    """
+    shp_benchmark 결과 JSON(--json)으로 단계별 시간 계수와 메모리 계수를 맞춥니다.
+    단계마다 seconds ≈ 피처 수 × feature + 좌표 수 × vertex를 최소제곱으로 구하고 (음수는 0),
+    메모리는 pipeline_geopandas 결과의 최대 RSS로 구합니다. 측정되지 않은 항목은 기본값을 씁니다.
+
+    :param benchmark_json: (str), shp_benchmark 결과 JSON 경로
+    :return: (dict), DEFAULT_CALIBRATION과 같은 형식의 계수
+    """
+    with open(benchmark_json, 'r') as f:
+        rows = json.load(f)["results"]
+
+    calibration = copy.deepcopy(DEFAULT_CALIBRATION)
+    for stage, coefficients in calibration["seconds"].items():
+        samples = [row for row in rows if row["stage"] == stage]
+        if len(samples) >= 2:
+            design = np.array([[row["features"], row["coordinates"]] for row in samples], dtype=float)
+            fitted, *_ = np.linalg.lstsq(design, np.array([row["seconds"] for row in samples]), rcond=None)
+            coefficients["feature"], coefficients["vertex"] = (max(float(value), 0.0) for value in fitted)
+
+    samples = [row for row in rows if row["stage"] == "pipeline_geopandas" and row.get("peak_rss_mb") is not None]
+    if len(samples) >= 3:
+        design = np.array([[1.0, row["features"], row["coordinates"]] for row in samples])
+        fitted, *_ = np.linalg.lstsq(design, np.array([row["peak_rss_mb"] for row in samples]), rcond=None)
+        memory = calibration["memory"]
+        memory["base_mb"] = max(float(fitted[0]), 0.0)
+        memory["feature"], memory["vertex"] = (max(float(value), 0.0) * 2**20 for value in fitted[1:])
+    return calibration
+
+def available_memory_mb() -> float:
+    """ 현재 사용 가능한 물리 메모리(MB). 알 수 없으면 None """
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (AttributeError, ValueError, OSError):
+        pass
+    try:
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(status)
+        if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return None
+        return status.ullAvailPhys / 2**20
+    except (AttributeError, OSError):
+        return None
+
+def estimate_run(info: dict, chunk_size: int = None, workers: int = None, calibration: dict = None) -> dict:
+    """
+    scan_headers 결과로 변환 시간과 최대 메모리를 추정합니다.
+
+    :param info: (dict), scan_headers 결과
+    :param chunk_size: (int), 청크당 피처 수, None이면 한 번에 처리 (기본값: None)
+    :param workers: (int), 구간별 읽기와 변환을 맡을 프로세스 수 (기본값: None)
+    :param calibration: (dict), 계수, None이면 DEFAULT_CALIBRATION (기본값: None)
+    :return: (dict), stages(단계별 초), seconds(합계), peak_memory_mb 항목
+    """
+    calibration = calibration or DEFAULT_CALIBRATION
+    features, vertices = info["features"], info["vertices"]
+    dbf_bytes = features * info["dbf"]["row_width"]
+
+    stages = {}
+    for stage, coefficients in calibration["seconds"].items():
+        stages[stage] = features * coefficients["feature"] + vertices * coefficients["vertex"] + dbf_bytes * coefficients["byte"]
+    parallel = workers is not None and workers > 1
+    if parallel:
+        # 쓰기만 현재 프로세스에서 순서대로 하고 나머지는 구간마다 나누어 처리
+        for stage in ("read", "transform", "round"):
+            stages[stage] /= workers
+    chunks = math.ceil(features / chunk_size) if chunk_size else 1
+    stages["write"] += (chunks - 1) * calibration["chunk_seconds"]
+
+    # 한 번에 메모리에 올라가는 피처 수 (청크 하나, 병렬이면 맡겨 둔 workers + 1개 구간)
+    if parallel:
+        in_memory = min((chunk_size or math.ceil(features / workers)) * (workers + 1), features)
+    else:
+        in_memory = min(chunk_size or features, features)
+    share = in_memory / features if features else 0.0
+    memory = calibration["memory"]
+    chunk_bytes = share * (features * memory["feature"] + vertices * memory["vertex"] + dbf_bytes * memory["byte"])
+    return {"stages": stages, "seconds": sum(stages.values()), "peak_memory_mb": memory["base_mb"] + chunk_bytes / 2**20}
+
+def preflight(shapefile: str, memory_budget_mb: float = None, calibration: dict = None, max_workers: int = None) -> dict:
+    """
+    헤더만 읽어 레이어 규모를 보고하고, 메모리 예산에 맞는 청크 크기와 프로세스 수를 고른 뒤 시간과 메모리를 추정합니다.
+
+    :param shapefile: (str), Shapefile(.shp) 경로
+    :param memory_budget_mb: (float), 변환에 쓸 메모리(MB), None이면 사용 가능한 메모리의 MEMORY_FRACTION (기본값: None)
+    :param calibration: (dict), 계수 (load_calibration 결과), None이면 기본값 (기본값: None)
+    :param max_workers: (int), 최대 프로세스 수, None이면 CPU 수와 MAX_WORKERS 중 작은 값 (기본값: None)
+    :return: (dict), scan_headers 결과에 chunk_size(None이면 한 번에), workers(None이면 현재 프로세스), budget_mb,
+             estimate(estimate_run 결과), fits(예산 안에 들어가는지) 항목 추가
+    """
+    calibration = calibration or DEFAULT_CALIBRATION
+    info = scan_headers(shapefile)
+    if memory_budget_mb is None:
+        available = available_memory_mb()
+        memory_budget_mb = available * MEMORY_FRACTION if available is not None else DEFAULT_BUDGET_MB
+
+    # 전체가 예산에 들어가면 한 번에, 아니면 피처당 메모리로 청크 크기 결정
+    chunk_size = None
+    full = estimate_run(info, None, None, calibration)
+    if info["features"] and full["peak_memory_mb"] > memory_budget_mb:
+        per_feature_mb = (full["peak_memory_mb"] - calibration["memory"]["base_mb"]) / info["features"]
+        room = max(memory_budget_mb - calibration["memory"]["base_mb"], 0.0)
+        chunk_size = max(int(room / per_feature_mb) // MIN_CHUNK_SIZE * MIN_CHUNK_SIZE, MIN_CHUNK_SIZE)
+
+    workers = None
+    limit = max_workers if max_workers is not None else min(os.cpu_count() or 1, MAX_WORKERS)
+    parallel_seconds = full["stages"]["read"] + full["stages"]["transform"] + full["stages"]["round"]
+    if limit > 1 and parallel_seconds >= PARALLEL_MIN_SECONDS:
+        workers = min(limit, math.ceil(parallel_seconds / (PARALLEL_MIN_SECONDS / 2)))
+        if chunk_size is not None:
+            # 동시에 workers + 1개 구간이 메모리에 올라가므로 구간 크기를 그만큼 줄임
+            chunk_size = max(chunk_size // (workers + 1) // MIN_CHUNK_SIZE * MIN_CHUNK_SIZE, MIN_CHUNK_SIZE)
+
+    estimate = estimate_run(info, chunk_size, workers, calibration)
+    return dict(info, chunk_size=chunk_size, workers=workers, budget_mb=memory_budget_mb, estimate=estimate,
+                fits=estimate["peak_memory_mb"] <= memory_budget_mb)
+
+def format_estimate(plan: dict) -> str:
+    """ 한 줄 요약 (예: '1,204,332 Polygon features, ~9.6M vertices: about 42s, peak ~1,350 MB (chunks of 200,000, 4 workers)') """
+    estimate = plan["estimate"]
+    line = (f"{plan['features']:,} {plan['geometry_type']} features, ~{plan['vertices']:,} vertices: "
+            f"about {estimate['seconds']:.0f}s, peak ~{estimate['peak_memory_mb']:,.0f} MB")
+    options = []
+    if plan["chunk_size"] is not None:
+        options.append(f"chunks of {plan['chunk_size']:,}")
+    if plan["workers"] is not None:
+        options.append(f"{plan['workers']} workers")
+    return line + (f" ({', '.join(options)})" if options else "")
+
+def format_report(plan: dict) -> str:
+    """ 여러 줄 보고서 """
+    dbf = plan["dbf"]
+    lines = [
+        f"file:       {plan['path']}",
+        f"features:   {plan['features']:,} ({plan['geometry_type']})",
+        f"bbox:       {', '.join(f'{value:.3f}' for value in plan['bbox'])}",
+        f"vertices:   ~{plan['vertices']:,} (estimated from .shx record lengths)",
+        f"attributes: {dbf['fields']} fields, {dbf['row_width']} bytes per row",
+        f"encoding:   {plan['encoding']} (from {plan['encoding_source']})",
+        f"plan:       chunk size {plan['chunk_size'] or 'whole layer'}, workers {plan['workers'] or 1}, budget {plan['budget_mb']:,.0f} MB",
+        "estimate:   " + " · ".join(f"{name} {seconds:.1f}s" for name, seconds in plan["estimate"]["stages"].items())
+        + f", total {plan['estimate']['seconds']:.1f}s, peak ~{plan['estimate']['peak_memory_mb']:,.0f} MB",
+    ]
+    if not plan["fits"]:
+        lines.append("warning:    the projected peak memory exceeds the budget")
+    return "\n".join(lines)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Scan shapefile headers and project conversion time and memory without reading the data.")
+    parser.add_argument("shapefiles", nargs="+", help="shapefiles to scan")
+    parser.add_argument("--memory-budget", type=float, default=None, help="memory to plan for in MB (default: half of the available memory)")
+    parser.add_argument("--calibration", default=None, help="benchmark JSON written by shp_benchmark.py --json to calibrate the estimate")
+    parser.add_argument("--json", action="store_true", help="print the plans as JSON")
+    args = parser.parse_args(argv)
+
+    calibration = load_calibration(args.calibration) if args.calibration else None
+    plans = [preflight(path, args.memory_budget, calibration) for path in args.shapefiles]
+    if args.json:
+        print(json.dumps(plans, indent=2, ensure_ascii=False))
+    else:
+        print("\n\n".join(format_report(plan) for plan in plans))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from shp_convert import adjust_shapefile_features, conversion_to_matrix, invert_affine_matrix
+from transform_registry import get_transform
+
+# 진행률 보고 단위 (피처 수)
+CHUNK_SIZE = 20000
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+class JobService:
+    """
+    좌표변환 작업을 큐에 넣고 동시 실행 수를 제한하여 처리하는 asyncio 서비스입니다.
+    변환 자체는 스레드 풀에서 실행되며(GDAL, NumPy가 GIL을 풀어줌), 진행률은 작업 상태에 바로 반영됩니다.
+    """
+    def __init__(self, concurrency: int = 2):
+        self.concurrency = concurrency
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._semaphore = None
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._tasks = set()
+        self.started = time.time()
+
+    def submit(self, spec: dict) -> dict:
+        """
+        작업을 등록하고 실행을 예약합니다.
+
+        :param spec: (dict), conversion(좌표변환 파일 경로 또는 좌표변환 정보), input(입력 Shapefile),
+                     output(출력 경로, 생략 시 입력 옆 _converted), reverse,
+                     encoding(생략 시 감지), chunk_size, engine, spatial_index 항목
+        :return: (dict), 등록된 작업 상태
+        """
+        if not isinstance(spec, dict):
+            raise ValueError("request body must be a JSON object")
+        if "input" not in spec or "conversion" not in spec:
+            raise ValueError("'input' and 'conversion' are required")
+        if not isinstance(spec["input"], str) or not isinstance(spec.get("output") or "", str):
+            raise ValueError("'input' and 'output' must be paths (strings)")
+        if not isinstance(spec["conversion"], (str, dict)):
+            raise ValueError("'conversion' must be a conversion file path or a conversion object")
+        chunk_size = spec.get("chunk_size", CHUNK_SIZE)
+        if chunk_size is not None and (not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size < 1):
+            raise ValueError("'chunk_size' must be a positive integer or null")
+        if not os.path.exists(spec["input"]):
+            raise ValueError(f"input not found: {spec['input']}")
+
+        reverse = bool(spec.get("reverse", False))
+        conversion = spec["conversion"]
+        if isinstance(conversion, str):
+            matrix = get_transform(conversion, reverse=reverse).matrix
+        else:
+            matrix = conversion_to_matrix(conversion)
+            if reverse:
+                matrix = invert_affine_matrix(matrix)
+
+        job_id = str(next(self._ids))
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "input": spec["input"],
+            "output": spec.get("output") or os.path.splitext(spec["input"])[0] + "_converted.shp",
+            "reverse": reverse,
+            "done": 0,
+            "total": None,
+            "submitted": time.time(),
+            "started": None,
+            "finished": None,
+            "error": None,
+            "stages": None,
+        }
+        self.jobs[job_id] = job
+
+        task = asyncio.get_running_loop().create_task(self._run(job, matrix, spec.get("encoding"), chunk_size,
+                                                                  spec.get("engine", "geopandas"), bool(spec.get("spatial_index", False))))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return self.status(job_id)
+
+    async def _run(self, job: dict, matrix, encoding: str, chunk_size: int, engine: str, spatial_index: bool):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._semaphore:
+            job["status"] = "running"
+            job["started"] = time.time()
+
+            def on_progress(done, total):
+                job["done"], job["total"] = done, total
+
+            try:
+                stats = await asyncio.get_running_loop().run_in_executor(
+                    self._executor,
+                    lambda: adjust_shapefile_features(job["input"], job["output"], encoding=encoding, chunk_size=chunk_size,
+                                                      progress_callback=on_progress, matrix=matrix, engine=engine,
+                                                      spatial_index=spatial_index))
+                job["stages"] = stats["stages"]
+                job["status"] = "succeeded"
+            except Exception as e:
+                job["status"] = "failed"
+                job["error"] = f"{type(e).__name__}: {e}"
+            finally:
+                job["finished"] = time.time()
+
+    def status(self, job_id: str) -> dict:
+        """ 작업 상태와 진행률, 처리 속도(피처/초)를 돌려줍니다. 없는 작업이면 KeyError """
+        job = dict(self.jobs[job_id])
+        if job["started"] is not None:
+            elapsed = (job["finished"] or time.time()) - job["started"]
+            job["elapsed"] = elapsed
+            job["features_per_second"] = job["done"] / elapsed if elapsed > 0 else None
+        job["progress"] = job["done"] / job["total"] if job["total"] else None
+        return job
+
+    def metrics(self) -> dict:
+        """ 상태별 작업 수와 전체 처리량을 돌려줍니다. """
+        counts = {status: 0 for status in ("queued", "running", "succeeded", "failed")}
+        for job in self.jobs.values():
+            counts[job["status"]] += 1
+
+        finished = [job for job in self.jobs.values() if job["status"] == "succeeded"]
+        features = sum(job["done"] for job in finished)
+        busy = sum(job["finished"] - job["started"] for job in finished)
+        return {
+            "jobs": counts,
+            "concurrency": self.concurrency,
+            "features_processed": features,
+            "features_per_second": features / busy if busy > 0 else None,
+            "uptime": time.time() - self.started,
+        }
+
+    async def handle(self, method: str, path: str, body: bytes) -> tuple:
+        """
+        HTTP 요청 하나를 처리합니다.
+
+        :return: (tuple), (상태 코드, JSON으로 보낼 객체)
+        """
+        parts = [part for part in path.split("?")[0].split("/") if part]
+        if parts == ["jobs"]:
+            if method == "POST":
+                try:
+                    return 201, self.submit(json.loads(body or b"{}"))
+                except (ValueError, KeyError, OSError) as e:
+                    return 400, {"error": f"{e}"}
+            if method == "GET":
+                return 200, [self.status(job_id) for job_id in self.jobs]
+            return 405, {"error": f"{method} not allowed"}
+        if len(parts) == 2 and parts[0] == "jobs":
+            if parts[1] not in self.jobs:
+                return 404, {"error": f"no such job: {parts[1]}"}
+            return 200, self.status(parts[1])
+        if parts == ["metrics"]:
+            return 200, self.metrics()
+        return 404, {"error": f"not found: {path}"}
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """ 연결 하나에서 요청 하나를 읽고 응답합니다 (Connection: close). """
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+
+            # 요청 줄이 깨졌거나 Content-Length가 정수가 아니거나 본문이 짧으면 400으로 응답
+            try:
+                method, path, _ = request_line.split(" ", 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1")
+                    if line in ("\r\n", "\n", ""):
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+            except (ValueError, asyncio.IncompleteReadError) as e:
+                code, payload = 400, {"error": f"bad request: {e}"}
+            else:
+                try:
+                    code, payload = await self.handle(method.upper(), path, body)
+                except Exception as e:
+                    code, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+            data = json.dumps(payload).encode("utf-8")
+            writer.write(f"HTTP/1.1 {code} {_REASONS.get(code, '')}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1") + data)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_socket: str = None) -> asyncio.AbstractServer:
+        """
+        TCP(기본값: 127.0.0.1:8765) 또는 unix socket으로 서비스를 시작합니다.
+
+        :return: (asyncio.AbstractServer), 실행 중인 서버
+        """
+        if unix_socket is not None:
+            return await asyncio.start_unix_server(self.serve_connection, path=unix_socket)
+        return await asyncio.start_server(self.serve_connection, host=host, port=port)
+
+    def shutdown(self):
+        """ 스레드 풀을 정리합니다. 실행 중인 작업은 끝날 때까지 기다립니다. """
+        self._executor.shutdown(wait=True)
+
+async def request(method: str, path: str, body: dict = None, host: str = "127.0.0.1", port: int = 8765, unix_socket: str = None) -> tuple:
+    """
+    서비스에 요청을 보내는 로컬 클라이언트입니다.
+
+    :param method: (str), 'GET' 또는 'POST'
+    :param path: (str), 요청 경로 (예: '/jobs', '/jobs/1', '/metrics')
+    :param body: (dict), POST로 보낼 JSON 객체 (기본값: None)
+    :return: (tuple), (상태 코드, 응답 JSON 객체)
+    """
+    if unix_socket is not None:
+        reader, writer = await asyncio.open_unix_connection(unix_socket)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1") + data)
+    await writer.drain()
+
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    code = int(head.split(b" ", 2)[1])
+    return code, json.loads(payload) if payload else None
+
+async def _serve(args):
+    service = JobService(concurrency=args.concurrency)
+    server = await service.start(args.host, args.port, args.unix)
+    where = args.unix if args.unix else f"http://{args.host}:{args.port}"
+    print(f"serving conversion jobs on {where} (concurrency {args.concurrency})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.shutdown()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Local job service for shapefile coordinate conversions.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    parser.add_argument("--unix", default=None, help="listen on this unix socket instead of TCP")
+    parser.add_argument("-c", "--concurrency", type=int, default=2, help="jobs run at the same time (default: 2)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# 보고서에 표시할 단계 순서
+STAGE_ORDER = ('read', 'hash', 'transform', 'round', 'write', 'index')
+
+def peak_rss_mb() -> float:
+    """ 현재 프로세스의 최대 메모리 사용량(RSS, MB). 측정할 수 없으면 None """
+    # 리눅스의 ru_maxrss는 fork/exec 전 부모 프로세스의 최대값을 물려받으므로, 새 인터프리터마다 새로 시작하는 VmHWM을 먼저 사용
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return _peak_working_set_mb()
+
+    # 리눅스의 ru_maxrss 단위는 KB, macOS는 바이트
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+def _peak_working_set_mb() -> float:
+    """ Windows: GetProcessMemoryInfo의 PeakWorkingSetSize """
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / 2**20
+    except (AttributeError, OSError):
+        return None
+
+class StageTimer:
+    """
+    변환 단계(read, transform, round, write 등)별 소요 시간과 피처 수, 정점 수를 모읍니다.
+    단계는 중첩될 수 있으며 각 단계의 시간은 안쪽 단계 시간을 뺀 값(exclusive)으로 기록되므로,
+    청크를 당겨 읽는 write 단계 안에서 read, transform이 실행되어도 합계가 전체 시간과 맞습니다.
+    """
+    def __init__(self):
+        self.stages = {}
+        self._stack = []
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def _record(self, name: str) -> dict:
+        return self.stages.setdefault(name, {"seconds": 0.0, "calls": 0, "features": 0, "vertices": 0, "peak_rss_mb": None})
+
+    @contextmanager
+    def stage(self, name: str, features: int = 0, vertices: int = 0):
+        """
+        with 블록 실행 시간을 name 단계에 더합니다.
+
+        :param name: (str), 단계 이름
+        :param features: (int), 처리한 피처 수 (기본값: 0)
+        :param vertices: (int), 처리한 정점 수 (기본값: 0)
+        """
+        frame = [time.perf_counter(), 0.0]  # 시작 시각, 안쪽 단계 시간
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            self._accumulate(name, elapsed - frame[1], features, vertices)
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+    def add(self, name: str, seconds: float, features: int = 0, vertices: int = 0):
+        """ 직접 잰 시간을 name 단계에 더합니다. 열린 단계 안에서 호출하면 바깥 단계 시간에서 빠집니다. """
+        self._accumulate(name, seconds, features, vertices)
+        if self._stack:
+            self._stack[-1][1] += seconds
+
+    def _accumulate(self, name: str, seconds: float, features: int, vertices: int):
+        record = self._record(name)
+        record["seconds"] += seconds
+        record["calls"] += 1
+        record["features"] += features
+        record["vertices"] += vertices
+        record["peak_rss_mb"] = peak_rss_mb()
+
+    def iterate(self, name: str, iterable):
+        """ iterable에서 다음 값을 꺼내는 시간을 name 단계로 기록합니다. (청크 읽기 등) """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def to_dict(self) -> dict:
+        """ JSON으로 저장할 수 있는 결과 (total_seconds, peak_rss_mb, stages) """
+        total = (self.finished or time.perf_counter()) - self.started
+        order = [name for name in STAGE_ORDER if name in self.stages] + [name for name in self.stages if name not in STAGE_ORDER]
+        return {"total_seconds": total, "peak_rss_mb": peak_rss_mb(), "stages": {name: dict(self.stages[name]) for name in order}}
+
+    def summary(self) -> str:
+        """ 한 줄 요약 (예: '12.3s, 1,000,000 features: read 3.1s · transform 2.0s · write 6.9s, peak 850 MB') """
+        stats = self.to_dict()
+        features = max((stage["features"] for stage in stats["stages"].values()), default=0)
+        parts = " · ".join(f"{name} {stage['seconds']:.2f}s" for name, stage in stats["stages"].items() if stage["calls"])
+        line = f"{stats['total_seconds']:.1f}s, {features:,} features"
+        if parts:
+            line += f": {parts}"
+        if stats["peak_rss_mb"] is not None:
+            line += f", peak {stats['peak_rss_mb']:,.0f} MB"
+        return line
+
+def stats_log_path(output_path: str) -> str:
+    """ 출력 파일 옆에 저장할 단계별 통계 JSON 경로 (<출력>.stats.json) """
+    return os.path.splitext(output_path)[0] + '.stats.json'
+
+def write_stats_log(output_path: str, stats: dict, **context) -> str:
+    """
+    단계별 통계를 출력 파일 옆 JSON으로 저장합니다.
+
+    :param output_path: (str), 변환 출력 경로
+    :param stats: (dict), StageTimer.to_dict 결과
+    :param context: 입력 경로, 엔진 등 함께 기록할 값
+    :return: (str), 저장한 JSON 경로
+    """
+    path = stats_log_path(output_path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(context, output=output_path, created=time.strftime('%Y-%m-%dT%H:%M:%S'), **stats), f, indent=2, ensure_ascii=False)
+    return path
+
+@contextmanager
+def profiled(output_path: str, profiler: str = None):
+    """
+    with 블록을 프로파일러로 감싸고 결과를 출력 파일 옆에 저장합니다.
+    'cprofile'은 <출력>.prof(pstats 형식), 'pyinstrument'는 <출력>.profile.html로 저장합니다.
+
+    :param output_path: (str), 변환 출력 경로
+    :param profiler: (str), None, 'cprofile', 'pyinstrument' 중 하나 (기본값: None)
+    """
+    base_path = os.path.splitext(output_path)[0]
+    if profiler is None:
+        yield
+    elif profiler == 'cprofile':
+        import cProfile
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(base_path + '.prof')
+    elif profiler == 'pyinstrument':
+        from pyinstrument import Profiler
+
+        profile = Profiler()
+        profile.start()
+        try:
+            yield
+        finally:
+            profile.stop()
+            with open(base_path + '.profile.html', 'w', encoding='utf-8') as f:
+                f.write(profile.output_html())
+    else:
+        raise ValueError(f"unknown profiler: {profiler}")
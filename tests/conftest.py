@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def small_layer(tmp_path):
+    """ 가로로 늘어선 5 x 5 정사각형 10개 (i번째는 x = 10i ~ 10i + 5), 짝수 번째는 SGG_CD '11110', 홀수 번째는 '11140' """
+    import geopandas as gpd
+    from shapely.geometry import box
+
+    path = str(tmp_path / 'small.shp')
+    gdf = gpd.GeoDataFrame({"NAME": [f"parcel{i}" for i in range(10)], "SGG_CD": ['11110' if i % 2 == 0 else '11140' for i in range(10)]},
+                           geometry=[box(10 * i, 0, 10 * i + 5, 5) for i in range(10)], crs='EPSG:5186')
+    gdf.to_file(path, encoding='cp949')
+    return path
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from shp_batch import convert_file
+from shp_convert import build_affine_matrix
+
+MATRIX = build_affine_matrix((100.0, -50.0), 15.0, 1.0, (0, 0))
+
+@pytest.mark.parametrize("backend, options", [
+    ("reference", dict(geometry_only=True)),
+    ("reference", dict(engine="arrow")),
+    ("reference", dict(spatial_index=True)),
+    ("reference", dict(incremental=True)),
+    ("native", dict(engine="arrow")),
+    ("native", dict(incremental=True)),
+    ("native", dict(where="SGG_CD = '11110'")),
+])
+def test_unsupported_backend_options_are_rejected(small_layer, tmp_path, backend, options):
+    # 지원하지 않는 선택 사항은 버리지 않고 아무것도 쓰기 전에 실패해야 함
+    output = str(tmp_path / "out.shp")
+    result = convert_file(small_layer, output, MATRIX, backend=backend, **options)
+    assert result["error"] is not None and "not supported" in result["error"]
+    assert not os.path.exists(output)
+
+def test_native_backend_accepts_geometry_only(small_layer, tmp_path):
+    result = convert_file(small_layer, str(tmp_path / "out.shp"), MATRIX, backend="native", geometry_only=True, spatial_index=True)
+    assert result["error"] is None and result["features"] == 10
+    assert os.path.exists(str(tmp_path / "out.qix"))
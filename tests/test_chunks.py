@@ -0,0 +1,36 @@
+import os
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+
+from shp_convert import adjust_shapefile_features
+
+TRANSFORM = dict(translation=(-12.5, 3000.75), rotation_angle=-33.0, scaling_factor=0.9996, rotation_origin=(25, 2.5))
+
+def _read(path):
+    gdf = gpd.read_parquet(path) if path.endswith(".parquet") else gpd.read_file(path)
+    # FlatGeobuf는 공간 인덱스 순서로 쓰므로 NAME 순으로 비교
+    return gdf.sort_values("NAME").reset_index(drop=True)
+
+@pytest.mark.parametrize("ext", [".shp", ".fgb", ".parquet"])
+@pytest.mark.parametrize("chunk_size", [1, 3, 4, 10, 25])
+def test_chunked_matches_single_shot(small_layer, tmp_path, ext, chunk_size):
+    # 10개 피처를 나누어 떨어지지 않는 크기(3, 4)로 나누어 이어 써도(Shapefile은 append 모드) 한 번에 쓴 결과와 같아야 함
+    single, chunked = str(tmp_path / ("single" + ext)), str(tmp_path / ("chunked" + ext))
+    adjust_shapefile_features(small_layer, single, **TRANSFORM)
+    adjust_shapefile_features(small_layer, chunked, chunk_size=chunk_size, **TRANSFORM)
+    expected, actual = _read(single), _read(chunked)
+    assert len(actual) == 10
+    assert expected.drop(columns="geometry").equals(actual.drop(columns="geometry"))
+    np.testing.assert_array_equal(shapely.get_coordinates(expected.geometry.values), shapely.get_coordinates(actual.geometry.values))
+
+def test_output_over_input_is_rejected(small_layer, tmp_path):
+    link = str(tmp_path / "link.shp")
+    os.link(small_layer, link)
+    before = os.path.getsize(small_layer)
+    for output in (small_layer, link):
+        with pytest.raises(ValueError):
+            adjust_shapefile_features(small_layer, output, chunk_size=3, **TRANSFORM)
+    assert os.path.getsize(small_layer) == before
@@ -0,0 +1,67 @@
+import mmap
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import LineString, Polygon
+
+from shp_codec import read_record_index, record_xy, transform_record_subset, transform_shapefile
+from shp_convert import apply_affine_matrix, build_affine_matrix
+
+MATRIX = build_affine_matrix(translation=(1234.5678, -987.6543), rotation_angle=12.5, scaling_factor=1.0001, rotation_origin=(100, 200))
+
+def _write(path, geometries):
+    gpd.GeoDataFrame({"ID": np.arange(len(geometries))}, geometry=geometries, crs='EPSG:5186').to_file(path)
+    return path
+
+@pytest.fixture
+def lines(tmp_path):
+    rng = np.random.default_rng(0)
+    geometries = [LineString(rng.uniform(0, 1000, size=(n, 2))) for n in rng.integers(2, 30, size=50)]
+    return _write(str(tmp_path / 'lines.shp'), geometries)
+
+@pytest.fixture
+def polygons_z(tmp_path):
+    geometries = [Polygon([(x, 0, 1.23456), (x, 10, 2.34567), (x + 10, 10, 3.45678), (x + 10, 0, 4.56789)]) for x in range(0, 500, 20)]
+    return _write(str(tmp_path / 'polygons_z.shp'), geometries)
+
+def test_record_offsets(lines):
+    # .shx로 구한 좌표 블록 위치에서 읽은 좌표가 GDAL이 읽은 좌표와 같아야 함
+    index = read_record_index(lines)
+    expected = gpd.read_file(lines).geometry.values
+    assert len(index["content"]) == len(expected)
+    with open(lines, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for xy_start, num_points, geometry in zip(index["xy_start"], index["num_points"], expected):
+            xy = record_xy(mm, int(xy_start), int(num_points))
+            np.testing.assert_array_equal(xy, shapely.get_coordinates(geometry))
+            del xy
+
+def test_offsets_survive_rewrite(lines, tmp_path):
+    output = str(tmp_path / 'out.shp')
+    transform_shapefile(lines, output, MATRIX)
+    before, after = read_record_index(lines), read_record_index(output)
+    for key in ("content", "xy_start", "num_points", "box"):
+        np.testing.assert_array_equal(before[key], after[key])
+
+@pytest.mark.parametrize("fixture", ["lines", "polygons_z"])
+def test_matches_vectorized(fixture, request, tmp_path):
+    # XY와 Z 모두 vectorized backend(apply_affine_matrix)와 같은 반올림 결과가 나와야 함
+    source = request.getfixturevalue(fixture)
+    output = str(tmp_path / 'out.shp')
+    transform_shapefile(source, output, MATRIX)
+    expected = apply_affine_matrix(gpd.read_file(source).geometry.values, MATRIX)
+    actual = gpd.read_file(output).geometry.values
+    np.testing.assert_array_equal(shapely.get_coordinates(actual, include_z=True), shapely.get_coordinates(expected, include_z=True))
+
+def test_record_subset(polygons_z, tmp_path):
+    full = str(tmp_path / 'full.shp')
+    subset = str(tmp_path / 'subset.shp')
+    transform_shapefile(polygons_z, full, MATRIX)
+    ids = np.array([0, 3, 4, 24])
+    result = transform_record_subset(polygons_z, subset, ids, MATRIX)
+    assert result["records"] == len(ids)
+
+    expected = gpd.read_file(full, columns=[], fids=ids).geometry.values
+    actual = gpd.read_file(subset, columns=[]).geometry.values
+    np.testing.assert_array_equal(shapely.get_coordinates(actual, include_z=True), shapely.get_coordinates(expected, include_z=True))
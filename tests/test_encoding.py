@@ -0,0 +1,65 @@
+import os
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Point
+
+import shp_encoding
+from shp_encoding import detect_encoding, detect_encoding_with_source
+
+@pytest.fixture
+def korean_layer(tmp_path):
+    """ 한글 속성을 cp949로 쓰고 .cpg를 지운 레이어를 만드는 함수 (ldid: DBF 헤더 language driver ID) """
+    def make(name="korean", encoding="cp949", ldid=0x57, texts=("서울특별시 종로구", "부산광역시")):
+        path = str(tmp_path / f"{name}.shp")
+        gpd.GeoDataFrame({"ADDR": list(texts), "CODE": ["A", "B"]}, geometry=[Point(0, 0), Point(1, 1)],
+                         crs='EPSG:5186').to_file(path, encoding=encoding)
+        base_path = os.path.splitext(path)[0]
+        if os.path.exists(base_path + ".cpg"):
+            os.remove(base_path + ".cpg")
+        with open(base_path + ".dbf", "r+b") as f:
+            f.seek(29)
+            f.write(bytes([ldid]))
+        return path
+
+    shp_encoding._detect.cache_clear()
+    yield make
+    shp_encoding._detect.cache_clear()
+
+def _write_cpg(shapefile, text):
+    with open(os.path.splitext(shapefile)[0] + ".cpg", "w", newline="") as f:
+        f.write(text)
+
+@pytest.mark.parametrize("cpg, expected", [
+    ("949", "cp949"), ("CP949", "cp949"), ("cp949\r\n", "cp949"), ("ANSI 949", "cp949"),
+    ("UTF-8", "utf-8"), ("utf-8\n", "utf-8"), ("UTF8", "utf-8"), ("65001", "utf-8"), ("UTF-8\x00\x00", "utf-8"),
+])
+def test_cpg_variants(korean_layer, cpg, expected):
+    path = korean_layer()
+    _write_cpg(path, cpg)
+    assert detect_encoding_with_source(path) == (expected, "cpg")
+
+def test_unknown_cpg_falls_back_to_dbf(korean_layer):
+    path = korean_layer()
+    _write_cpg(path, "NOT-A-CODEPAGE")
+    assert detect_encoding_with_source(path) == ("cp949", "sample")
+
+@pytest.mark.parametrize("ldid", [0x00, 0x03, 0x57, 0x58, 0x59])
+def test_generic_ldid_uses_sample(korean_layer, ldid):
+    # 'ANSI', Latin 계열 LDID는 한글 데이터에도 기록되므로 속성 표본으로 판단
+    assert detect_encoding_with_source(korean_layer(ldid=ldid)) == ("cp949", "sample")
+
+def test_specific_ldid(korean_layer):
+    assert detect_encoding_with_source(korean_layer(ldid=0x79)) == ("cp949", "ldid")
+    assert detect_encoding_with_source(korean_layer(name="japanese", ldid=0x13)) == ("cp932", "ldid")
+
+def test_cp949_sample_without_cpg(korean_layer):
+    path = korean_layer()
+    assert not os.path.exists(os.path.splitext(path)[0] + ".cpg")
+    assert detect_encoding(path) == "cp949"
+    assert gpd.read_file(path, encoding=detect_encoding(path))["ADDR"].tolist()[0] == "서울특별시 종로구"
+
+def test_utf8_sample_and_ascii_default(korean_layer):
+    assert detect_encoding_with_source(korean_layer(name="utf8", encoding="utf-8")) == ("utf-8", "sample")
+    # ASCII만 있으면 표본으로 판단할 수 없어 기본값
+    assert detect_encoding_with_source(korean_layer(name="ascii", texts=("Jongno-gu", "Busan"), encoding="utf-8")) == ("cp949", "default")
@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+import shapely
+
+import shp_engine
+from shp_convert import build_affine_matrix
+from shp_engine import sample_ids, verify_backends
+
+MATRIX = build_affine_matrix((1000.0, 2000.0), 30.0, 1.0002, (5, 5))
+
+@pytest.mark.parametrize("total, sample", [(10, 2), (10, 3), (10, 9), (1000, 50), (3, 2)])
+def test_sample_ids_size_and_endpoints(total, sample):
+    for seed in range(20):
+        ids = sample_ids(total, sample, seed)
+        assert len(ids) == sample and len(np.unique(ids)) == sample
+        assert ids[0] == 0 and ids[-1] == total - 1
+        assert np.all(np.diff(ids) > 0)
+
+def test_sample_ids_small_requests():
+    assert sample_ids(10, None).tolist() == list(range(10))
+    assert sample_ids(10, 20).tolist() == list(range(10))
+    assert sample_ids(10, 1).tolist() == [0]
+
+def test_verify_backends_agree(small_layer):
+    report = verify_backends(small_layer, MATRIX, ('reference', 'vectorized', 'native'), sample=5)
+    assert report["ok"] and report["sample"] == 5
+    assert all(value == 0.0 for value in report["max_difference"].values())
+
+def test_verify_backends_detects_perturbed_backend(small_layer, monkeypatch):
+    transform_geometries = shp_engine.transform_geometries
+
+    def perturbed(geometries, matrix, backend, precision=3):
+        # vectorized backend 결과의 두 번째 피처만 1 cm 어긋나게 만듦
+        result = np.asarray(transform_geometries(geometries, matrix, backend, precision), dtype=object)
+        if backend == 'vectorized':
+            result[1] = shapely.transform(result[1], lambda coords: coords + 0.01)
+        return result
+
+    monkeypatch.setattr(shp_engine, "transform_geometries", perturbed)
+    report = verify_backends(small_layer, MATRIX, ('reference', 'vectorized'), sample=None)
+    assert not report["ok"]
+    assert report["max_difference"]["vectorized"] == pytest.approx(0.01)
+    assert report["mismatched"]["vectorized"] == [1]
+
+# 두 번째 행렬은 X축을 뒤집는 거울상 변환
+MATRICES = np.stack([MATRIX, np.array([[-1.0, 0.0, 500.25], [0.0, 1.0, -20.5]]), build_affine_matrix((0.0, 0.0), -75.5, 0.5, (100, 0))])
+
+def test_apply_affine_matrices_matches_single_matrix(small_layer):
+    import geopandas as gpd
+
+    from shp_convert import apply_affine_matrices, apply_affine_matrix
+
+    geometries = gpd.read_file(small_layer).geometry.values
+    for matrix, result in zip(MATRICES, apply_affine_matrices(geometries, MATRICES)):
+        assert list(shapely.to_wkb(result)) == list(shapely.to_wkb(apply_affine_matrix(geometries, matrix)))
+
+@pytest.mark.parametrize("ext", [".shp", ".parquet"])
+@pytest.mark.parametrize("chunk_size", [None, 3])
+def test_convert_many_matches_separate_conversions(small_layer, tmp_path, ext, chunk_size):
+    import geopandas as gpd
+
+    from shp_convert import adjust_shapefile_features
+
+    def read(path):
+        return gpd.read_parquet(path) if ext == ".parquet" else gpd.read_file(path)
+
+    outputs = [str(tmp_path / f"many{k}{ext}") for k in range(len(MATRICES))]
+    shp_engine.convert_many(small_layer, outputs, MATRICES, chunk_size=chunk_size)
+    for k, (matrix, output) in enumerate(zip(MATRICES, outputs)):
+        single = str(tmp_path / f"single{k}{ext}")
+        adjust_shapefile_features(small_layer, single, matrix=matrix, chunk_size=chunk_size)
+        expected, actual = read(single), read(output)
+        assert expected.drop(columns="geometry").equals(actual.drop(columns="geometry"))
+        assert list(shapely.to_wkb(actual.geometry.values)) == list(shapely.to_wkb(expected.geometry.values))
+
+def _keyed_layer(tmp_path, keys, geometries, ext=".shp"):
+    import geopandas as gpd
+
+    path = str(tmp_path / ("keyed" + ext))
+    gdf = gpd.GeoDataFrame({"NAME": [f"f{i}" for i in range(len(keys))], "ZONE": keys}, geometry=geometries, crs='EPSG:5186')
+    if ext == ".parquet":
+        gdf.to_parquet(path)
+    else:
+        gdf.to_file(path, encoding='cp949')
+    return path
+
+def _expected_keyed(geometries, matrices_by_feature):
+    from shp_convert import apply_affine_matrix
+
+    return [shapely.to_wkb(apply_affine_matrix([geometry], matrix)[0]) for geometry, matrix in zip(geometries, matrices_by_feature)]
+
+def _normalized(wkbs):
+    # Shapefile은 거울상 변환으로 뒤집힌 링 방향을 다시 시계 방향으로 써서 정규화하여 비교
+    return list(shapely.to_wkb(shapely.normalize(shapely.from_wkb(wkbs))))
+
+def test_convert_by_key_missing_key(small_layer, tmp_path):
+    import geopandas as gpd
+
+    conversions = {"11110": MATRICES[0]}
+    with pytest.raises(ValueError, match="11140"):
+        shp_engine.convert_by_key(small_layer, str(tmp_path / "out.shp"), "SGG_CD", conversions)
+
+    # 기본 변환이 있으면 목록에 없는 키('11140')는 기본 변환을 사용
+    output = str(tmp_path / "default.shp")
+    stats = shp_engine.convert_by_key(small_layer, output, "SGG_CD", conversions, default=MATRICES[1], chunk_size=3)
+    assert stats["groups"] == {"11110": 5, "*": 5}
+    source = gpd.read_file(small_layer)
+    expected = _expected_keyed(source.geometry.values, [MATRICES[0] if key == "11110" else MATRICES[1] for key in source["SGG_CD"]])
+    assert _normalized(shapely.to_wkb(gpd.read_file(output).geometry.values)) == _normalized(expected)
+
+@pytest.mark.parametrize("keys", [["A", None, "B", None], [1, None, 2, None]], ids=["text", "integer"])
+def test_convert_by_key_null_keys(tmp_path, keys):
+    import geopandas as gpd
+    from shapely.geometry import box
+
+    # null이 섞인 정수 컬럼은 float64로 읽히므로 1.0 → '1'로 비교됨
+    geometries = [box(10 * i, 0, 10 * i + 5, 5) for i in range(4)]
+    layer = _keyed_layer(tmp_path, keys, geometries)
+    conversions = {str(keys[0]): MATRICES[0], str(keys[2]): MATRICES[2]}
+    with pytest.raises(ValueError, match="null key"):
+        shp_engine.convert_by_key(layer, str(tmp_path / "out.shp"), "ZONE", conversions)
+
+    output = str(tmp_path / "default.shp")
+    stats = shp_engine.convert_by_key(layer, output, "ZONE", conversions, default=MATRICES[1])
+    assert list(stats["groups"].values()) == [1, 1, 2]
+    stored = gpd.read_file(layer).geometry.values
+    expected = _expected_keyed(stored, [MATRICES[0], MATRICES[1], MATRICES[2], MATRICES[1]])
+    assert _normalized(shapely.to_wkb(gpd.read_file(output).geometry.values)) == _normalized(expected)
+
+def test_convert_by_key_mixed_geometry_types(tmp_path):
+    import geopandas as gpd
+    from shapely.geometry import LineString, MultiPolygon, Point, box
+
+    # 한 그룹 안에 여러 geometry 종류가 섞여 있어도 피처마다 자기 그룹의 행렬을 사용
+    geometries = [Point(1.25, 2.5), LineString([(0, 0), (3.125, 4.5), (7, 1)]), box(0, 0, 2, 2),
+                  MultiPolygon([box(5, 5, 6, 6), box(8, 8, 9.5, 9.5)]), Point(4, 4), LineString([(1, 1), (2, 2)])]
+    keys = ["A", "A", "A", "B", "B", "A"]
+    layer = _keyed_layer(tmp_path, keys, geometries, ext=".parquet")
+
+    from shp_convert import apply_keyed_matrices
+
+    groups = np.array([0 if key == "A" else 1 for key in keys])
+    expected = _expected_keyed(geometries, [MATRICES[group] for group in groups])
+    assert list(shapely.to_wkb(apply_keyed_matrices(geometries, groups, MATRICES[:2]))) == expected
+
+    output = str(tmp_path / "out.parquet")
+    source = gpd.read_parquet(layer)
+    # 공간 인덱스 없이 써서 입력 순서 유지
+    source.to_file(str(tmp_path / "mixed.fgb"), SPATIAL_INDEX="NO")
+    stats = shp_engine.convert_by_key(str(tmp_path / "mixed.fgb"), output, "ZONE", {"A": MATRICES[0], "B": MATRICES[1]}, chunk_size=4)
+    assert stats["groups"] == {"A": 4, "B": 2}
+    result = gpd.read_parquet(output)
+    assert result["NAME"].tolist() == source["NAME"].tolist()
+    assert list(shapely.to_wkb(result.geometry.values)) == expected
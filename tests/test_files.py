@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+from shp_files import find_sidecar, read_header
+
+def test_find_sidecar_uppercase(small_layer):
+    base_path = os.path.splitext(small_layer)[0]
+    os.rename(base_path + ".dbf", base_path + ".DBF")
+    assert find_sidecar(small_layer, ".dbf") == base_path + ".DBF"
+    assert find_sidecar(small_layer, ".cpg") == base_path + ".cpg"
+    assert find_sidecar(small_layer, ".qix") is None
+
+def test_read_header(small_layer):
+    header = read_header(small_layer)
+    assert header["shape_type"] == 5
+    assert header["file_length"] == os.path.getsize(small_layer)
+    assert header["bbox"] == (0.0, 0.0, 95.0, 5.0)
+
+def test_header_modules_do_not_import_geopandas():
+    # 인코딩 감지, 사전 점검, native codec은 geopandas 없이 불러와야 함
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, shp_codec, shp_encoding, shp_preflight; print('geopandas' in sys.modules)"
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=root, check=True)
+    assert completed.stdout.strip() == "False"
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shp_convert import iter_feature_chunks, select_features
+
+def _read_names(path, chunk_size, **filters):
+    chunks = list(iter_feature_chunks(path, chunk_size, encoding='cp949', **filters))
+    totals = {total for _, total, _ in chunks}
+    names = pd.concat([chunk["NAME"] for _, _, chunk in chunks]).tolist()
+    return totals, names
+
+def test_select_features_bbox(small_layer):
+    np.testing.assert_array_equal(select_features(small_layer, bbox=(1, 1, 22, 4)), [0, 1, 2])
+
+def test_select_features_where(small_layer):
+    np.testing.assert_array_equal(select_features(small_layer, where="SGG_CD = '11140'"), [1, 3, 5, 7, 9])
+
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_bbox_filter(small_layer, chunk_size):
+    totals, names = _read_names(small_layer, chunk_size, bbox=(1, 1, 22, 4))
+    assert totals == {3}
+    assert names == ["parcel0", "parcel1", "parcel2"]
+
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_where_filter(small_layer, chunk_size):
+    totals, names = _read_names(small_layer, chunk_size, where="SGG_CD = '11110'")
+    assert totals == {5}
+    assert names == [f"parcel{i}" for i in range(0, 10, 2)]
+
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_filter_without_matches(small_layer, chunk_size):
+    totals, names = _read_names(small_layer, chunk_size, bbox=(1000, 1000, 1001, 1001))
+    assert totals == {0}
+    assert names == []
+
+def test_select_features_where_and_bbox(small_layer):
+    np.testing.assert_array_equal(select_features(small_layer, where="sgg_cd = '11110'", bbox=(1, 1, 42, 4)), [0, 2, 4])
@@ -0,0 +1,69 @@
+import os
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import box
+
+from shp_convert import adjust_shapefile_features
+
+TRANSFORM = dict(translation=(200000.5, 450000.25), rotation_angle=1.5, rotation_origin=(0, 0))
+
+def _convert(input_path, output_path, incremental=True):
+    return adjust_shapefile_features(input_path, output_path, incremental=incremental, **TRANSFORM)
+
+def _rewrite(path, gdf):
+    gdf.to_file(path, encoding='cp949')
+
+def _assert_matches_full_conversion(input_path, output_path, tmp_path):
+    # 증분 결과는 처음부터 전체 변환한 결과와 같아야 함
+    full_path = str(tmp_path / "full.shp")
+    _convert(input_path, full_path, incremental=False)
+    expected, actual = gpd.read_file(full_path), gpd.read_file(output_path)
+    assert expected.drop(columns="geometry").equals(actual.drop(columns="geometry"))
+    np.testing.assert_array_equal(shapely.get_coordinates(expected.geometry.values), shapely.get_coordinates(actual.geometry.values))
+
+def test_unchanged_input_is_not_rewritten(small_layer, tmp_path):
+    output = str(tmp_path / "out.shp")
+    assert _convert(small_layer, output)["incremental"]["full_rebuild"]
+    written = os.stat(output).st_mtime_ns
+
+    stats = _convert(small_layer, output)["incremental"]
+    assert stats["skipped"] and stats["transformed"] == 0 and stats["reused"] == 10
+    # 같은 내용으로 다시 저장된 입력도 해시가 같으면 출력을 쓰지 않음
+    _rewrite(small_layer, gpd.read_file(small_layer))
+    assert _convert(small_layer, output)["incremental"]["skipped"]
+    assert os.stat(output).st_mtime_ns == written
+
+def test_edited_feature(small_layer, tmp_path):
+    output = str(tmp_path / "out.shp")
+    _convert(small_layer, output)
+    gdf = gpd.read_file(small_layer)
+    gdf.loc[3, "geometry"] = box(31, 1, 34, 4)
+    _rewrite(small_layer, gdf)
+
+    stats = _convert(small_layer, output)["incremental"]
+    assert (stats["transformed"], stats["reused"], stats["skipped"]) == (1, 9, False)
+    _assert_matches_full_conversion(small_layer, output, tmp_path)
+
+def test_added_feature(small_layer, tmp_path):
+    output = str(tmp_path / "out.shp")
+    _convert(small_layer, output)
+    gdf = gpd.read_file(small_layer)
+    added = gpd.GeoDataFrame({"NAME": ["parcel10"], "SGG_CD": ["11110"]}, geometry=[box(100, 0, 105, 5)], crs=gdf.crs)
+    _rewrite(small_layer, gpd.GeoDataFrame(pd.concat([gdf, added], ignore_index=True), crs=gdf.crs))
+
+    stats = _convert(small_layer, output)["incremental"]
+    assert (stats["features"], stats["transformed"], stats["reused"]) == (11, 1, 10)
+    _assert_matches_full_conversion(small_layer, output, tmp_path)
+
+def test_deleted_feature(small_layer, tmp_path):
+    output = str(tmp_path / "out.shp")
+    _convert(small_layer, output)
+    gdf = gpd.read_file(small_layer)
+    _rewrite(small_layer, gdf.drop(index=4).reset_index(drop=True))
+
+    stats = _convert(small_layer, output)["incremental"]
+    assert (stats["features"], stats["transformed"], stats["reused"], stats["skipped"]) == (9, 0, 9, False)
+    _assert_matches_full_conversion(small_layer, output, tmp_path)
@@ -0,0 +1,50 @@
+import os
+
+import geopandas as gpd
+import numpy as np
+import pyogrio
+import pytest
+from shapely.geometry import LineString, box
+
+from shp_index import write_qix
+
+QUERIES = [(0, 0, 15, 15), (33.5, 41.2, 78.9, 60.0), (-10, -10, 1, 1), (95, 95, 300, 300), (500, 500, 600, 600)]
+
+@pytest.fixture
+def grid_layer(tmp_path):
+    """ 20 x 20 격자의 작은 정사각형과 격자를 가로지르는 긴 선 (깊이가 여러 단계인 트리를 만들기 위함) """
+    path = str(tmp_path / 'grid.shp')
+    geometries = [box(5 * i, 5 * j, 5 * i + 3, 5 * j + 3) for i in range(20) for j in range(20)]
+    geometries += [LineString([(0, 0), (100, 100)]).buffer(0.5), box(40, 0, 42, 100)]
+    gdf = gpd.GeoDataFrame({"ID": np.arange(len(geometries))}, geometry=geometries, crs='EPSG:5186')
+    gdf.to_file(path)
+    return path
+
+def _query(path, bbox):
+    return sorted(pyogrio.read_dataframe(path, columns=[], bbox=bbox, fid_as_index=True).index.tolist())
+
+def test_qix_header(grid_layer):
+    result = write_qix(grid_layer)
+    with open(result["path"], 'rb') as f:
+        assert f.read(3) == b'SQT'
+    assert result["shapes"] == 402
+
+@pytest.mark.parametrize("bbox", QUERIES)
+def test_qix_matches_unindexed_query(grid_layer, bbox):
+    # 인덱스가 없을 때와 있을 때 GDAL bbox 질의 결과가 같아야 함
+    expected = _query(grid_layer, bbox)
+    write_qix(grid_layer)
+    assert os.path.exists(os.path.splitext(grid_layer)[0] + '.qix')
+    assert _query(grid_layer, bbox) == expected
+
+@pytest.mark.parametrize("ext", [".qix", ".QIX", ".sbn", ".SBX"])
+def test_stale_index_removed_by_native_codec(small_layer, tmp_path, ext):
+    # 이전 출력의 공간 인덱스는 확장자 대소문자와 관계없이 지워져야 함
+    from shp_codec import transform_shapefile
+
+    output = str(tmp_path / "out.shp")
+    stale = str(tmp_path / ("out" + ext))
+    with open(stale, "wb") as f:
+        f.write(b"stale")
+    transform_shapefile(small_layer, output, np.array([[1.0, 0.0, 10.0], [0.0, 1.0, 20.0]]))
+    assert not os.path.exists(stale)
@@ -0,0 +1,38 @@
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+
+from shp_convert import adjust_shapefile_features
+
+TRANSFORM = dict(translation=(1000.123, -250.5), rotation_angle=12.5, scaling_factor=1.0001, rotation_origin=(50, 2.5))
+
+def _assert_same_layer(expected_path, actual_path):
+    expected, actual = gpd.read_file(expected_path), gpd.read_file(actual_path)
+    assert expected.drop(columns="geometry").equals(actual.drop(columns="geometry"))
+    np.testing.assert_array_equal(shapely.get_coordinates(expected.geometry.values), shapely.get_coordinates(actual.geometry.values))
+
+@pytest.mark.parametrize("chunk_size", [None, 3, 7])
+def test_workers_match_single_process(small_layer, tmp_path, chunk_size):
+    # 구간을 나누어 프로세스 풀에서 읽고 변환해도 결과(순서 포함)가 같아야 함
+    single, parallel = str(tmp_path / "single.shp"), str(tmp_path / "parallel.shp")
+    adjust_shapefile_features(small_layer, single, chunk_size=chunk_size, **TRANSFORM)
+    adjust_shapefile_features(small_layer, parallel, chunk_size=chunk_size, workers=3, **TRANSFORM)
+    _assert_same_layer(single, parallel)
+
+def test_workers_with_where_filter(small_layer, tmp_path):
+    single, parallel = str(tmp_path / "single.shp"), str(tmp_path / "parallel.shp")
+    adjust_shapefile_features(small_layer, single, where="SGG_CD = '11140'", **TRANSFORM)
+    adjust_shapefile_features(small_layer, parallel, where="SGG_CD = '11140'", chunk_size=2, workers=2, **TRANSFORM)
+    _assert_same_layer(single, parallel)
+    assert len(gpd.read_file(parallel)) == 5
+
+def test_workers_geometry_only(small_layer, tmp_path):
+    single, parallel = str(tmp_path / "single.shp"), str(tmp_path / "parallel.shp")
+    adjust_shapefile_features(small_layer, single, geometry_only=True, **TRANSFORM)
+    adjust_shapefile_features(small_layer, parallel, geometry_only=True, workers=3, **TRANSFORM)
+    _assert_same_layer(single, parallel)
+
+def test_workers_rejected_with_arrow_engine(small_layer, tmp_path):
+    with pytest.raises(ValueError):
+        adjust_shapefile_features(small_layer, str(tmp_path / "out.shp"), engine="arrow", workers=2, **TRANSFORM)
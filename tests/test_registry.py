@@ -0,0 +1,65 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from shp_convert import conversion_to_matrix, invert_affine_matrix
+from transform_registry import AffineTransform, TransformRegistry
+
+def _conversion(shift: float) -> dict:
+    return {"px1": "0", "py1": "0", "px2": "100", "py2": "0", "qx1": str(shift), "qy1": "500", "qx2": str(shift + 100), "qy2": "510"}
+
+def _write(path, shift: float, mtime_ns: int = None):
+    with open(path, "w") as f:
+        json.dump(_conversion(shift), f)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+def test_cache_hit_returns_same_transform(tmp_path):
+    registry = TransformRegistry()
+    path = _write(tmp_path / "a.json", 10)
+    first = registry.get(path)
+    assert registry.get(path) is first
+    # 역변환도 다시 읽지 않고 캐시된 변환에서 만듦
+    reverse = registry.get(os.path.relpath(path), reverse=True)
+    assert (registry.hits, registry.misses, len(registry)) == (2, 1, 1)
+    np.testing.assert_array_equal(first.matrix, conversion_to_matrix(_conversion(10)))
+    np.testing.assert_array_equal(reverse.matrix, invert_affine_matrix(first.matrix))
+    np.testing.assert_array_equal(reverse.inverse, first.matrix)
+
+def test_modified_file_is_reloaded(tmp_path):
+    registry = TransformRegistry()
+    path = _write(tmp_path / "a.json", 10, mtime_ns=1_000_000_000)
+    before = registry.get(path)
+    _write(path, 20, mtime_ns=2_000_000_000)
+    after = registry.get(path)
+    assert after != before
+    np.testing.assert_array_equal(after.matrix, conversion_to_matrix(_conversion(20)))
+    # 이전 버전 항목은 남기지 않음
+    assert (registry.hits, registry.misses, len(registry)) == (0, 2, 1)
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    registry = TransformRegistry(maxsize=2)
+    a, b, c = (_write(tmp_path / f"{name}.json", shift) for name, shift in (("a", 1), ("b", 2), ("c", 3)))
+    registry.get(a)
+    registry.get(b)
+    registry.get(a)          # a를 최근 사용으로 옮김
+    registry.get(c)          # 가장 오래 쓰지 않은 b가 빠짐
+    assert len(registry) == 2 and registry.misses == 3
+    registry.get(a)
+    assert registry.hits == 2
+    registry.get(b)
+    assert registry.misses == 4
+
+    registry.clear()
+    assert (len(registry), registry.hits, registry.misses) == (0, 0, 0)
+
+def test_affine_transform_is_immutable():
+    transform = AffineTransform(np.array([[1.0, 0.0, 5.0], [0.0, 1.0, -5.0]]))
+    with pytest.raises(AttributeError):
+        transform._matrix = np.eye(2, 3)
+    with pytest.raises(ValueError):
+        transform.matrix[0, 2] = 0.0
+    assert transform.inverted().inverted() == transform
@@ -0,0 +1,50 @@
+import asyncio
+import os
+
+from shp_service import JobService, request
+
+CONVERSION = {"px1": "0", "py1": "0", "px2": "100", "py2": "0", "qx1": "1000", "qy1": "2000", "qx2": "1100", "qy2": "2000"}
+
+def _run_service(tmp_path, scenario):
+    async def main():
+        socket_path = str(tmp_path / "service.sock")
+        service = JobService(concurrency=1)
+        server = await service.start(unix_socket=socket_path)
+        try:
+            async with server:
+                return await scenario(lambda method, path, body=None: request(method, path, body, unix_socket=socket_path))
+        finally:
+            service.shutdown()
+
+    return asyncio.run(main())
+
+def test_job_runs_to_success(small_layer, tmp_path):
+    output = str(tmp_path / "out.shp")
+
+    async def scenario(send):
+        code, job = await send("POST", "/jobs", {"input": small_layer, "output": output, "conversion": CONVERSION, "chunk_size": 4})
+        assert code == 201 and job["status"] in ("queued", "running")
+        for _ in range(200):
+            code, status = await send("GET", f"/jobs/{job['id']}")
+            if status["status"] not in ("queued", "running"):
+                break
+            await asyncio.sleep(0.05)
+        return code, status
+
+    code, status = _run_service(tmp_path, scenario)
+    assert code == 200 and status["status"] == "succeeded", status["error"]
+    assert (status["done"], status["total"]) == (10, 10)
+    assert os.path.exists(output)
+
+def test_malformed_requests_return_400(small_layer, tmp_path):
+    async def scenario(send):
+        bodies = [[], 5, "x", {"input": 5, "conversion": CONVERSION}, {"input": [small_layer], "conversion": CONVERSION},
+                  {"input": small_layer, "conversion": 5}, {"input": small_layer, "conversion": CONVERSION, "chunk_size": "big"},
+                  {"input": small_layer}, {"input": str(tmp_path / "missing.shp"), "conversion": CONVERSION}]
+        codes = [(await send("POST", "/jobs", body))[0] for body in bodies]
+        code, jobs = await send("GET", "/jobs")
+        return codes, jobs
+
+    codes, jobs = _run_service(tmp_path, scenario)
+    assert codes == [400] * len(codes)
+    assert jobs == []
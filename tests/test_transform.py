@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import LineString, MultiPolygon, Point, Polygon
+
+from shp_convert import apply_affine_matrix, build_affine_matrix, round_array, round_coordinates, round_geometries, transform_geometry
+
+PARAMETERS = dict(translation=(-1523.417, 2877.091), rotation_angle=0.7346, scaling_factor=1.000137, rotation_origin=(201532.118, 451877.604))
+
+def _random_xy(rng, count):
+    # 측량 좌표 크기(수십만 m)에 mm 아래 자리가 있는 좌표
+    return rng.uniform((200000, 450000), (203000, 453000), size=(count, 2)) + rng.random((count, 2)) * 1e-4
+
+def _sample_geometries(has_z: bool) -> list:
+    rng = np.random.default_rng(20240611)
+
+    def coords(count):
+        xy = _random_xy(rng, count)
+        return np.column_stack([xy, rng.uniform(10, 80, count)]) if has_z else xy
+
+    def ring(center, radius, count=12):
+        angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+        points = coords(count)
+        points[:, 0] = center[0] + radius * np.cos(angles) + points[:, 0] % 1e-3
+        points[:, 1] = center[1] + radius * np.sin(angles) + points[:, 1] % 1e-3
+        return np.vstack([points, points[:1]])
+
+    polygon_with_hole = Polygon(ring((201000, 451000), 50), [ring((201000, 451000), 10)])
+    return [
+        Point(*coords(1)[0]),
+        LineString(coords(40)),
+        polygon_with_hole,
+        MultiPolygon([polygon_with_hole, Polygon(ring((202000, 452000), 30))]),
+    ]
+
+@pytest.mark.parametrize("has_z", [False, True], ids=["xy", "xyz"])
+def test_affine_matrix_matches_per_feature_transform(has_z):
+    # 일괄 변환(apply_affine_matrix) 결과는 피처마다 transform_geometry로 변환한 것과 바이트 단위로 같아야 함
+    geometries = _sample_geometries(has_z)
+    expected = shapely.to_wkb([transform_geometry(geometry, **PARAMETERS) for geometry in geometries])
+    actual = shapely.to_wkb(apply_affine_matrix(geometries, build_affine_matrix(**PARAMETERS)))
+    assert list(actual) == list(expected)
+    assert all(shapely.has_z(geometry) == has_z for geometry in apply_affine_matrix(geometries, build_affine_matrix(**PARAMETERS)))
+
+@pytest.mark.parametrize("has_z", [False, True], ids=["xy", "xyz"])
+def test_round_geometries_matches_round_coordinates(has_z):
+    geometries = _sample_geometries(has_z)
+    expected = shapely.to_wkb([round_coordinates(geometry, 3) for geometry in geometries])
+    assert list(shapely.to_wkb(round_geometries(geometries, 3))) == list(expected)
+
+@pytest.mark.parametrize("precision", [0, 2, 3, 6])
+def test_round_array_matches_builtin_round_on_ties(precision):
+    # k + 0.5 단위(반올림 경계)에 놓인 값과 그 바로 옆 값에서 내장 round()와 같아야 함
+    step = 10.0 ** -precision
+    ties = (np.arange(-2000, 2000) + 0.5) * step + 451877.0
+    values = np.concatenate([ties, np.nextafter(ties, np.inf), np.nextafter(ties, -np.inf)])
+    expected = np.array([round(float(value), precision) for value in values])
+    np.testing.assert_array_equal(round_array(values, precision), expected)
+
+def _round_via_mapping(geometry, precision=3):
+    # 배열 반올림 이전 방식: GeoJSON dict로 바꾸어 좌표를 하나씩 round()한 뒤 다시 만듦
+    from shapely.geometry import mapping, shape
+
+    def round_elements(value):
+        if isinstance(value, (list, tuple)):
+            return [round_elements(item) for item in value]
+        return round(value, precision)
+
+    data = mapping(geometry)
+    return shape(dict(data, coordinates=round_elements(data["coordinates"])))
+
+@pytest.mark.parametrize("index", range(4), ids=["point", "linestring", "polygon_with_hole", "multipolygon"])
+@pytest.mark.parametrize("has_z", [False, True], ids=["xy", "xyz"])
+def test_vectorized_rounding_matches_mapping_round_trip(index, has_z):
+    geometry = _sample_geometries(has_z)[index]
+    expected = shapely.to_wkb(_round_via_mapping(geometry))
+    assert shapely.to_wkb(round_coordinates(geometry)) == expected
+    assert shapely.to_wkb(round_geometries([geometry])[0]) == expected
+
+@pytest.mark.parametrize("index", [1, 3], ids=["linestring", "multipolygon"])
+def test_vectorized_layer_matches_per_feature_transform(tmp_path, index):
+    # 파일 단위 일괄 변환(adjust_shapefile_features)도 피처마다 변환한 결과와 같아야 함
+    import geopandas as gpd
+
+    from shp_convert import adjust_shapefile_features
+
+    geometry = _sample_geometries(False)[index]
+    source = gpd.GeoDataFrame({"ID": [0, 1]}, geometry=[geometry, shapely.affinity.translate(geometry, 500.0625, -250.0375)], crs='EPSG:5186')
+    input_path, output_path = str(tmp_path / "in.shp"), str(tmp_path / "out.shp")
+    source.to_file(input_path)
+    adjust_shapefile_features(input_path, output_path, chunk_size=1, **PARAMETERS)
+
+    stored = gpd.read_file(input_path).geometry
+    expected = [transform_geometry(geometry, **PARAMETERS) for geometry in stored]
+    actual = gpd.read_file(output_path).geometry
+    # 파일에서 읽은 geometry 종류(Polygon/MultiPolygon)와 관계없이 좌표 배열과 부분별 좌표 수로 비교
+    np.testing.assert_array_equal(shapely.get_coordinates(actual.values), shapely.get_coordinates(expected))
+    assert list(shapely.get_num_coordinates(actual.values)) == list(shapely.get_num_coordinates(expected))
+
+# 정사각형 꼭짓점(중심 200000, 450000)과 Helmert/아핀 해 공간에 직교하는 잡음 (x만 +d, -d, +d, -d)
+CONTROL_SOURCE = np.array([[1.0, 1.0], [-1.0, 1.0], [-1.0, -1.0], [1.0, -1.0]]) * 250.0 + (200000.0, 450000.0)
+CONTROL_NOISE = np.array([[1.0, 0.0], [-1.0, 0.0], [1.0, 0.0], [-1.0, 0.0]]) * 0.05
+
+KNOWN_MATRICES = {
+    "helmert": build_affine_matrix((1234.5, -678.25), 3.25, 1.0004, (200000.0, 450000.0)),
+    "affine": np.array([[0.9995, 0.0123, 1523.75], [-0.0117, 1.0008, -802.125]]),
+}
+
+def _assert_matrix_close(actual, expected):
+    # 선형 부분은 중심을 옮겨 계산하므로 거의 정확하고, 이동량은 좌표 크기(수십만 m)만큼의 반올림 오차를 가짐
+    actual = np.asarray(actual)
+    np.testing.assert_allclose(actual[:, :2], expected[:, :2], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(actual[:, 2], expected[:, 2], rtol=0, atol=1e-6)
+
+@pytest.mark.parametrize("method", ["helmert", "affine"])
+def test_estimate_transform_recovers_known_matrix(method):
+    from shp_convert import estimate_transform
+
+    matrix = KNOWN_MATRICES[method]
+    target = CONTROL_SOURCE @ matrix[:, :2].T + matrix[:, 2]
+    result = estimate_transform(CONTROL_SOURCE, target, method)
+    _assert_matrix_close(result["matrix"], matrix)
+    np.testing.assert_allclose(result["residuals"], 0.0, atol=1e-7)
+    assert result["rmse"] == pytest.approx(0.0, abs=1e-7)
+    if method == "helmert":
+        assert result["rotation_angle"] == pytest.approx(3.25, abs=1e-9)
+        assert result["scaling_factor"] == pytest.approx(1.0004, abs=1e-12)
+
+@pytest.mark.parametrize("method", ["helmert", "affine"])
+def test_estimate_transform_residuals_are_exact(method):
+    # 잡음이 해 공간에 직교하므로 추정 행렬은 그대로이고 잔차는 정확히 -잡음, RMSE는 0.05
+    from shp_convert import estimate_transform
+
+    matrix = KNOWN_MATRICES[method]
+    target = CONTROL_SOURCE @ matrix[:, :2].T + matrix[:, 2] + CONTROL_NOISE
+    result = estimate_transform(CONTROL_SOURCE, target, method)
+    _assert_matrix_close(result["matrix"], matrix)
+    np.testing.assert_allclose(result["residuals"], -CONTROL_NOISE, rtol=0, atol=1e-7)
+    assert result["rmse"] == pytest.approx(0.05, abs=1e-9)
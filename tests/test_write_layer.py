@@ -0,0 +1,20 @@
+import geopandas as gpd
+import pytest
+from shapely.geometry import Point
+
+from shp_convert import write_layer
+
+@pytest.mark.parametrize("ext", [".fgb", ".parquet"])
+def test_null_column_in_first_chunk(tmp_path, ext):
+    # 첫 청크에서 값이 모두 null인 문자열 열도 뒤 청크의 값이 그대로 써져야 함
+    first = gpd.GeoDataFrame({"NAME": ["a", "b"], "NOTE": [None, None]}, geometry=[Point(0, 0), Point(1, 1)], crs='EPSG:5186')
+    second = gpd.GeoDataFrame({"NAME": ["c"], "NOTE": ["memo"]}, geometry=[Point(2, 2)], crs='EPSG:5186')
+    path = str(tmp_path / ("out" + ext))
+    write_layer([first, second], path)
+
+    # FlatGeobuf는 공간 인덱스 때문에 피처 순서가 바뀌므로 NAME 순으로 비교
+    result = gpd.read_parquet(path) if ext == ".parquet" else gpd.read_file(path)
+    result = result.sort_values("NAME").reset_index(drop=True)
+    assert result["NAME"].tolist() == ["a", "b", "c"]
+    assert result["NOTE"].tolist()[2] == "memo"
+    assert result["NOTE"].isna().tolist()[:2] == [True, True]
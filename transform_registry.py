@@ -0,0 +1,135 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from shp_convert import load_conversion, conversion_to_matrix, invert_affine_matrix
+
+class AffineTransform:
+    """
+    변경할 수 없는 2x3 아핀 행렬과 미리 계산해 둔 역행렬을 묶은 객체입니다.
+    inverted()는 행렬과 역행렬의 역할만 바꾸므로 역변환 준비에 추가 비용이 없습니다.
+    """
+    __slots__ = ('_matrix', '_inverse')
+
+    def __init__(self, matrix):
+        matrix = np.array(matrix, dtype=float).reshape(2, 3)
+        inverse = invert_affine_matrix(matrix)
+
+        matrix.setflags(write=False)
+        inverse.setflags(write=False)
+        self._matrix = matrix
+        self._inverse = inverse
+
+    @classmethod
+    def _from_pair(cls, matrix: np.ndarray, inverse: np.ndarray) -> 'AffineTransform':
+        transform = cls.__new__(cls)
+        transform._matrix = matrix
+        transform._inverse = inverse
+        return transform
+
+    @classmethod
+    def from_conversion(cls, dict_convert: dict) -> 'AffineTransform':
+        """
+        좌표변환 정보로 AffineTransform을 만듭니다.
+
+        :param dict_convert: (dict), 좌표변환 정보 (conversion_to_matrix 참고)
+        :return: (AffineTransform), 컴파일된 변환
+        """
+        return cls(conversion_to_matrix(dict_convert))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """ 정방향 2x3 행렬 (읽기 전용) """
+        return self._matrix
+
+    @property
+    def inverse(self) -> np.ndarray:
+        """ 역방향 2x3 행렬 (읽기 전용) """
+        return self._inverse
+
+    def inverted(self) -> 'AffineTransform':
+        """ 정방향과 역방향을 바꾼 변환을 돌려줍니다. """
+        return AffineTransform._from_pair(self._inverse, self._matrix)
+
+    def __setattr__(self, name, value):
+        if hasattr(self, '_inverse'):
+            raise AttributeError("AffineTransform is immutable")
+        super().__setattr__(name, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, AffineTransform):
+            return NotImplemented
+        return np.array_equal(self._matrix, other._matrix)
+
+    def __hash__(self):
+        return hash(self._matrix.tobytes())
+
+    def __repr__(self):
+        return f"AffineTransform({self._matrix.tolist()})"
+
+class TransformRegistry:
+    """
+    좌표변환 파일을 한 번만 읽어 AffineTransform으로 컴파일해 두는 LRU 캐시입니다.
+    (절대 경로, 수정 시각)을 키로 사용하므로 파일이 바뀌면 자동으로 다시 읽습니다.
+    """
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, conversion_file: str, reverse: bool = False) -> AffineTransform:
+        """
+        좌표변환 파일에 해당하는 변환을 돌려줍니다.
+
+        :param conversion_file: (str), 좌표변환 파일 경로
+        :param reverse: (bool), 역변환 여부 (기본값: False)
+        :return: (AffineTransform), 컴파일된 변환
+        """
+        path = os.path.abspath(conversion_file)
+        key = (path, os.stat(path).st_mtime_ns)
+
+        with self._lock:
+            transform = self._entries.get(key)
+            if transform is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if transform is None:
+            transform = AffineTransform.from_conversion(load_conversion(path))
+            with self._lock:
+                self.misses += 1
+                # 같은 파일의 이전 버전은 더 이상 쓰이지 않으므로 제거
+                for stale in [k for k in self._entries if k[0] == path and k != key]:
+                    del self._entries[stale]
+                self._entries[key] = transform
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        return transform.inverted() if reverse else transform
+
+    def clear(self):
+        """ 캐시된 변환을 모두 삭제합니다. """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+# 모듈 기본 레지스트리
+registry = TransformRegistry()
+
+def get_transform(conversion_file: str, reverse: bool = False) -> AffineTransform:
+    """
+    기본 레지스트리에서 좌표변환 파일에 해당하는 변환을 돌려줍니다.
+
+    :param conversion_file: (str), 좌표변환 파일 경로
+    :param reverse: (bool), 역변환 여부 (기본값: False)
+    :return: (AffineTransform), 컴파일된 변환
+    """
+    return registry.get(conversion_file, reverse=reverse)